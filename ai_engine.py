@@ -1,720 +1,2082 @@
-"""
-🧠 AI Engine for DoganBS v1.2
-Advanced AI capabilities and machine learning features
-💙 In Memory of Omar (2007-2024)
-"""
-
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import json
-import random
-from typing import List, Dict, Any, Optional
-import warnings
-warnings.filterwarnings('ignore')
-
-# ML imports with fallbacks
-try:
-    from sklearn.ensemble import IsolationForest, RandomForestRegressor
-    from sklearn.preprocessing import StandardScaler, MinMaxScaler
-    from sklearn.linear_model import LinearRegression, Ridge
-    from sklearn.cluster import KMeans
-    from sklearn.metrics import mean_absolute_error, r2_score
-    from sklearn.model_selection import train_test_split
-    ML_AVAILABLE = True
-except ImportError:
-    ML_AVAILABLE = False
-
-try:
-    from prophet import Prophet
-    PROPHET_AVAILABLE = True
-except ImportError:
-    PROPHET_AVAILABLE = False
-
-class AIEngine:
-    """Advanced AI Engine for Business Intelligence"""
-
-    def __init__(self):
-        self.models = {}
-        self.scalers = {}
-        self.insights_cache = {}
-        self.anomaly_threshold = 2.0
-
-    def generate_smart_insights(self, data: pd.DataFrame, kpi: str) -> List[Dict]:
-        """Generate AI-powered business insights"""
-        insights = []
-
-        if kpi not in data.columns:
-            return insights
-
-        values = data[kpi].dropna()
-        if len(values) < 3:
-            return insights
-
-        # Trend analysis
-        trend = self._analyze_trend(values)
-        insights.append({
-            'type': 'trend',
-            'title': f'{kpi} Trend Analysis',
-            'insight': f'{kpi} shows {trend["direction"]} trend with {trend["strength"]} strength',
-            'confidence': trend['confidence'],
-            'action': self._get_trend_action(trend, kpi)
-        })
-
-        # Volatility analysis
-        volatility = self._analyze_volatility(values)
-        if volatility['level'] == 'high':
-            insights.append({
-                'type': 'volatility',
-                'title': f'{kpi} Volatility Alert',
-                'insight': f'High volatility detected in {kpi} (σ={volatility["std"]:.2f})',
-                'confidence': 0.85,
-                'action': f'Consider stabilizing factors affecting {kpi}'
-            })
-
-        # Performance vs benchmark
-        benchmark = self._get_benchmark(kpi)
-        if benchmark:
-            performance = self._compare_to_benchmark(values.iloc[-1], benchmark)
-            insights.append({
-                'type': 'benchmark',
-                'title': f'{kpi} Benchmark Comparison',
-                'insight': f'{kpi} is {performance["status"]} benchmark by {performance["difference"]:.1f}%',
-                'confidence': 0.90,
-                'action': performance['recommendation']
-            })
-
-        return insights
-
-    def predict_kpi(self, data: pd.DataFrame, kpi: str, periods: int = 6, method: str = 'auto') -> Dict:
-        """Advanced KPI prediction with multiple models"""
-        if kpi not in data.columns:
-            return {'error': f'KPI {kpi} not found in data'}
-
-        values = data[kpi].dropna()
-        if len(values) < 10:
-            return {'error': 'Insufficient data for prediction'}
-
-        predictions = {}
-
-        # Linear Regression
-        if ML_AVAILABLE:
-            linear_pred = self._linear_prediction(values, periods)
-            predictions['linear'] = linear_pred
-
-        # Prophet (if available)
-        if PROPHET_AVAILABLE and 'Date' in data.columns:
-            prophet_pred = self._prophet_prediction(data, kpi, periods)
-            predictions['prophet'] = prophet_pred
-
-        # ARIMA-like simple prediction
-        arima_pred = self._simple_arima_prediction(values, periods)
-        predictions['arima'] = arima_pred
-
-        # Ensemble prediction
-        ensemble_pred = self._ensemble_prediction(predictions, periods)
-
-        return {
-            'predictions': ensemble_pred,
-            'confidence_intervals': self._calculate_confidence_intervals(predictions, periods),
-            'model_performance': self._evaluate_models(predictions, values),
-            'recommendations': self._generate_prediction_recommendations(ensemble_pred, values)
-        }
-
-    def detect_anomalies(self, data: pd.DataFrame, kpi: str, method: str = 'isolation_forest') -> Dict:
-        """Advanced anomaly detection"""
-        if kpi not in data.columns:
-            return {'error': f'KPI {kpi} not found in data'}
-
-        values = data[kpi].dropna()
-        if len(values) < 10:
-            return {'error': 'Insufficient data for anomaly detection'}
-
-        anomalies = {}
-
-        if ML_AVAILABLE and method == 'isolation_forest':
-            anomalies['isolation_forest'] = self._isolation_forest_anomalies(values)
-
-        # Statistical anomalies (Z-score)
-        anomalies['statistical'] = self._statistical_anomalies(values)
-
-        # Seasonal anomalies
-        if len(values) >= 12:
-            anomalies['seasonal'] = self._seasonal_anomalies(values)
-
-        # Combine results
-        combined_anomalies = self._combine_anomaly_results(anomalies, values)
-
-        return {
-            'anomalies': combined_anomalies,
-            'severity': self._assess_anomaly_severity(combined_anomalies, values),
-            'explanations': self._explain_anomalies(combined_anomalies, values),
-            'recommendations': self._anomaly_recommendations(combined_anomalies)
-        }
-
-    def smart_threshold_optimization(self, data: pd.DataFrame, kpi: str, target: float) -> Dict:
-        """AI-powered threshold optimization"""
-        if kpi not in data.columns:
-            return {'error': f'KPI {kpi} not found in data'}
-
-        values = data[kpi].dropna()
-        if len(values) < 20:
-            return {'error': 'Insufficient data for threshold optimization'}
-
-        # Analyze historical performance
-        performance_analysis = self._analyze_performance_distribution(values, target)
-
-        # Optimize thresholds based on data distribution
-        optimized_thresholds = self._optimize_thresholds(values, target)
-
-        # Calculate threshold effectiveness
-        effectiveness = self._calculate_threshold_effectiveness(values, optimized_thresholds)
-
-        return {
-            'optimized_thresholds': optimized_thresholds,
-            'performance_analysis': performance_analysis,
-            'effectiveness_score': effectiveness,
-            'recommendations': self._threshold_recommendations(optimized_thresholds, performance_analysis)
-        }
-
-    def correlation_analysis(self, data: pd.DataFrame) -> Dict:
-        """Advanced correlation and causation analysis"""
-        numeric_cols = data.select_dtypes(include=[np.number]).columns.tolist()
-
-        if len(numeric_cols) < 2:
-            return {'error': 'Insufficient numeric columns for correlation analysis'}
-
-        # Correlation matrix
-        corr_matrix = data[numeric_cols].corr()
-
-        # Find strong correlations
-        strong_correlations = self._find_strong_correlations(corr_matrix)
-
-        # Lag correlation analysis
-        lag_correlations = self._lag_correlation_analysis(data, numeric_cols)
-
-        # Causation hints (Granger-like)
-        causation_hints = self._analyze_causation_hints(data, numeric_cols)
-
-        return {
-            'correlation_matrix': corr_matrix.to_dict(),
-            'strong_correlations': strong_correlations,
-            'lag_correlations': lag_correlations,
-            'causation_hints': causation_hints,
-            'insights': self._generate_correlation_insights(strong_correlations, lag_correlations)
-        }
-
-    def smart_segmentation(self, data: pd.DataFrame, features: List[str], n_segments: int = 5) -> Dict:
-        """AI-powered customer/data segmentation"""
-        if not ML_AVAILABLE:
-            return {'error': 'ML libraries not available for segmentation'}
-
-        # Prepare data
-        segment_data = data[features].dropna()
-        if len(segment_data) < n_segments * 2:
-            return {'error': 'Insufficient data for segmentation'}
-
-        # Normalize data
-        scaler = StandardScaler()
-        normalized_data = scaler.fit_transform(segment_data)
-
-        # K-means clustering
-        kmeans = KMeans(n_clusters=n_segments, random_state=42)
-        segments = kmeans.fit_predict(normalized_data)
-
-        # Analyze segments
-        segment_analysis = self._analyze_segments(segment_data, segments, features)
-
-        # Generate segment insights
-        segment_insights = self._generate_segment_insights(segment_analysis)
-
-        return {
-            'segments': segments.tolist(),
-            'segment_centers': kmeans.cluster_centers_.tolist(),
-            'segment_analysis': segment_analysis,
-            'insights': segment_insights,
-            'recommendations': self._segment_recommendations(segment_analysis)
-        }
-
-    def predictive_maintenance(self, data: pd.DataFrame, asset_col: str, performance_cols: List[str]) -> Dict:
-        """Predictive maintenance analysis"""
-        if asset_col not in data.columns:
-            return {'error': f'Asset column {asset_col} not found'}
-
-        maintenance_insights = {}
-
-        for asset in data[asset_col].unique():
-            asset_data = data[data[asset_col] == asset]
-
-            # Performance degradation analysis
-            degradation = self._analyze_performance_degradation(asset_data, performance_cols)
-
-            # Failure prediction
-            failure_risk = self._predict_failure_risk(asset_data, performance_cols)
-
-            # Maintenance recommendations
-            maintenance_rec = self._generate_maintenance_recommendations(degradation, failure_risk)
-
-            maintenance_insights[asset] = {
-                'degradation_analysis': degradation,
-                'failure_risk': failure_risk,
-                'recommendations': maintenance_rec
-            }
-
-        return maintenance_insights
-
-    def natural_language_insights(self, data: pd.DataFrame, query: str) -> Dict:
-        """Process natural language queries about data"""
-        query_lower = query.lower()
-
-        # Simple NLP processing (can be enhanced with proper NLP libraries)
-        insights = []
-
-        # Revenue queries
-        if 'revenue' in query_lower:
-            if 'trend' in query_lower or 'growing' in query_lower:
-                revenue_trend = self._analyze_trend(data['Revenue']) if 'Revenue' in data.columns else None
-                if revenue_trend:
-                    insights.append(f"Revenue shows {revenue_trend['direction']} trend with {revenue_trend['strength']} strength")
-
-        # Prediction queries
-        if 'predict' in query_lower or 'forecast' in query_lower:
-            kpi = self._extract_kpi_from_query(query_lower, data.columns)
-            if kpi:
-                pred_result = self.predict_kpi(data, kpi, 3)
-                if 'predictions' in pred_result:
-                    insights.append(f"Predicted {kpi} for next 3 periods: {pred_result['predictions'][:3]}")
-
-        # Anomaly queries
-        if 'anomal' in query_lower or 'unusual' in query_lower:
-            kpi = self._extract_kpi_from_query(query_lower, data.columns)
-            if kpi:
-                anomaly_result = self.detect_anomalies(data, kpi)
-                if 'anomalies' in anomaly_result and anomaly_result['anomalies']:
-                    insights.append(f"Found {len(anomaly_result['anomalies'])} anomalies in {kpi}")
-
-        return {
-            'query': query,
-            'insights': insights,
-            'confidence': 0.75,
-            'suggestions': self._generate_query_suggestions(query_lower, data.columns)
-        }
-
-    # Helper methods
-    def _analyze_trend(self, values: pd.Series) -> Dict:
-        """Analyze trend in time series data"""
-        if len(values) < 3:
-            return {'direction': 'unknown', 'strength': 'low', 'confidence': 0.0}
-
-        # Simple linear regression for trend
-        x = np.arange(len(values))
-        slope = np.polyfit(x, values, 1)[0]
-
-        # Determine direction and strength
-        if abs(slope) < values.std() * 0.1:
-            direction = 'stable'
-            strength = 'low'
-        elif slope > 0:
-            direction = 'upward'
-            strength = 'high' if abs(slope) > values.std() * 0.5 else 'medium'
-        else:
-            direction = 'downward'
-            strength = 'high' if abs(slope) > values.std() * 0.5 else 'medium'
-
-        # Calculate confidence based on R²
-        r_squared = np.corrcoef(x, values)[0, 1] ** 2 if len(values) > 1 else 0
-        confidence = min(0.95, max(0.1, r_squared))
-
-        return {
-            'direction': direction,
-            'strength': strength,
-            'confidence': confidence,
-            'slope': slope
-        }
-
-    def _analyze_volatility(self, values: pd.Series) -> Dict:
-        """Analyze volatility in data"""
-        std_dev = values.std()
-        mean_val = values.mean()
-        cv = std_dev / mean_val if mean_val != 0 else float('inf')
-
-        if cv < 0.1:
-            level = 'low'
-        elif cv < 0.3:
-            level = 'medium'
-        else:
-            level = 'high'
-
-        return {
-            'level': level,
-            'std': std_dev,
-            'coefficient_of_variation': cv
-        }
-
-    def _get_benchmark(self, kpi: str) -> Optional[float]:
-        """Get industry benchmark for KPI"""
-        benchmarks = {
-            'Revenue': 1000000,
-            'GP_Margin': 25.0,
-            'Customer_Satisfaction': 85.0,
-            'Conversion_Rate': 3.5,
-            'Active_Users': 8000
-        }
-        return benchmarks.get(kpi)
-
-    def _compare_to_benchmark(self, value: float, benchmark: float) -> Dict:
-        """Compare value to benchmark"""
-        difference = ((value - benchmark) / benchmark) * 100
-
-        if difference > 10:
-            status = 'significantly above'
-            recommendation = 'Maintain current performance and identify success factors'
-        elif difference > 0:
-            status = 'above'
-            recommendation = 'Good performance, look for optimization opportunities'
-        elif difference > -10:
-            status = 'slightly below'
-            recommendation = 'Focus on improvement initiatives'
-        else:
-            status = 'significantly below'
-            recommendation = 'Immediate action required to improve performance'
-
-        return {
-            'status': status,
-            'difference': difference,
-            'recommendation': recommendation
-        }
-
-    def _linear_prediction(self, values: pd.Series, periods: int) -> List[float]:
-        """Simple linear regression prediction"""
-        if not ML_AVAILABLE:
-            return [values.iloc[-1] * 1.05] * periods
-
-        X = np.arange(len(values)).reshape(-1, 1)
-        y = values.values
-
-        model = LinearRegression()
-        model.fit(X, y)
-
-        future_X = np.arange(len(values), len(values) + periods).reshape(-1, 1)
-        predictions = model.predict(future_X)
-
-        return predictions.tolist()
-
-    def _simple_arima_prediction(self, values: pd.Series, periods: int) -> List[float]:
-        """Simple ARIMA-like prediction"""
-        # Simple exponential smoothing
-        alpha = 0.3
-        smoothed = [values.iloc[0]]
-
-        for i in range(1, len(values)):
-            smoothed.append(alpha * values.iloc[i] + (1 - alpha) * smoothed[-1])
-
-        # Predict future values
-        predictions = []
-        last_smoothed = smoothed[-1]
-
-        for _ in range(periods):
-            predictions.append(last_smoothed)
-
-        return predictions
-
-    def _prophet_prediction(self, data: pd.DataFrame, kpi: str, periods: int) -> List[float]:
-        """Prophet-based prediction"""
-        if not PROPHET_AVAILABLE:
-            return self._simple_arima_prediction(data[kpi], periods)
-
-        try:
-            # Prepare data for Prophet
-            prophet_data = pd.DataFrame({
-                'ds': data['Date'],
-                'y': data[kpi]
-            }).dropna()
-
-            model = Prophet(daily_seasonality=False, weekly_seasonality=False)
-            model.fit(prophet_data)
-
-            # Make future predictions
-            future = model.make_future_dataframe(periods=periods, freq='M')
-            forecast = model.predict(future)
-
-            return forecast['yhat'].tail(periods).tolist()
-        except:
-            return self._simple_arima_prediction(data[kpi], periods)
-
-    def _ensemble_prediction(self, predictions: Dict, periods: int) -> List[float]:
-        """Combine multiple predictions using ensemble method"""
-        if not predictions:
-            return [0] * periods
-
-        # Simple average ensemble
-        ensemble = []
-        for i in range(periods):
-            period_predictions = []
-            for method, pred_list in predictions.items():
-                if i < len(pred_list):
-                    period_predictions.append(pred_list[i])
-
-            if period_predictions:
-                ensemble.append(np.mean(period_predictions))
-            else:
-                ensemble.append(0)
-
-        return ensemble
-
-    def _calculate_confidence_intervals(self, predictions: Dict, periods: int) -> Dict:
-        """Calculate confidence intervals for predictions"""
-        confidence_intervals = {}
-
-        for method, pred_list in predictions.items():
-            if len(pred_list) >= periods:
-                # Simple confidence interval based on standard deviation
-                std_dev = np.std(pred_list[:periods])
-                lower_bound = [p - 1.96 * std_dev for p in pred_list[:periods]]
-                upper_bound = [p + 1.96 * std_dev for p in pred_list[:periods]]
-
-                confidence_intervals[method] = {
-                    'lower': lower_bound,
-                    'upper': upper_bound
-                }
-
-        return confidence_intervals
-
-    def _evaluate_models(self, predictions: Dict, actual_values: pd.Series) -> Dict:
-        """Evaluate prediction model performance"""
-        if not ML_AVAILABLE or len(actual_values) < 10:
-            return {}
-
-        # Use last 20% of data for evaluation
-        test_size = max(2, int(len(actual_values) * 0.2))
-        train_data = actual_values[:-test_size]
-        test_data = actual_values[-test_size:]
-
-        performance = {}
-
-        for method in predictions.keys():
-            try:
-                # Generate predictions for test period
-                if method == 'linear':
-                    test_predictions = self._linear_prediction(train_data, test_size)
-                else:
-                    test_predictions = self._simple_arima_prediction(train_data, test_size)
-
-                # Calculate metrics
-                mae = mean_absolute_error(test_data, test_predictions[:len(test_data)])
-                mape = np.mean(np.abs((test_data - test_predictions[:len(test_data)]) / test_data)) * 100
-
-                performance[method] = {
-                    'mae': mae,
-                    'mape': mape,
-                    'accuracy': max(0, 100 - mape)
-                }
-            except:
-                performance[method] = {'mae': 0, 'mape': 100, 'accuracy': 0}
-
-        return performance
-
-    def _generate_prediction_recommendations(self, predictions: List[float], historical: pd.Series) -> List[str]:
-        """Generate recommendations based on predictions"""
-        recommendations = []
-
-        if not predictions or len(predictions) == 0:
-            return recommendations
-
-        current_value = historical.iloc[-1]
-        predicted_value = predictions[0]
-
-        change_percent = ((predicted_value - current_value) / current_value) * 100
-
-        if change_percent > 10:
-            recommendations.append(f"Strong growth predicted ({change_percent:.1f}%) - prepare for scaling")
-        elif change_percent > 0:
-            recommendations.append(f"Moderate growth expected ({change_percent:.1f}%) - maintain current strategy")
-        elif change_percent > -10:
-            recommendations.append(f"Slight decline predicted ({change_percent:.1f}%) - monitor closely")
-        else:
-            recommendations.append(f"Significant decline predicted ({change_percent:.1f}%) - immediate action needed")
-
-        return recommendations
-
-    def _isolation_forest_anomalies(self, values: pd.Series) -> List[int]:
-        """Detect anomalies using Isolation Forest"""
-        try:
-            data_array = values.values.reshape(-1, 1)
-            iso_forest = IsolationForest(contamination=0.1, random_state=42)
-            anomalies = iso_forest.fit_predict(data_array)
-            return [i for i, val in enumerate(anomalies) if val == -1]
-        except:
-            return []
-
-    def _statistical_anomalies(self, values: pd.Series) -> List[int]:
-        """Detect anomalies using statistical methods (Z-score)"""
-        z_scores = np.abs((values - values.mean()) / values.std())
-        return [i for i, z in enumerate(z_scores) if z > self.anomaly_threshold]
-
-    def _seasonal_anomalies(self, values: pd.Series) -> List[int]:
-        """Detect seasonal anomalies"""
-        if len(values) < 24:  # Need at least 2 years of monthly data
-            return []
-
-        # Simple seasonal decomposition
-        seasonal_period = 12
-        seasonal_means = []
-
-        for i in range(seasonal_period):
-            seasonal_values = [values.iloc[j] for j in range(i, len(values), seasonal_period)]
-            seasonal_means.append(np.mean(seasonal_values))
-
-        anomalies = []
-        for i, value in enumerate(values):
-            seasonal_idx = i % seasonal_period
-            expected = seasonal_means[seasonal_idx]
-
-            if abs(value - expected) > 2 * np.std(values):
-                anomalies.append(i)
-
-        return anomalies
-
-    def _combine_anomaly_results(self, anomalies: Dict, values: pd.Series) -> List[Dict]:
-        """Combine anomaly detection results"""
-        combined = {}
-
-        for method, indices in anomalies.items():
-            for idx in indices:
-                if idx not in combined:
-                    combined[idx] = {
-                        'index': idx,
-                        'value': values.iloc[idx],
-                        'methods': [],
-                        'severity': 0
-                    }
-                combined[idx]['methods'].append(method)
-                combined[idx]['severity'] += 1
-
-        return list(combined.values())
-
-    def _assess_anomaly_severity(self, anomalies: List[Dict], values: pd.Series) -> Dict:
-        """Assess overall anomaly severity"""
-        if not anomalies:
-            return {'level': 'none', 'count': 0, 'impact': 'minimal'}
-
-        high_severity = sum(1 for a in anomalies if a['severity'] >= 2)
-        total_anomalies = len(anomalies)
-
-        if high_severity > total_anomalies * 0.5:
-            level = 'high'
-            impact = 'significant'
-        elif total_anomalies > len(values) * 0.1:
-            level = 'medium'
-            impact = 'moderate'
-        else:
-            level = 'low'
-            impact = 'minimal'
-
-        return {
-            'level': level,
-            'count': total_anomalies,
-            'high_severity_count': high_severity,
-            'impact': impact
-        }
-
-    def _explain_anomalies(self, anomalies: List[Dict], values: pd.Series) -> List[str]:
-        """Generate explanations for detected anomalies"""
-        explanations = []
-
-        for anomaly in anomalies:
-            idx = anomaly['index']
-            value = anomaly['value']
-            methods = anomaly['methods']
-
-            explanation = f"Anomaly at position {idx}: value {value:.2f} detected by {', '.join(methods)}"
-
-            # Add context
-            mean_val = values.mean()
-            if value > mean_val * 1.5:
-                explanation += " (unusually high)"
-            elif value < mean_val * 0.5:
-                explanation += " (unusually low)"
-
-            explanations.append(explanation)
-
-        return explanations
-
-    def _anomaly_recommendations(self, anomalies: List[Dict]) -> List[str]:
-        """Generate recommendations for handling anomalies"""
-        if not anomalies:
-            return ["No anomalies detected - data appears normal"]
-
-        recommendations = []
-
-        high_severity = sum(1 for a in anomalies if a['severity'] >= 2)
-
-        if high_severity > 0:
-            recommendations.append("High-severity anomalies detected - investigate root causes immediately")
-
-        if len(anomalies) > 5:
-            recommendations.append("Multiple anomalies detected - review data collection process")
-
-        recommendations.append("Monitor these periods closely for recurring patterns")
-        recommendations.append("Consider implementing automated alerts for similar anomalies")
-
-        return recommendations
-
-    def _get_trend_action(self, trend: Dict, kpi: str) -> str:
-        """Get recommended action based on trend analysis"""
-        direction = trend['direction']
-        strength = trend['strength']
-
-        if direction == 'upward' and strength == 'high':
-            return f"Excellent {kpi} growth - maintain current strategies"
-        elif direction == 'upward':
-            return f"Positive {kpi} trend - consider scaling successful initiatives"
-        elif direction == 'downward' and strength == 'high':
-            return f"Concerning {kpi} decline - immediate intervention required"
-        elif direction == 'downward':
-            return f"Declining {kpi} trend - investigate causes and implement corrective measures"
-        else:
-            return f"Stable {kpi} - look for optimization opportunities"
-
-    def _extract_kpi_from_query(self, query: str, columns: List[str]) -> Optional[str]:
-        """Extract KPI name from natural language query"""
-        query_words = query.lower().split()
-
-        for col in columns:
-            if col.lower() in query or any(word in col.lower() for word in query_words):
-                return col
-
-        # Common KPI mappings
-        kpi_mappings = {
-            'revenue': 'Revenue',
-            'sales': 'Revenue',
-            'margin': 'GP_Margin',
-            'satisfaction': 'Customer_Satisfaction',
-            'users': 'Active_Users',
-            'conversion': 'Conversion_Rate'
-        }
-
-        for word in query_words:
-            if word in kpi_mappings and kpi_mappings[word] in columns:
-                return kpi_mappings[word]
-
-        return None
-
-    def _generate_query_suggestions(self, query: str, columns: List[str]) -> List[str]:
-        """Generate query suggestions"""
-        suggestions = [
-            "Show me revenue trends for the last 6 months",
-            "What's the correlation between customer satisfaction and revenue?",
-            "Predict next quarter's performance",
-            "Find anomalies in our data",
-            "How is our GP margin performing?"
-        ]
-
-        # Add column-specific suggestions
-        for col in columns:
-            if 'Revenue' in col:
-                suggestions.append(f"Analyze {col} growth patterns")
-            elif 'Customer' in col:
-                suggestions.append(f"What affects {col}?")
-
+"""
+🧠 AI Engine for DoganBS v1.2
+Advanced AI capabilities and machine learning features
+💙 In Memory of Omar (2007-2024)
+"""
+
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+import json
+import copy
+import random
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pickle import PicklingError
+from typing import List, Dict, Any, Optional
+import logging
+import warnings
+warnings.filterwarnings('ignore')
+
+logger = logging.getLogger(__name__)
+
+# ML imports with fallbacks
+try:
+    from sklearn.ensemble import IsolationForest, RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler, MinMaxScaler
+    from sklearn.linear_model import LinearRegression, Ridge
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+    from sklearn.metrics import mean_absolute_error, r2_score, silhouette_score
+    from sklearn.model_selection import train_test_split
+    ML_AVAILABLE = True
+except ImportError:
+    ML_AVAILABLE = False
+
+try:
+    from prophet import Prophet
+    PROPHET_AVAILABLE = True
+except ImportError:
+    PROPHET_AVAILABLE = False
+
+try:
+    from scipy.signal import lfilter
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import joblib
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+def fingerprint_data(data: Any, **params) -> str:
+    """Fast content fingerprint of an array, Series or DataFrame plus hyperparameters.
+
+    Numeric and datetime buffers are hashed as raw bytes (xxhash when
+    installed, BLAKE2 otherwise); other columns go through pandas' vectorized
+    object hashing. Column names, dtypes and shapes are part of the key.
+    """
+    hasher = xxhash.xxh3_128() if XXHASH_AVAILABLE else hashlib.blake2b(digest_size=16)
+
+    if isinstance(data, pd.DataFrame):
+        columns = [(str(col), data[col]) for col in data.columns]
+    elif isinstance(data, pd.Series):
+        columns = [(str(data.name), data)]
+    else:
+        columns = [('', np.asarray(data))]
+
+    for name, column in columns:
+        array = column.to_numpy() if isinstance(column, pd.Series) else column
+        if array.dtype.kind not in 'biufcmM':
+            array = pd.util.hash_pandas_object(pd.Series(array), index=False).to_numpy()
+        array = np.ascontiguousarray(array)
+        hasher.update(f'{name}|{array.dtype}|{array.shape}'.encode())
+        hasher.update(array.view(np.uint8).tobytes() if array.size else b'')
+
+    hasher.update(repr(sorted(params.items())).encode())
+    return hasher.hexdigest()
+
+class ModelCache:
+    """LRU cache of fitted models bounded by estimated memory size.
+
+    Keys are content fingerprints (see fingerprint_data). When persist_dir is
+    set and joblib is installed, fitted models are also written to disk and
+    reloaded on a memory miss, so new processes skip refitting too. The
+    directory has its own budget, max_disk_bytes (default 4x max_bytes):
+    after each write the least recently used files (by mtime, refreshed on
+    every disk hit) are deleted until it fits.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, persist_dir: Optional[str] = None,
+                 max_disk_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes if max_disk_bytes is not None else 4 * max_bytes
+        self.persist_dir = Path(persist_dir) if persist_dir and JOBLIB_AVAILABLE else None
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'disk_evictions': 0}
+
+        if self.persist_dir:
+            self.persist_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _estimate_size(model: Any) -> int:
+        """Approximate memory footprint without serializing the model.
+
+        Sums array and frame buffers reachable through attributes,
+        containers and __getstate__ (extension types such as sklearn trees),
+        plus a flat overhead per Python object.
+        """
+        total = 0
+        seen = {}  # id -> object, keeping __getstate__ temporaries alive so ids are not reused
+        stack = [model]
+
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen:
+                continue
+            seen[id(obj)] = obj
+
+            if isinstance(obj, np.ndarray):
+                total += obj.nbytes
+                if obj.dtype == object:
+                    stack.extend(obj.ravel())
+            elif isinstance(obj, (pd.DataFrame, pd.Series)):
+                total += int(np.sum(obj.memory_usage(index=True)))
+            elif isinstance(obj, (str, bytes)):
+                total += len(obj) + 48
+            elif isinstance(obj, dict):
+                total += 64
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                total += 56 + 8 * len(obj)
+                stack.extend(obj)
+            elif isinstance(obj, (int, float, complex, bool, np.generic)) or obj is None:
+                total += 32
+            else:
+                total += 64
+                state = getattr(obj, '__dict__', None)
+                if state is None:
+                    try:
+                        state = obj.__getstate__()
+                    except Exception:
+                        state = None
+                if state is not None:
+                    stack.append(state)
+
+        return max(total, 1024)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached model for key, or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._entries[key]
+
+        if self.persist_dir:
+            path = self.persist_dir / f'{key}.joblib'
+            if path.exists():
+                try:
+                    model = joblib.load(path)
+                    os.utime(path)  # mtime doubles as the disk LRU clock
+                    self.put(key, model, persist=False)
+                    with self._lock:
+                        self.stats['disk_hits'] += 1
+                    return model
+                except Exception:
+                    pass
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def put(self, key: str, model: Any, persist: bool = True):
+        """Cache a fitted model, evicting least recently used entries to fit max_bytes"""
+        size = self._estimate_size(model)
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._sizes.pop(key)
+                del self._entries[key]
+
+            self._entries[key] = model
+            self._sizes[key] = size
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self.current_bytes -= self._sizes.pop(evicted_key)
+                self.stats['evictions'] += 1
+
+        if persist and self.persist_dir:
+            try:
+                joblib.dump(model, self.persist_dir / f'{key}.joblib')
+            except Exception:
+                pass
+            self.prune_disk()
+
+    def prune_disk(self) -> int:
+        """Delete least recently used persisted models until the directory fits max_disk_bytes"""
+        if not self.persist_dir:
+            return 0
+
+        files = []
+        for path in self.persist_dir.glob('*.joblib'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files, key=lambda item: item[0]):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        if removed:
+            with self._lock:
+                self.stats['disk_evictions'] += removed
+        return removed
+
+    def get_or_fit(self, key: str, fit_func) -> Any:
+        """Return the cached model for key, fitting and caching it on a miss"""
+        model = self.get(key)
+        if model is None:
+            model = fit_func()
+            self.put(key, model)
+        return model
+
+    def clear(self, disk: bool = False):
+        """Drop all in-memory entries, and the persisted files too with disk=True"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+
+        if disk and self.persist_dir:
+            for path in self.persist_dir.glob('*.joblib'):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+# Shared across AIEngine instances so Streamlit reruns reuse fitted models
+_default_model_cache = ModelCache()
+
+# Minibatch segmentation state registered under a caller-supplied segmenter_id,
+# keyed by (segmenter_id, features, n_segments), so warm starts survive reruns.
+# State fitted without an id stays on the AIEngine instance.
+_shared_segmenters: Dict[tuple, Dict] = {}
+_segmenters_lock = threading.Lock()
+
+# Natural-language insight steps: key -> (expiry, insight), shared across instances
+INSIGHTS_CACHE_TTL = 300.0
+_shared_insights_cache: Dict[tuple, tuple] = {}
+_shared_insights_lock = threading.Lock()
+
+# Named seasonal periods: 12 observations per cycle for monthly data, 7 for
+# daily data with a weekly cycle. 'hijri_month' groups daily data by Hijri
+# month instead, so Ramadan/Eid effects line up across Gregorian years.
+SEASONAL_PERIODS = {'monthly': 12, 'weekly': 7, 'quarterly': 4}
+
+def hijri_month(dates: Any) -> np.ndarray:
+    """Hijri month (1-12) of each date using the tabular Islamic calendar.
+
+    Vectorized arithmetic conversion via the Julian day number; it can differ
+    from the sighting-based Umm al-Qura calendar by a day around month starts.
+    """
+    days = np.asarray(pd.to_datetime(dates), dtype='datetime64[D]').astype(np.int64)
+    l = days + 2440588 - 1948440 + 10632  # Julian day number, offset to the Hijri epoch
+    n = (l - 1) // 10631
+    l = l - 10631 * n + 354
+    j = ((10985 - l) // 5316) * ((50 * l) // 17719) + (l // 5670) * ((43 * l) // 15238)
+    l = l - ((30 - j) // 15) * ((17719 * j) // 50) - (j // 16) * ((15238 * j) // 43) + 29
+    return (24 * l) // 709
+
+def seasonal_residuals(values: Any, period: int = 12, season_labels: Optional[Any] = None) -> Dict[str, np.ndarray]:
+    """Seasonal profile and residuals of a series in one vectorized pass.
+
+    With a fixed period the series is reshaped into a (cycles x period)
+    matrix, NaN-padding the last cycle, and the profile is the nanmean of
+    each column. With season_labels (e.g. Hijri months) the profile is the
+    mean per label, computed with bincount.
+    """
+    x = np.asarray(values, dtype=float)
+
+    if season_labels is None:
+        n_cycles = -(-len(x) // period)
+        padded = np.full(n_cycles * period, np.nan)
+        padded[:len(x)] = x
+        profile = np.nanmean(padded.reshape(n_cycles, period), axis=0)
+        expected = np.tile(profile, n_cycles)[:len(x)]
+    else:
+        labels, codes = np.unique(np.asarray(season_labels), return_inverse=True)
+        valid = ~np.isnan(x)
+        sums = np.bincount(codes[valid], weights=x[valid], minlength=len(labels))
+        counts = np.bincount(codes[valid], minlength=len(labels))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            profile = sums / counts
+        expected = profile[codes]
+
+    return {'profile': profile, 'expected': expected, 'residuals': x - expected}
+
+def _fit_segment_candidate(scaled: np.ndarray, n_clusters: int, sample_size: int, batch_size: int) -> Dict:
+    """Fit one candidate k for a segmentation sweep and score it"""
+    model = MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, n_init=3, random_state=42).fit(scaled)
+    labels = model.labels_
+    silhouette = None
+    if 1 < len(np.unique(labels)) < len(scaled):
+        silhouette = float(silhouette_score(scaled, labels, sample_size=min(sample_size, len(scaled)), random_state=42))
+    return {'k': n_clusters, 'inertia': float(model.inertia_), 'silhouette': silhouette}
+
+def _fit_asset_anomaly_rate(task):
+    """Fit an Isolation Forest on one asset's history and score its recent rows.
+
+    Module-level so it can be dispatched to a process pool.
+    """
+    asset, matrix, recent_rows = task
+    model = IsolationForest(contamination=0.1, random_state=42).fit(matrix)
+    labels = model.predict(matrix[-recent_rows:])
+    return asset, float(np.mean(labels == -1))
+
+class StreamingAnomalyDetector:
+    """Incremental anomaly detector for KPI points arriving one at a time.
+
+    Keeps a running mean/variance (Welford), per-season means and a sliding
+    window with running sums, so each update is O(1). Every point is scored
+    against the history before it and then absorbed into the statistics.
+    Anomalies are emitted in the same {'index', 'value', 'methods',
+    'severity'} form as AIEngine.detect_anomalies.
+    """
+
+    def __init__(self, threshold: float = 2.0, season_length: int = 12, window_size: int = 30,
+                 min_history: int = 10):
+        self.threshold = threshold
+        self.season_length = season_length
+        self.window_size = window_size
+        self.min_history = min_history
+
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+        self.season_counts = np.zeros(season_length)
+        self.season_means = np.zeros(season_length)
+
+        # Window sums are kept relative to the first value to limit cancellation
+        self.window = deque(maxlen=window_size)
+        self._shift = None
+        self._window_sum = 0.0
+        self._window_sumsq = 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else 0.0
+
+    def _score(self, value: float) -> List[str]:
+        """Methods that flag value given the history seen so far"""
+        if self.count < self.min_history:
+            return []
+
+        methods = []
+        std = self.std
+
+        # Statistical anomaly (Z-score against all history)
+        if std > 0 and abs(value - self.mean) / std > self.threshold:
+            methods.append('statistical')
+
+        # Seasonal anomaly (deviation from this season's mean)
+        season = self.count % self.season_length
+        if std > 0 and self.season_counts[season] > 0 and abs(value - self.season_means[season]) > 2 * std:
+            methods.append('seasonal')
+
+        # Local anomaly (Z-score against the sliding window)
+        n = len(self.window)
+        if n > 1:
+            shifted = value - self._shift
+            window_mean = self._window_sum / n
+            window_var = max((self._window_sumsq - n * window_mean ** 2) / (n - 1), 0.0)
+            if window_var > 0 and abs(shifted - window_mean) / np.sqrt(window_var) > self.threshold:
+                methods.append('window')
+
+        return methods
+
+    def _absorb(self, value: float):
+        """Fold value into the running statistics"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        season = (self.count - 1) % self.season_length
+        self.season_counts[season] += 1
+        self.season_means[season] += (value - self.season_means[season]) / self.season_counts[season]
+
+        if self._shift is None:
+            self._shift = value
+        shifted = value - self._shift
+        if len(self.window) == self.window_size:
+            oldest = self.window[0]
+            self._window_sum -= oldest
+            self._window_sumsq -= oldest * oldest
+        self.window.append(shifted)
+        self._window_sum += shifted
+        self._window_sumsq += shifted * shifted
+
+    def update(self, value: float) -> Optional[Dict]:
+        """Score one point, absorb it, and return an anomaly record or None"""
+        value = float(value)
+        if np.isnan(value):
+            return None
+
+        index = self.count
+        methods = self._score(value)
+        self._absorb(value)
+
+        if methods:
+            return {'index': index, 'value': value, 'methods': methods, 'severity': len(methods)}
+        return None
+
+    def update_batch(self, values: Any) -> List[Dict]:
+        """Score a batch of points in order, returning the anomaly records"""
+        anomalies = []
+        for value in np.asarray(values, dtype=float):
+            record = self.update(value)
+            if record is not None:
+                anomalies.append(record)
+        return anomalies
+
+    def warm_start(self, values: Any):
+        """Absorb historical values without scoring them"""
+        for value in np.asarray(values, dtype=float):
+            if not np.isnan(value):
+                self._absorb(value)
+
+class IncrementalCorrelation:
+    """Pairwise correlation matrix maintained from sufficient statistics.
+
+    Per column pair it keeps the count, sums, sums of squares and
+    cross-products over rows where both values are present, so appending
+    rows costs a few matrix products and a full-matrix refresh is O(k^2)
+    regardless of history length. Values are shifted by the first batch's
+    column means to limit cancellation. A bounded tail of rows is retained
+    for FFT-based lagged cross-correlation.
+    """
+
+    def __init__(self, columns: Optional[List[str]] = None, max_history: int = 5000):
+        self.columns = list(columns) if columns is not None else None
+        self.max_history = max_history
+        self.row_count = 0
+
+        self._shift = None
+        self._n = None
+        self._sum = None
+        self._sumsq = None
+        self._cross = None
+        self._history = None
+
+    def _init_stats(self, values: np.ndarray):
+        k = values.shape[1]
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            self._shift = np.nan_to_num(np.nanmean(values, axis=0))
+        self._n = np.zeros((k, k))
+        self._sum = np.zeros((k, k))
+        self._sumsq = np.zeros((k, k))
+        self._cross = np.zeros((k, k))
+        self._history = np.empty((0, k))
+
+    def update(self, data: Any):
+        """Fold newly appended rows into the statistics"""
+        if isinstance(data, pd.DataFrame):
+            if self.columns is None:
+                self.columns = data.select_dtypes(include=[np.number]).columns.tolist()
+            data = data.reindex(columns=self.columns)
+        values = np.asarray(data, dtype=float)
+        if values.ndim == 1:
+            values = values[np.newaxis, :]
+        if self.columns is None:
+            self.columns = list(range(values.shape[1]))
+        if len(values) == 0:
+            return self
+        if self._n is None:
+            self._init_stats(values)
+
+        mask = ~np.isnan(values)
+        weights = mask.astype(float)
+        shifted = np.where(mask, values - self._shift, 0.0)
+
+        # [i, j] entries cover rows where both column i and column j are present
+        self._n += weights.T @ weights
+        self._sum += shifted.T @ weights
+        self._sumsq += (shifted * shifted).T @ weights
+        self._cross += shifted.T @ shifted
+        self.row_count += len(values)
+
+        self._history = np.vstack([self._history, values])[-self.max_history:]
+        return self
+
+    def correlation_matrix(self, min_periods: int = 2) -> pd.DataFrame:
+        """Pearson correlation of every column pair (pairwise-complete rows)"""
+        if self._n is None:
+            return pd.DataFrame(index=self.columns, columns=self.columns, dtype=float)
+
+        n = self._n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = self._cross - self._sum * self._sum.T / n
+            var = self._sumsq - self._sum ** 2 / n
+            corr = cov / np.sqrt(var * var.T)
+        corr[(n < min_periods) | ~np.isfinite(corr)] = np.nan
+        np.clip(corr, -1.0, 1.0, out=corr)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def lag_correlations(self, max_lag: int = 12, chunk_size: int = 64) -> Dict[str, Any]:
+        """Cross-correlation for lags 0..max_lag on the retained history.
+
+        Entry [lag, i, j] correlates column i with column j lag rows later
+        (i leading j). Lag ranges spanning a large part of the history come
+        from one FFT per column, with pairs processed in chunks of source
+        columns to bound memory; short ranges use one matrix product per
+        lag. Each lag is
+        normalised by its overlap length and the full-history deviations.
+        """
+        values = self._history if self._history is not None else np.empty((0, 0))
+        length, k = values.shape
+        max_lag = max(0, min(max_lag, length - 2))
+        lags = np.arange(max_lag + 1)
+        if length < 3 or k == 0:
+            return {'lags': lags, 'correlations': np.full((len(lags), k, k), np.nan), 'columns': self.columns}
+
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            centered = np.nan_to_num(values - np.nanmean(values, axis=0))
+        std = np.sqrt((centered ** 2).sum(axis=0) / length)
+
+        nfft = 1 << int(np.ceil(np.log2(length + max_lag)))
+        overlap = (length - lags)[:, np.newaxis, np.newaxis]
+
+        correlations = np.empty((len(lags), k, k))
+        if len(lags) <= nfft // 8:
+            # Short lag ranges are cheaper as one BLAS product per lag
+            for lag in lags:
+                correlations[lag] = centered[:length - lag].T @ centered[lag:]
+        else:
+            spectrum = np.fft.rfft(centered, n=nfft, axis=0)
+            for start in range(0, k, chunk_size):
+                stop = min(start + chunk_size, k)
+                correlations[:, start:stop, :] = np.fft.irfft(
+                    np.conj(spectrum[:, start:stop, np.newaxis]) * spectrum[:, np.newaxis, :],
+                    n=nfft, axis=0
+                )[:len(lags)]
+        correlations /= overlap
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlations /= np.outer(std, std)[np.newaxis]
+        correlations[~np.isfinite(correlations)] = np.nan
+        np.clip(correlations, -1.0, 1.0, out=correlations)
+
+        return {'lags': lags, 'correlations': correlations, 'columns': self.columns}
+
+def _left_align(values: np.ndarray):
+    """Move each column's non-NaN values to the top, preserving their order.
+
+    Returns the aligned (rows x columns) array, NaN-padded at the bottom, and
+    the number of valid values per column - the column-wise equivalent of
+    calling dropna() on every series.
+    """
+    mask = ~np.isnan(values)
+    order = np.argsort(~mask, axis=0, kind='stable')
+    return np.take_along_axis(values, order, axis=0), mask.sum(axis=0)
+
+def _linear_trend_forecast(aligned: np.ndarray, lengths: np.ndarray, periods: int) -> np.ndarray:
+    """Least-squares linear trend per column, solved in closed form.
+
+    Only the first lengths[j] rows of column j are used. Returns a
+    (periods x columns) array continuing each trend past its last value.
+    """
+    x = np.arange(aligned.shape[0], dtype=float)[:, np.newaxis]
+    mask = x < lengths
+    y = np.where(mask, aligned, 0.0)
+    xm = np.where(mask, x, 0.0)
+
+    n = lengths.astype(float)
+    sum_x, sum_y = xm.sum(axis=0), y.sum(axis=0)
+    sum_xx, sum_xy = (xm * xm).sum(axis=0), (xm * y).sum(axis=0)
+
+    denominator = n * sum_xx - sum_x ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(denominator != 0, (n * sum_xy - sum_x * sum_y) / denominator, 0.0)
+        intercept = np.where(n > 0, (sum_y - slope * sum_x) / n, 0.0)
+
+    future_x = lengths + np.arange(periods)[:, np.newaxis]
+    return intercept + slope * future_x
+
+def _simple_smoothing(aligned: np.ndarray, alpha: float) -> np.ndarray:
+    """Simple exponential smoothing down each column, seeded with its first value"""
+    level = np.empty_like(aligned)
+    level[0] = aligned[0]
+    if aligned.shape[0] == 1:
+        return level
+
+    if SCIPY_AVAILABLE:
+        # l[t] = alpha * x[t] + (1 - alpha) * l[t-1] as a first-order IIR filter
+        zi = ((1 - alpha) * aligned[0])[np.newaxis, :]
+        level[1:], _ = lfilter([alpha], [1, -(1 - alpha)], aligned[1:], axis=0, zi=zi)
+    else:
+        for t in range(1, aligned.shape[0]):
+            level[t] = alpha * aligned[t] + (1 - alpha) * level[t - 1]
+    return level
+
+def _holt_smoothing(aligned: np.ndarray, alpha: float, beta: float):
+    """Holt's linear trend smoothing down each column.
+
+    Seeded with l[0] = x[0] and b[0] = x[1] - x[0]. Level and trend are both
+    linear filters of the input, so with SciPy each is one lfilter call:
+    the level has transfer function alpha (1 - (1-beta) z^-1) /
+    (1 - (2 - alpha - alpha*beta) z^-1 + (1 - alpha) z^-2).
+    """
+    n = aligned.shape[0]
+    level = np.empty_like(aligned)
+    trend = np.empty_like(aligned)
+    level[0] = aligned[0]
+    trend[0] = aligned[1] - aligned[0] if n > 1 else 0.0
+
+    if SCIPY_AVAILABLE and n > 3:
+        a, c = 1 - alpha, 1 - beta
+        b_coef = [alpha, -alpha * c]
+        a_coef = [1, -(1 + a - alpha * beta), a]
+
+        # First two outputs computed explicitly, then solved for the filter state
+        level[1] = alpha * aligned[1] + a * (level[0] + trend[0])
+        trend[1] = beta * (level[1] - level[0]) + c * trend[0]
+        level[2] = alpha * aligned[2] + a * (level[1] + trend[1])
+
+        x = aligned[1:]
+        zi = np.vstack([
+            level[1] - b_coef[0] * x[0],
+            level[2] - b_coef[0] * x[1] - b_coef[1] * x[0] + a_coef[1] * level[1]
+        ])
+        level[1:], _ = lfilter(b_coef, a_coef, x, axis=0, zi=zi)
+
+        # b[t] = beta * (l[t] - l[t-1]) + (1 - beta) * b[t-1]
+        zi = (c * trend[0] - beta * level[0])[np.newaxis, :]
+        trend[1:], _ = lfilter([beta, -beta], [1, -c], level[1:], axis=0, zi=zi)
+    else:
+        for t in range(1, n):
+            level[t] = alpha * aligned[t] + (1 - alpha) * (level[t - 1] + trend[t - 1])
+            trend[t] = beta * (level[t] - level[t - 1]) + (1 - beta) * trend[t - 1]
+
+    return level, trend
+
+def _holt_winters_smoothing(aligned: np.ndarray, alpha: float, beta: float, gamma: float, season_length: int):
+    """Additive Holt-Winters smoothing down each column.
+
+    The recurrence steps through time once with every column updated
+    together, so the cost is one row of NumPy work per observation.
+    """
+    n, m = aligned.shape[0], season_length
+    level = np.full_like(aligned, np.nan)
+    trend = np.full_like(aligned, np.nan)
+    seasonal = np.full_like(aligned, np.nan)
+
+    # Initialise from the first two seasons
+    first_season = aligned[:m].mean(axis=0)
+    level[m - 1] = first_season
+    trend[m - 1] = (aligned[m:2 * m].mean(axis=0) - first_season) / m
+    seasonal[:m] = aligned[:m] - first_season
+
+    for t in range(m, n):
+        level[t] = alpha * (aligned[t] - seasonal[t - m]) + (1 - alpha) * (level[t - 1] + trend[t - 1])
+        trend[t] = beta * (level[t] - level[t - 1]) + (1 - beta) * trend[t - 1]
+        seasonal[t] = gamma * (aligned[t] - level[t]) + (1 - gamma) * seasonal[t - m]
+
+    return level, trend, seasonal
+
+def exponential_smoothing(values: Any, mode: str = 'simple', alpha: float = 0.3, beta: float = 0.1,
+                          gamma: float = 0.1, season_length: int = 12, periods: int = 0,
+                          lengths: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """Exponential smoothing kernel for one or many series.
+
+    values is a 1-D series or a 2-D (time x series) array; all series are
+    smoothed together. mode is 'simple', 'holt' (trend) or 'holt_winters'
+    (additive trend + seasonality, needs two full seasons). lengths gives the
+    number of valid leading rows per column when series of different length
+    are stacked NaN-padded; forecasts then continue from each column's own
+    last value. Returns level/trend/seasonal arrays and a (periods x series)
+    forecast, squeezed back to 1-D for 1-D input.
+    """
+    array = np.asarray(values, dtype=float)
+    is_1d = array.ndim == 1
+    if is_1d:
+        array = array[:, np.newaxis]
+
+    n_rows, n_series = array.shape
+    if lengths is None:
+        lengths = np.full(n_series, n_rows)
+    last = lengths - 1
+    columns = np.arange(n_series)
+    horizon = np.arange(1, periods + 1)[:, np.newaxis]
+
+    trend = seasonal = None
+    if mode == 'simple':
+        level = _simple_smoothing(array, alpha)
+        forecast = np.tile(level[last, columns], (periods, 1))
+    elif mode == 'holt':
+        level, trend = _holt_smoothing(array, alpha, beta)
+        forecast = level[last, columns] + horizon * trend[last, columns]
+    elif mode == 'holt_winters':
+        if lengths.min() < 2 * season_length:
+            raise ValueError(f'Holt-Winters needs at least {2 * season_length} observations per series')
+        level, trend, seasonal = _holt_winters_smoothing(array, alpha, beta, gamma, season_length)
+        season_rows = last - season_length + 1 + (horizon - 1) % season_length
+        forecast = level[last, columns] + horizon * trend[last, columns] + seasonal[season_rows, columns]
+    else:
+        raise ValueError(f'Unknown smoothing mode: {mode}')
+
+    result = {'level': level, 'trend': trend, 'seasonal': seasonal, 'forecast': forecast}
+    if is_1d:
+        result = {key: (val[:, 0] if val is not None else None) for key, val in result.items()}
+    return result
+
+class AIEngine:
+    """Advanced AI Engine for Business Intelligence"""
+
+    def __init__(self, model_cache: Optional[ModelCache] = None, model_cache_dir: Optional[str] = None):
+        if model_cache is None:
+            model_cache = ModelCache(persist_dir=model_cache_dir) if model_cache_dir else _default_model_cache
+        self.models = model_cache
+        self.scalers = {}
+        self.insights_cache = _shared_insights_cache
+        self.insights_cache_ttl = INSIGHTS_CACHE_TTL
+        self._insights_lock = _shared_insights_lock
+        self.segmenters: Dict[tuple, Dict] = {}
+        self.anomaly_threshold = 2.0
+
+    def generate_smart_insights(self, data: pd.DataFrame, kpi: str) -> List[Dict]:
+        """Generate AI-powered business insights"""
+        insights = []
+
+        if kpi not in data.columns:
+            return insights
+
+        values = data[kpi].dropna()
+        if len(values) < 3:
+            return insights
+
+        # Trend analysis
+        trend = self._analyze_trend(values)
+        insights.append({
+            'type': 'trend',
+            'title': f'{kpi} Trend Analysis',
+            'insight': f'{kpi} shows {trend["direction"]} trend with {trend["strength"]} strength',
+            'confidence': trend['confidence'],
+            'action': self._get_trend_action(trend, kpi)
+        })
+
+        # Volatility analysis
+        volatility = self._analyze_volatility(values)
+        if volatility['level'] == 'high':
+            insights.append({
+                'type': 'volatility',
+                'title': f'{kpi} Volatility Alert',
+                'insight': f'High volatility detected in {kpi} (σ={volatility["std"]:.2f})',
+                'confidence': 0.85,
+                'action': f'Consider stabilizing factors affecting {kpi}'
+            })
+
+        # Performance vs benchmark
+        benchmark = self._get_benchmark(kpi)
+        if benchmark:
+            performance = self._compare_to_benchmark(values.iloc[-1], benchmark)
+            insights.append({
+                'type': 'benchmark',
+                'title': f'{kpi} Benchmark Comparison',
+                'insight': f'{kpi} is {performance["status"]} benchmark by {performance["difference"]:.1f}%',
+                'confidence': 0.90,
+                'action': performance['recommendation']
+            })
+
+        return insights
+
+    def predict_kpi(self, data: pd.DataFrame, kpi: str, periods: int = 6, method: str = 'auto') -> Dict:
+        """Advanced KPI prediction with multiple models"""
+        if kpi not in data.columns:
+            return {'error': f'KPI {kpi} not found in data'}
+
+        values = data[kpi].dropna()
+        if len(values) < 10:
+            return {'error': 'Insufficient data for prediction'}
+
+        predictions = {}
+
+        # Linear Regression
+        if ML_AVAILABLE:
+            linear_pred = self._linear_prediction(values, periods)
+            predictions['linear'] = linear_pred
+
+        # Prophet (if available)
+        if PROPHET_AVAILABLE and 'Date' in data.columns:
+            prophet_pred = self._prophet_prediction(data, kpi, periods)
+            predictions['prophet'] = prophet_pred
+
+        # ARIMA-like simple prediction
+        arima_pred = self._simple_arima_prediction(values, periods)
+        predictions['arima'] = arima_pred
+
+        # Ensemble prediction
+        ensemble_pred = self._ensemble_prediction(predictions, periods)
+
+        return {
+            'predictions': ensemble_pred,
+            'confidence_intervals': self._calculate_confidence_intervals(predictions, periods),
+            'model_performance': self._evaluate_models(predictions, values),
+            'recommendations': self._generate_prediction_recommendations(ensemble_pred, values)
+        }
+
+    def predict_kpi_batch(self, data: pd.DataFrame, kpis: Optional[List[str]] = None, periods: int = 6) -> Dict:
+        """Forecast many KPI columns of a wide DataFrame in one pass.
+
+        Linear trends are solved in closed form for all columns at once and
+        exponential smoothing runs down every column together, including the
+        holdout evaluation. Results are keyed by KPI in the same shape as
+        predict_kpi; Prophet is not part of the batch path since it fits one
+        series at a time.
+        """
+        started = time.perf_counter()
+        timings = {}
+
+        if kpis is None:
+            kpis = data.select_dtypes(include=[np.number]).columns.tolist()
+
+        results = {}
+        for kpi in kpis:
+            if kpi not in data.columns:
+                results[kpi] = {'error': f'KPI {kpi} not found in data'}
+
+        candidates = [kpi for kpi in kpis if kpi not in results]
+        aligned, lengths = _left_align(data[candidates].to_numpy(dtype=float)) if candidates else (None, None)
+
+        batch_kpis = []
+        for idx, kpi in enumerate(candidates):
+            if lengths[idx] < 10:
+                results[kpi] = {'error': 'Insufficient data for prediction'}
+            else:
+                batch_kpis.append(idx)
+
+        if batch_kpis:
+            aligned, lengths = aligned[:, batch_kpis], lengths[batch_kpis]
+
+            t0 = time.perf_counter()
+            predictions = {'linear': _linear_trend_forecast(aligned, lengths, periods)}
+            timings['linear'] = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            predictions['arima'] = exponential_smoothing(aligned, 'simple', alpha=0.3, periods=periods,
+                                                         lengths=lengths)['forecast']
+            timings['arima'] = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            ensemble = np.mean([pred for pred in predictions.values()], axis=0)
+            spread = {method: np.std(pred, axis=0) for method, pred in predictions.items()}
+            timings['ensemble'] = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            performance = self._evaluate_models_batch(aligned, lengths)
+            timings['evaluation'] = time.perf_counter() - t0
+
+            for col, idx in enumerate(batch_kpis):
+                kpi = candidates[idx]
+                kpi_ensemble = ensemble[:, col].tolist()
+                historical = pd.Series(aligned[:lengths[col], col])
+
+                results[kpi] = {
+                    'predictions': kpi_ensemble,
+                    'confidence_intervals': {
+                        method: {
+                            'lower': (pred[:, col] - 1.96 * spread[method][col]).tolist(),
+                            'upper': (pred[:, col] + 1.96 * spread[method][col]).tolist()
+                        }
+                        for method, pred in predictions.items()
+                    },
+                    'model_performance': {method: metrics[col] for method, metrics in performance.items()},
+                    'recommendations': self._generate_prediction_recommendations(kpi_ensemble, historical)
+                }
+
+        timings['total'] = time.perf_counter() - started
+
+        return {
+            'results': results,
+            'timings': timings,
+            'kpis_forecast': len(batch_kpis)
+        }
+
+    def _evaluate_models_batch(self, aligned: np.ndarray, lengths: np.ndarray) -> Dict[str, List[Dict]]:
+        """Holdout evaluation of the linear and smoothing models for every column"""
+        columns = np.arange(aligned.shape[1])
+        test_sizes = np.maximum(2, (lengths * 0.2).astype(int))
+        train_lengths = lengths - test_sizes
+        horizon = int(test_sizes.max())
+
+        # Actual holdout values, masked beyond each column's own test size
+        steps = np.arange(horizon)[:, np.newaxis]
+        in_test = steps < test_sizes
+        actual_rows = np.minimum(train_lengths + steps, aligned.shape[0] - 1)
+        actual = np.where(in_test, aligned[actual_rows, columns], np.nan)
+
+        holdout_predictions = {
+            'linear': _linear_trend_forecast(aligned, train_lengths, horizon),
+            'arima': exponential_smoothing(aligned, 'simple', alpha=0.3, periods=horizon,
+                                           lengths=np.maximum(train_lengths, 1))['forecast']
+        }
+
+        performance = {}
+        for method, predicted in holdout_predictions.items():
+            errors = np.abs(actual - predicted)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mae = np.nanmean(errors, axis=0)
+                mape = np.nanmean(np.abs((actual - predicted) / actual), axis=0) * 100
+
+            performance[method] = [
+                {'mae': float(mae[col]), 'mape': float(mape[col]), 'accuracy': float(max(0, 100 - mape[col]))}
+                for col in columns
+            ]
+
+        return performance
+
+    def detect_anomalies(self, data: pd.DataFrame, kpi: str, method: str = 'isolation_forest',
+                         seasonality: str = 'monthly') -> Dict:
+        """Advanced anomaly detection
+
+        seasonality selects the seasonal baseline: 'monthly' (12-period),
+        'weekly' (7-period), 'quarterly' (4-period) or 'hijri_month' (needs
+        a 'Date' column). Any other value, or 'hijri_month' without dates,
+        returns an error instead of falling back to another profile.
+        """
+        if kpi not in data.columns:
+            return {'error': f'KPI {kpi} not found in data'}
+
+        if seasonality == 'hijri_month':
+            if 'Date' not in data.columns:
+                return {'error': "seasonality='hijri_month' requires a 'Date' column"}
+        elif seasonality not in SEASONAL_PERIODS:
+            return {'error': f'Unknown seasonality {seasonality!r}; expected one of '
+                             f"{sorted(SEASONAL_PERIODS) + ['hijri_month']}"}
+
+        values = data[kpi].dropna()
+        if len(values) < 10:
+            return {'error': 'Insufficient data for anomaly detection'}
+
+        anomalies = {}
+
+        if ML_AVAILABLE and method == 'isolation_forest':
+            anomalies['isolation_forest'] = self._isolation_forest_anomalies(values)
+
+        # Statistical anomalies (Z-score)
+        anomalies['statistical'] = self._statistical_anomalies(values)
+
+        # Seasonal anomalies
+        if len(values) >= 12:
+            if seasonality == 'hijri_month':
+                season_labels = hijri_month(data.loc[values.index, 'Date'])
+                anomalies['seasonal'] = self._seasonal_anomalies(values, season_labels=season_labels)
+            else:
+                anomalies['seasonal'] = self._seasonal_anomalies(values, SEASONAL_PERIODS[seasonality])
+
+        # Combine results
+        combined_anomalies = self._combine_anomaly_results(anomalies, values)
+
+        return {
+            'anomalies': combined_anomalies,
+            'severity': self._assess_anomaly_severity(combined_anomalies, values),
+            'explanations': self._explain_anomalies(combined_anomalies, values),
+            'recommendations': self._anomaly_recommendations(combined_anomalies)
+        }
+
+    def create_anomaly_detector(self, data: Optional[pd.DataFrame] = None, kpi: Optional[str] = None,
+                                season_length: int = 12, window_size: int = 30) -> StreamingAnomalyDetector:
+        """Create a streaming anomaly detector, warm-started on data[kpi] if given"""
+        detector = StreamingAnomalyDetector(
+            threshold=self.anomaly_threshold,
+            season_length=season_length,
+            window_size=window_size
+        )
+        if data is not None and kpi in data.columns:
+            detector.warm_start(data[kpi].dropna().to_numpy())
+        return detector
+
+    def smart_threshold_optimization(self, data: pd.DataFrame, kpi: str, target: float) -> Dict:
+        """AI-powered threshold optimization"""
+        if kpi not in data.columns:
+            return {'error': f'KPI {kpi} not found in data'}
+
+        values = data[kpi].dropna()
+        if len(values) < 20:
+            return {'error': 'Insufficient data for threshold optimization'}
+
+        # Analyze historical performance
+        performance_analysis = self._analyze_performance_distribution(values, target)
+
+        # Optimize thresholds based on data distribution
+        optimized_thresholds = self._optimize_thresholds(values, target)
+
+        # Calculate threshold effectiveness
+        effectiveness = self._calculate_threshold_effectiveness(values, optimized_thresholds)
+
+        return {
+            'optimized_thresholds': optimized_thresholds,
+            'performance_analysis': performance_analysis,
+            'effectiveness_score': effectiveness,
+            'recommendations': self._threshold_recommendations(optimized_thresholds, performance_analysis)
+        }
+
+    def create_correlation_tracker(self, data: Optional[pd.DataFrame] = None, columns: Optional[List[str]] = None,
+                                   max_history: int = 5000) -> IncrementalCorrelation:
+        """Create an incremental correlation tracker, seeded with data if given"""
+        tracker = IncrementalCorrelation(columns=columns, max_history=max_history)
+        if data is not None:
+            tracker.update(data)
+        return tracker
+
+    def correlation_analysis(self, data: Optional[pd.DataFrame], max_lag: int = 12,
+                             tracker: Optional[IncrementalCorrelation] = None) -> Dict:
+        """Advanced correlation and causation analysis
+
+        With a tracker, data holds only newly appended rows (or None) and is
+        folded into the tracker's running statistics instead of recomputing
+        the correlations over the full history.
+        """
+        if tracker is None:
+            tracker = self.create_correlation_tracker(data)
+        elif data is not None:
+            tracker.update(data)
+
+        if tracker.columns is None or len(tracker.columns) < 2:
+            return {'error': 'Insufficient numeric columns for correlation analysis'}
+
+        # Correlation matrix
+        corr_matrix = tracker.correlation_matrix()
+
+        # Find strong correlations
+        strong_correlations = self._find_strong_correlations(corr_matrix)
+
+        # Lag correlation analysis
+        lag_result = tracker.lag_correlations(max_lag)
+        lag_correlations = self._lag_correlation_analysis(lag_result)
+
+        # Causation hints (Granger-like)
+        causation_hints = self._analyze_causation_hints(lag_result, lag_correlations)
+
+        return {
+            'correlation_matrix': corr_matrix.to_dict(),
+            'strong_correlations': strong_correlations,
+            'lag_correlations': lag_correlations,
+            'causation_hints': causation_hints,
+            'insights': self._generate_correlation_insights(strong_correlations, lag_correlations)
+        }
+
+    def _find_strong_correlations(self, corr_matrix: pd.DataFrame, threshold: float = 0.7) -> List[Dict]:
+        """Column pairs with |correlation| above threshold, strongest first"""
+        values = corr_matrix.to_numpy()
+        rows, cols = np.triu_indices(len(values), k=1)
+        pair_corr = values[rows, cols]
+        strong = np.abs(np.nan_to_num(pair_corr)) >= threshold
+        order = np.argsort(-np.abs(pair_corr[strong]))
+
+        columns = corr_matrix.columns
+        return [
+            {
+                'variable_1': columns[i],
+                'variable_2': columns[j],
+                'correlation': float(r),
+                'strength': 'very strong' if abs(r) >= 0.9 else 'strong',
+                'direction': 'positive' if r > 0 else 'negative'
+            }
+            for i, j, r in zip(rows[strong][order], cols[strong][order], pair_corr[strong][order])
+        ]
+
+    def _lag_correlation_analysis(self, lag_result: Dict[str, Any], min_correlation: float = 0.5) -> List[Dict]:
+        """Best positive lag per ordered column pair where the lagged correlation is notable"""
+        correlations = lag_result['correlations']
+        if correlations.shape[0] < 2:
+            return []
+
+        lagged = np.nan_to_num(correlations[1:])
+        best = np.abs(lagged).argmax(axis=0)
+        best_corr = np.take_along_axis(lagged, best[np.newaxis], axis=0)[0]
+        np.fill_diagonal(best_corr, 0.0)
+
+        rows, cols = np.nonzero(np.abs(best_corr) >= min_correlation)
+        order = np.argsort(-np.abs(best_corr[rows, cols]))
+        columns = lag_result['columns']
+        return [
+            {
+                'leading': columns[i],
+                'lagging': columns[j],
+                'lag': int(lag_result['lags'][1:][best[i, j]]),
+                'correlation': float(best_corr[i, j]),
+                'contemporaneous_correlation': float(np.nan_to_num(correlations[0, i, j]))
+            }
+            for i, j in zip(rows[order], cols[order])
+        ]
+
+    def _analyze_causation_hints(self, lag_result: Dict[str, Any], lag_correlations: List[Dict],
+                                 margin: float = 0.1) -> List[Dict]:
+        """Lead-lag pairs where the lagged link beats both the same-period and reverse-direction links"""
+        correlations = np.nan_to_num(lag_result['correlations'])
+        if correlations.shape[0] < 2:
+            return []
+
+        index = {col: i for i, col in enumerate(lag_result['columns'])}
+        reverse_best = np.abs(correlations[1:]).max(axis=0)
+
+        hints = []
+        for item in lag_correlations:
+            i, j = index[item['leading']], index[item['lagging']]
+            strength = abs(item['correlation'])
+            if strength < abs(item['contemporaneous_correlation']) + margin or strength < reverse_best[j, i] + margin:
+                continue
+            hints.append({
+                'cause': item['leading'],
+                'effect': item['lagging'],
+                'lag': item['lag'],
+                'lagged_correlation': item['correlation'],
+                'confidence': 'high' if strength >= 0.8 else 'medium'
+            })
+        return hints
+
+    def _generate_correlation_insights(self, strong_correlations: List[Dict], lag_correlations: List[Dict],
+                                       limit: int = 5) -> List[str]:
+        """Readable summary of the strongest relationships"""
+        insights = []
+        for item in strong_correlations[:limit]:
+            insights.append(
+                f"{item['variable_1']} and {item['variable_2']} have a {item['strength']} "
+                f"{item['direction']} correlation ({item['correlation']:.2f})"
+            )
+        for item in lag_correlations[:limit]:
+            insights.append(
+                f"{item['leading']} leads {item['lagging']} by {item['lag']} period(s) "
+                f"(correlation {item['correlation']:.2f})"
+            )
+        if not insights:
+            insights.append('No strong or lagged correlations found between numeric columns')
+        return insights
+
+    def smart_segmentation(self, data: pd.DataFrame, features: List[str], n_segments: int = 5,
+                           method: str = 'kmeans', batch_size: int = 1024,
+                           segmenter_id: Optional[str] = None) -> Dict:
+        """AI-powered customer/data segmentation
+
+        method='kmeans' runs a full K-means fit (cached by data fingerprint).
+        method='minibatch' fits MiniBatchKMeans, warm-started from the centers
+        of the last minibatch model for the same segmenter_id, features and k,
+        and keeps that model for partial_fit_segments. Without a segmenter_id
+        the model is kept on this engine only.
+        """
+        if not ML_AVAILABLE:
+            return {'error': 'ML libraries not available for segmentation'}
+
+        # Prepare data
+        segment_data = data[features].dropna()
+        if len(segment_data) < n_segments * 2:
+            return {'error': 'Insufficient data for segmentation'}
+
+        if method == 'minibatch':
+            state = self._fit_minibatch_segmenter(segment_data, features, n_segments, batch_size, segmenter_id)
+            scaler, kmeans = state['scaler'], state['model']
+            segments = kmeans.predict(scaler.transform(segment_data))
+        else:
+            def _fit():
+                # Normalize data, then K-means clustering
+                scaler = StandardScaler().fit(segment_data)
+                kmeans = KMeans(n_clusters=n_segments, random_state=42).fit(scaler.transform(segment_data))
+                return scaler, kmeans
+
+            cache_key = fingerprint_data(segment_data, model='kmeans', n_clusters=n_segments, random_state=42)
+            # The scaler is cached with the model, so both are evicted together
+            scaler, kmeans = self.models.get_or_fit(cache_key, _fit)
+            segments = kmeans.labels_
+
+        return self._segmentation_result(segment_data, segments, kmeans.cluster_centers_, features)
+
+    def _segmenter_slot(self, segmenter_id: Optional[str], features: List[str], n_segments: int):
+        """Return the (store, key) holding minibatch state for these arguments"""
+        if segmenter_id is None:
+            return self.segmenters, (tuple(features), n_segments)
+        return _shared_segmenters, (segmenter_id, tuple(features), n_segments)
+
+    def clear_segmenters(self, segmenter_id: Optional[str] = None) -> int:
+        """Drop minibatch segmentation state so the next fit starts fresh
+
+        With a segmenter_id, drops the shared state registered under that id;
+        otherwise drops the state kept on this engine. Returns the number of
+        models removed.
+        """
+        with _segmenters_lock:
+            if segmenter_id is None:
+                removed = len(self.segmenters)
+                self.segmenters.clear()
+                return removed
+            keys = [key for key in _shared_segmenters if key[0] == segmenter_id]
+            for key in keys:
+                del _shared_segmenters[key]
+            return len(keys)
+
+    def _fit_minibatch_segmenter(self, segment_data: pd.DataFrame, features: List[str], n_segments: int,
+                                 batch_size: int, segmenter_id: Optional[str] = None) -> Dict:
+        """Fit MiniBatchKMeans, starting from the previous centers when available"""
+        store, key = self._segmenter_slot(segmenter_id, features, n_segments)
+        with _segmenters_lock:
+            previous = store.get(key)
+
+        if previous is not None:
+            # Keep the original scaler so warm-start centers stay in the same space
+            scaler = previous['scaler']
+            init, n_init = previous['model'].cluster_centers_, 1
+        else:
+            scaler = StandardScaler().fit(segment_data)
+            init, n_init = 'k-means++', 3
+
+        model = MiniBatchKMeans(
+            n_clusters=n_segments, init=init, n_init=n_init, batch_size=batch_size, random_state=42
+        ).fit(scaler.transform(segment_data))
+
+        state = {'scaler': scaler, 'model': model, 'rows_seen': len(segment_data)}
+        with _segmenters_lock:
+            store[key] = state
+        return state
+
+    def partial_fit_segments(self, data: Any, features: List[str], n_segments: int = 5,
+                             batch_size: int = 1024, segmenter_id: Optional[str] = None) -> Dict:
+        """Update the minibatch segmentation with new rows without a full refit
+
+        data may be a DataFrame or an iterable of DataFrame chunks. The first
+        call fits the scaler once at least n_segments rows have arrived
+        (smaller leading chunks are buffered); later rows only move the
+        existing centers. Returns the segments of the rows passed in.
+
+        Fitting runs on a copy of the stored model, which replaces the stored
+        one when the update finishes; concurrent updates to the same
+        segmenter keep the last one to finish.
+        """
+        if not ML_AVAILABLE:
+            return {'error': 'ML libraries not available for segmentation'}
+        if batch_size < n_segments:
+            return {'error': f'batch_size ({batch_size}) must be at least n_segments ({n_segments})'}
+
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+        store, key = self._segmenter_slot(segmenter_id, features, n_segments)
+
+        with _segmenters_lock:
+            stored = store.get(key)
+        # The scaler is never refitted, so only the model needs copying
+        state = None if stored is None else {
+            'scaler': stored['scaler'],
+            'model': copy.deepcopy(stored['model']),
+            'rows_seen': stored['rows_seen']
+        }
+
+        seen = []
+        pending = []
+        for chunk in chunks:
+            chunk_data = chunk[features].dropna()
+            if chunk_data.empty:
+                continue
+            seen.append(chunk_data)
+
+            if state is None:
+                # The first partial_fit needs at least n_segments rows
+                pending.append(chunk_data)
+                chunk_data = pd.concat(pending) if len(pending) > 1 else pending[0]
+                if len(chunk_data) < n_segments:
+                    continue
+                pending = []
+                state = {
+                    'scaler': StandardScaler().fit(chunk_data),
+                    'model': MiniBatchKMeans(n_clusters=n_segments, batch_size=batch_size, random_state=42),
+                    'rows_seen': 0
+                }
+
+            scaled = state['scaler'].transform(chunk_data)
+            for start in range(0, len(scaled), batch_size):
+                state['model'].partial_fit(scaled[start:start + batch_size])
+            state['rows_seen'] += len(chunk_data)
+
+        if state is not None and state['rows_seen']:
+            with _segmenters_lock:
+                store[key] = state
+
+        if state is None or not seen:
+            return {'error': 'Insufficient data for segmentation'}
+
+        segment_data = pd.concat(seen) if len(seen) > 1 else seen[0]
+        segments = state['model'].predict(state['scaler'].transform(segment_data))
+
+        result = self._segmentation_result(segment_data, segments, state['model'].cluster_centers_, features)
+        result['rows_seen'] = state['rows_seen']
+        return result
+
+    def segmentation_sweep(self, data: pd.DataFrame, features: List[str], k_values: Optional[List[int]] = None,
+                           sample_size: int = 5000, batch_size: int = 1024,
+                           max_workers: Optional[int] = None) -> Dict:
+        """Elbow/silhouette sweep over candidate segment counts, fitted in parallel"""
+        if not ML_AVAILABLE:
+            return {'error': 'ML libraries not available for segmentation'}
+
+        segment_data = data[features].dropna()
+        k_values = [k for k in (k_values or range(2, 11)) if 2 <= k < len(segment_data)]
+        if not k_values:
+            return {'error': 'Insufficient data for segmentation'}
+
+        scaled = StandardScaler().fit_transform(segment_data)
+        with ThreadPoolExecutor(max_workers=max_workers or len(k_values)) as executor:
+            candidates = list(executor.map(
+                lambda k: _fit_segment_candidate(scaled, k, sample_size, batch_size), k_values
+            ))
+
+        scored = [c for c in candidates if c['silhouette'] is not None]
+        best_k = max(scored, key=lambda c: c['silhouette'])['k'] if scored else None
+
+        # Elbow: the point furthest below the line joining the first and last inertia
+        inertia = np.array([c['inertia'] for c in candidates])
+        elbow_k = None
+        if len(candidates) >= 3:
+            ks = np.array(k_values, dtype=float)
+            line = inertia[0] + (inertia[-1] - inertia[0]) * (ks - ks[0]) / (ks[-1] - ks[0])
+            elbow_k = int(ks[np.argmax(line - inertia)])
+
+        return {'candidates': candidates, 'best_k': best_k, 'elbow_k': elbow_k}
+
+    def _segmentation_result(self, segment_data: pd.DataFrame, segments: np.ndarray, centers: np.ndarray,
+                             features: List[str]) -> Dict:
+        """Shared segmentation response for every fitting path"""
+        # Analyze segments
+        segment_analysis = self._analyze_segments(segment_data, segments, features)
+
+        # Generate segment insights
+        segment_insights = self._generate_segment_insights(segment_analysis)
+
+        return {
+            'segments': segments.tolist(),
+            'segment_centers': centers.tolist(),
+            'segment_analysis': segment_analysis,
+            'insights': segment_insights,
+            'recommendations': self._segment_recommendations(segment_analysis)
+        }
+
+    def _analyze_segments(self, segment_data: pd.DataFrame, segments: np.ndarray, features: List[str]) -> Dict:
+        """Size and feature profile of each segment relative to the overall mean"""
+        grouped = segment_data[features].groupby(segments)
+        means = grouped.mean()
+        sizes = grouped.size()
+        overall = segment_data[features].mean()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relative = (means - overall) / overall.abs().replace(0, np.nan) * 100
+
+        analysis = {}
+        for segment in means.index:
+            deviations = relative.loc[segment].dropna()
+            analysis[int(segment)] = {
+                'size': int(sizes[segment]),
+                'percentage': float(sizes[segment] / len(segment_data) * 100),
+                'feature_means': means.loc[segment].to_dict(),
+                'relative_to_average_pct': deviations.to_dict(),
+                'defining_feature': deviations.abs().idxmax() if not deviations.empty else None
+            }
+        return analysis
+
+    def _generate_segment_insights(self, segment_analysis: Dict) -> List[str]:
+        """One line per segment naming its most distinctive feature"""
+        insights = []
+        for segment, profile in segment_analysis.items():
+            text = f"Segment {segment}: {profile['size']} records ({profile['percentage']:.1f}%)"
+            feature = profile['defining_feature']
+            if feature is not None:
+                deviation = profile['relative_to_average_pct'][feature]
+                text += f", {feature} {abs(deviation):.0f}% {'above' if deviation > 0 else 'below'} average"
+            insights.append(text)
+        return insights
+
+    def _segment_recommendations(self, segment_analysis: Dict) -> List[str]:
+        """Actions for the largest and any unusually small segments"""
+        recommendations = []
+        if not segment_analysis:
+            return recommendations
+
+        largest = max(segment_analysis, key=lambda s: segment_analysis[s]['size'])
+        recommendations.append(f'Prioritise engagement programmes for segment {largest}, the largest group')
+
+        for segment, profile in segment_analysis.items():
+            if profile['percentage'] < 5:
+                recommendations.append(f'Review segment {segment}: small group that may be outliers or a niche')
+        return recommendations
+
+    def predictive_maintenance(self, data: pd.DataFrame, asset_col: str, performance_cols: List[str],
+                               as_dict: bool = False, fit_models: bool = False, min_history: int = 30,
+                               max_workers: Optional[int] = None, recent_readings: int = 3) -> Any:
+        """Predictive maintenance analysis for every asset at once.
+
+        Rows are partitioned by asset once and degradation/failure-risk
+        features are computed as grouped aggregates (rows are assumed to be
+        in time order, and higher performance values are assumed better).
+        Decline is the fitted drift over the asset's history in units of its
+        standard deviation, so it is independent of the sensor's offset and
+        scale; a weak reading only counts when each of the last
+        recent_readings readings is below the asset's mean. With
+        fit_models=True, assets with at least min_history rows also get an
+        Isolation Forest fitted in a process pool, and the share of their
+        recent rows it flags raises their risk.
+
+        Returns a DataFrame with one row per asset. This replaced the former
+        per-asset dict return; pass as_dict=True for that form.
+        """
+        if asset_col not in data.columns:
+            return {'error': f'Asset column {asset_col} not found'}
+
+        performance_cols = [col for col in performance_cols if col in data.columns]
+        if not performance_cols:
+            return {'error': 'None of the performance columns were found'}
+        frame = data[[asset_col] + performance_cols]
+
+        results = self._maintenance_features(frame, asset_col, performance_cols, recent_readings)
+
+        if fit_models and ML_AVAILABLE and performance_cols:
+            anomaly_rates = self._maintenance_anomaly_rates(frame, asset_col, performance_cols, min_history, max_workers)
+            results['anomaly_rate'] = results.index.map(anomaly_rates).astype(float)
+            results['failure_risk'] = np.clip(results['failure_risk'] + 0.5 * results['anomaly_rate'].fillna(0), 0, 1)
+
+        risk = results['failure_risk'].to_numpy()
+        results['risk_level'] = np.select([risk >= 0.7, risk >= 0.4], ['high', 'medium'], default='low')
+        results['recommendation'] = np.select(
+            [risk >= 0.7, risk >= 0.4],
+            ['Schedule immediate maintenance inspection',
+             'Plan preventive maintenance within the next cycle'],
+            default='Continue routine monitoring'
+        )
+
+        if as_dict:
+            return self._maintenance_to_dict(results, performance_cols)
+        return results
+
+    def _maintenance_features(self, frame: pd.DataFrame, asset_col: str, performance_cols: List[str],
+                              recent_readings: int = 3) -> pd.DataFrame:
+        """Per-asset trend, drift and recent z-scores for every performance column"""
+        grouped = frame.groupby(asset_col, sort=False)
+        position = grouped.cumcount().to_numpy(dtype=float)
+
+        # Sums for a closed-form least-squares slope per (asset, column)
+        values = frame[performance_cols].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        x = np.where(valid, position[:, np.newaxis], 0.0)
+        y = np.where(valid, values, 0.0)
+        sums = pd.DataFrame(
+            np.hstack([valid, x, y, x * x, x * y]),
+            index=frame.index
+        ).groupby(frame[asset_col].to_numpy(), sort=False).sum()
+
+        k = len(performance_cols)
+        n, sum_x, sum_y, sum_xx, sum_xy = (sums.iloc[:, i * k:(i + 1) * k].to_numpy() for i in range(5))
+
+        stats = grouped[performance_cols].agg(['mean', 'std', 'last'])
+        mean = stats.xs('mean', axis=1, level=1).to_numpy()
+        std = stats.xs('std', axis=1, level=1).to_numpy()
+        last = stats.xs('last', axis=1, level=1).to_numpy()
+
+        # Strongest of the last few readings: if even that is weak, all of them are
+        recent = frame.groupby(asset_col, sort=False).tail(recent_readings).groupby(asset_col, sort=False)
+        recent_best = recent[performance_cols].max().reindex(stats.index).to_numpy(dtype=float)
+        recent_count = recent[performance_cols].count().reindex(stats.index).to_numpy()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            denominator = n * sum_xx - sum_x ** 2
+            slope = np.where(denominator != 0, (n * sum_xy - sum_x * sum_y) / denominator, 0.0)
+            drift = slope * np.maximum(n - 1, 0)
+            change_pct = np.where(mean != 0, drift / np.abs(mean) * 100, 0.0)
+            drift_std = np.where(std > 0, drift / std, 0.0)
+            last_zscore = np.where(std > 0, (last - mean) / std, 0.0)
+            recent_zscore = np.where((std > 0) & (recent_count >= recent_readings), (recent_best - mean) / std, 0.0)
+
+        results = pd.DataFrame(index=stats.index)
+        results['observations'] = grouped.size().to_numpy()
+        for i, col in enumerate(performance_cols):
+            results[f'{col}_trend'] = slope[:, i]
+            results[f'{col}_change_pct'] = change_pct[:, i]
+            results[f'{col}_drift_std'] = drift_std[:, i]
+            results[f'{col}_last_zscore'] = last_zscore[:, i]
+            results[f'{col}_recent_zscore'] = recent_zscore[:, i]
+
+        # Worst column drives the risk. Noise alone drifts by about sqrt(12/n)
+        # std, so decline starts at a 1-std drift and saturates at 3 (a clean
+        # linear ramp drifts sqrt(12) ~ 3.5 std); the recent readings must all
+        # sit more than 1 std below the mean before they add risk.
+        decline = np.nan_to_num(np.clip((-drift_std - 1) / 2, 0, 1))
+        weak_recent = np.nan_to_num(np.clip((-recent_zscore - 1) / 2, 0, 1))
+        results['degradation_score'] = decline.max(axis=1)
+        results['failure_risk'] = np.clip(decline + weak_recent, 0, 1).max(axis=1)
+
+        return results
+
+    def _maintenance_anomaly_rates(self, frame: pd.DataFrame, asset_col: str, performance_cols: List[str],
+                                   min_history: int, max_workers: Optional[int]) -> Dict[Any, float]:
+        """Fit per-asset anomaly models in a process pool, falling back to serial fitting"""
+        tasks = []
+        for asset, asset_frame in frame.groupby(asset_col, sort=False):
+            if len(asset_frame) < min_history:
+                continue
+            matrix = asset_frame[performance_cols].to_numpy(dtype=float)
+            matrix = np.where(np.isnan(matrix), np.nanmean(matrix, axis=0), matrix)
+            matrix = np.nan_to_num(matrix)
+            tasks.append((asset, matrix, max(1, len(matrix) // 10)))
+
+        if not tasks:
+            return {}
+
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                return dict(executor.map(_fit_asset_anomaly_rate, tasks, chunksize=max(1, len(tasks) // 32)))
+        except (BrokenProcessPool, OSError, PicklingError) as e:
+            # Pool could not start or lost a worker (e.g. no fork/spawn allowed here)
+            logger.warning(f"Process pool unavailable for maintenance models, fitting serially: {e}")
+            return dict(_fit_asset_anomaly_rate(task) for task in tasks)
+
+    def _maintenance_to_dict(self, results: pd.DataFrame, performance_cols: List[str]) -> Dict:
+        """Convert per-asset maintenance rows to the nested dict form"""
+        maintenance_insights = {}
+
+        for asset, row in results.iterrows():
+            maintenance_insights[asset] = {
+                'degradation_analysis': {
+                    col: {
+                        'trend': row[f'{col}_trend'],
+                        'change_pct': row[f'{col}_change_pct'],
+                        'drift_std': row[f'{col}_drift_std'],
+                        'last_zscore': row[f'{col}_last_zscore'],
+                        'recent_zscore': row[f'{col}_recent_zscore']
+                    }
+                    for col in performance_cols
+                },
+                'failure_risk': {
+                    'score': row['failure_risk'],
+                    'level': row['risk_level'],
+                    'anomaly_rate': row.get('anomaly_rate')
+                },
+                'recommendations': [row['recommendation']]
+            }
+
+        return maintenance_insights
+
+    def natural_language_insights(self, data: pd.DataFrame, query: str) -> Dict:
+        """Process natural language queries about data
+
+        The query is planned into (intent, kpi) steps; each step's insight is
+        cached by (intent, kpi, fingerprint of that KPI's values and the Date
+        column) for insights_cache_ttl seconds in a cache shared by all
+        engines, and uncached steps run concurrently.
+        """
+        query_lower = query.lower()
+        plan = self._plan_query(query_lower, data.columns)
+
+        now = time.monotonic()
+        results, pending = {}, {}
+        for step in plan:
+            # Forecast and anomaly steps also read the dates
+            key = step + (fingerprint_data(data[[col for col in ('Date', step[1]) if col in data.columns]]),)
+            with self._insights_lock:
+                cached = self.insights_cache.get(key)
+            if cached is not None and cached[0] > now:
+                results[step] = cached[1]
+            else:
+                pending[step] = key
+
+        if pending:
+            steps = list(pending)
+            if len(steps) == 1:
+                computed = [self._run_query_step(data, *steps[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+                    computed = list(executor.map(lambda step: self._run_query_step(data, *step), steps))
+
+            expires = time.monotonic() + self.insights_cache_ttl
+            with self._insights_lock:
+                for step, insight in zip(steps, computed):
+                    self.insights_cache[pending[step]] = (expires, insight)
+                    results[step] = insight
+                self._prune_insights_cache()
+
+        return {
+            'query': query,
+            'insights': [results[step] for step in plan if results[step]],
+            'confidence': 0.75,
+            'suggestions': self._generate_query_suggestions(query_lower, data.columns)
+        }
+
+    def _plan_query(self, query_lower: str, columns: List[str]) -> List[tuple]:
+        """Normalize a query into ordered, de-duplicated (intent, kpi) steps"""
+        plan = []
+
+        # Revenue queries
+        if 'revenue' in query_lower and ('trend' in query_lower or 'growing' in query_lower):
+            if 'Revenue' in columns:
+                plan.append(('trend', 'Revenue'))
+
+        kpi = None
+        if any(word in query_lower for word in ('predict', 'forecast', 'anomal', 'unusual')):
+            kpi = self._extract_kpi_from_query(query_lower, columns)
+            if kpi not in columns:
+                kpi = None
+
+        # Prediction queries
+        if kpi and ('predict' in query_lower or 'forecast' in query_lower):
+            plan.append(('forecast', kpi))
+
+        # Anomaly queries
+        if kpi and ('anomal' in query_lower or 'unusual' in query_lower):
+            plan.append(('anomaly', kpi))
+
+        return plan
+
+    def _run_query_step(self, data: pd.DataFrame, intent: str, kpi: str) -> Optional[str]:
+        """Run one planned sub-analysis and phrase its result"""
+        if intent == 'trend':
+            revenue_trend = self._analyze_trend(data[kpi])
+            return f"Revenue shows {revenue_trend['direction']} trend with {revenue_trend['strength']} strength"
+
+        if intent == 'forecast':
+            pred_result = self.predict_kpi(data, kpi, 3)
+            if 'predictions' in pred_result:
+                return f"Predicted {kpi} for next 3 periods: {pred_result['predictions'][:3]}"
+
+        if intent == 'anomaly':
+            anomaly_result = self.detect_anomalies(data, kpi)
+            if 'anomalies' in anomaly_result and anomaly_result['anomalies']:
+                return f"Found {len(anomaly_result['anomalies'])} anomalies in {kpi}"
+
+        return None
+
+    def _prune_insights_cache(self):
+        """Drop expired insight entries (caller holds the lock)"""
+        now = time.monotonic()
+        expired = [key for key, (expires, _) in self.insights_cache.items() if expires <= now]
+        for key in expired:
+            del self.insights_cache[key]
+
+    def clear_insights_cache(self):
+        """Forget all cached query insights"""
+        with self._insights_lock:
+            self.insights_cache.clear()
+
+    # Helper methods
+    def _analyze_trend(self, values: pd.Series) -> Dict:
+        """Analyze trend in time series data"""
+        if len(values) < 3:
+            return {'direction': 'unknown', 'strength': 'low', 'confidence': 0.0}
+
+        # Simple linear regression for trend
+        x = np.arange(len(values))
+        slope = np.polyfit(x, values, 1)[0]
+
+        # Determine direction and strength
+        if abs(slope) < values.std() * 0.1:
+            direction = 'stable'
+            strength = 'low'
+        elif slope > 0:
+            direction = 'upward'
+            strength = 'high' if abs(slope) > values.std() * 0.5 else 'medium'
+        else:
+            direction = 'downward'
+            strength = 'high' if abs(slope) > values.std() * 0.5 else 'medium'
+
+        # Calculate confidence based on R²
+        r_squared = np.corrcoef(x, values)[0, 1] ** 2 if len(values) > 1 else 0
+        confidence = min(0.95, max(0.1, r_squared))
+
+        return {
+            'direction': direction,
+            'strength': strength,
+            'confidence': confidence,
+            'slope': slope
+        }
+
+    def _analyze_volatility(self, values: pd.Series) -> Dict:
+        """Analyze volatility in data"""
+        std_dev = values.std()
+        mean_val = values.mean()
+        cv = std_dev / mean_val if mean_val != 0 else float('inf')
+
+        if cv < 0.1:
+            level = 'low'
+        elif cv < 0.3:
+            level = 'medium'
+        else:
+            level = 'high'
+
+        return {
+            'level': level,
+            'std': std_dev,
+            'coefficient_of_variation': cv
+        }
+
+    def _get_benchmark(self, kpi: str) -> Optional[float]:
+        """Get industry benchmark for KPI"""
+        benchmarks = {
+            'Revenue': 1000000,
+            'GP_Margin': 25.0,
+            'Customer_Satisfaction': 85.0,
+            'Conversion_Rate': 3.5,
+            'Active_Users': 8000
+        }
+        return benchmarks.get(kpi)
+
+    def _compare_to_benchmark(self, value: float, benchmark: float) -> Dict:
+        """Compare value to benchmark"""
+        difference = ((value - benchmark) / benchmark) * 100
+
+        if difference > 10:
+            status = 'significantly above'
+            recommendation = 'Maintain current performance and identify success factors'
+        elif difference > 0:
+            status = 'above'
+            recommendation = 'Good performance, look for optimization opportunities'
+        elif difference > -10:
+            status = 'slightly below'
+            recommendation = 'Focus on improvement initiatives'
+        else:
+            status = 'significantly below'
+            recommendation = 'Immediate action required to improve performance'
+
+        return {
+            'status': status,
+            'difference': difference,
+            'recommendation': recommendation
+        }
+
+    def _linear_prediction(self, values: pd.Series, periods: int) -> List[float]:
+        """Simple linear regression prediction"""
+        if not ML_AVAILABLE:
+            return [values.iloc[-1] * 1.05] * periods
+
+        X = np.arange(len(values)).reshape(-1, 1)
+        y = values.values
+
+        model = LinearRegression()
+        model.fit(X, y)
+
+        future_X = np.arange(len(values), len(values) + periods).reshape(-1, 1)
+        predictions = model.predict(future_X)
+
+        return predictions.tolist()
+
+    def _simple_arima_prediction(self, values: pd.Series, periods: int) -> List[float]:
+        """Simple ARIMA-like prediction (simple exponential smoothing, flat forecast)"""
+        smoothing = exponential_smoothing(np.asarray(values, dtype=float), 'simple', alpha=0.3, periods=periods)
+        return smoothing['forecast'].tolist()
+
+    def _prophet_prediction(self, data: pd.DataFrame, kpi: str, periods: int) -> List[float]:
+        """Prophet-based prediction"""
+        if not PROPHET_AVAILABLE:
+            return self._simple_arima_prediction(data[kpi], periods)
+
+        try:
+            # Prepare data for Prophet
+            prophet_data = pd.DataFrame({
+                'ds': data['Date'],
+                'y': data[kpi]
+            }).dropna()
+
+            def _fit():
+                model = Prophet(daily_seasonality=False, weekly_seasonality=False)
+                model.fit(prophet_data)
+                return model
+
+            cache_key = fingerprint_data(prophet_data, model='prophet', daily_seasonality=False, weekly_seasonality=False)
+            model = self.models.get_or_fit(cache_key, _fit)
+
+            # Make future predictions
+            future = model.make_future_dataframe(periods=periods, freq='M')
+            forecast = model.predict(future)
+
+            return forecast['yhat'].tail(periods).tolist()
+        except:
+            return self._simple_arima_prediction(data[kpi], periods)
+
+    def _ensemble_prediction(self, predictions: Dict, periods: int) -> List[float]:
+        """Combine multiple predictions using ensemble method"""
+        if not predictions:
+            return [0] * periods
+
+        # Simple average ensemble
+        ensemble = []
+        for i in range(periods):
+            period_predictions = []
+            for method, pred_list in predictions.items():
+                if i < len(pred_list):
+                    period_predictions.append(pred_list[i])
+
+            if period_predictions:
+                ensemble.append(np.mean(period_predictions))
+            else:
+                ensemble.append(0)
+
+        return ensemble
+
+    def _calculate_confidence_intervals(self, predictions: Dict, periods: int) -> Dict:
+        """Calculate confidence intervals for predictions"""
+        confidence_intervals = {}
+
+        for method, pred_list in predictions.items():
+            if len(pred_list) >= periods:
+                # Simple confidence interval based on standard deviation
+                std_dev = np.std(pred_list[:periods])
+                lower_bound = [p - 1.96 * std_dev for p in pred_list[:periods]]
+                upper_bound = [p + 1.96 * std_dev for p in pred_list[:periods]]
+
+                confidence_intervals[method] = {
+                    'lower': lower_bound,
+                    'upper': upper_bound
+                }
+
+        return confidence_intervals
+
+    def _evaluate_models(self, predictions: Dict, actual_values: pd.Series) -> Dict:
+        """Evaluate prediction model performance"""
+        if not ML_AVAILABLE or len(actual_values) < 10:
+            return {}
+
+        # Use last 20% of data for evaluation
+        test_size = max(2, int(len(actual_values) * 0.2))
+        train_data = actual_values[:-test_size]
+        test_data = actual_values[-test_size:]
+
+        performance = {}
+
+        for method in predictions.keys():
+            try:
+                # Generate predictions for test period
+                if method == 'linear':
+                    test_predictions = self._linear_prediction(train_data, test_size)
+                else:
+                    test_predictions = self._simple_arima_prediction(train_data, test_size)
+
+                # Calculate metrics
+                mae = mean_absolute_error(test_data, test_predictions[:len(test_data)])
+                mape = np.mean(np.abs((test_data - test_predictions[:len(test_data)]) / test_data)) * 100
+
+                performance[method] = {
+                    'mae': mae,
+                    'mape': mape,
+                    'accuracy': max(0, 100 - mape)
+                }
+            except:
+                performance[method] = {'mae': 0, 'mape': 100, 'accuracy': 0}
+
+        return performance
+
+    def _generate_prediction_recommendations(self, predictions: List[float], historical: pd.Series) -> List[str]:
+        """Generate recommendations based on predictions"""
+        recommendations = []
+
+        if not predictions or len(predictions) == 0:
+            return recommendations
+
+        current_value = historical.iloc[-1]
+        predicted_value = predictions[0]
+
+        change_percent = ((predicted_value - current_value) / current_value) * 100
+
+        if change_percent > 10:
+            recommendations.append(f"Strong growth predicted ({change_percent:.1f}%) - prepare for scaling")
+        elif change_percent > 0:
+            recommendations.append(f"Moderate growth expected ({change_percent:.1f}%) - maintain current strategy")
+        elif change_percent > -10:
+            recommendations.append(f"Slight decline predicted ({change_percent:.1f}%) - monitor closely")
+        else:
+            recommendations.append(f"Significant decline predicted ({change_percent:.1f}%) - immediate action needed")
+
+        return recommendations
+
+    def _isolation_forest_anomalies(self, values: pd.Series) -> List[int]:
+        """Detect anomalies using Isolation Forest"""
+        try:
+            data_array = values.values.reshape(-1, 1)
+
+            cache_key = fingerprint_data(data_array, model='isolation_forest', contamination=0.1, random_state=42)
+            iso_forest = self.models.get_or_fit(
+                cache_key, lambda: IsolationForest(contamination=0.1, random_state=42).fit(data_array)
+            )
+            anomalies = iso_forest.predict(data_array)
+            return [i for i, val in enumerate(anomalies) if val == -1]
+        except:
+            return []
+
+    def _statistical_anomalies(self, values: pd.Series) -> List[int]:
+        """Detect anomalies using statistical methods (Z-score)"""
+        z_scores = np.abs((values - values.mean()) / values.std())
+        return [i for i, z in enumerate(z_scores) if z > self.anomaly_threshold]
+
+    def _seasonal_anomalies(self, values: pd.Series, period: int = 12,
+                            season_labels: Optional[Any] = None) -> List[int]:
+        """Detect seasonal anomalies"""
+        n_seasons = len(np.unique(season_labels)) if season_labels is not None else period
+        if len(values) < 2 * n_seasons:  # Need at least two full cycles
+            return []
+
+        # Seasonal profile and residuals in one pass, flagged against the overall spread
+        x = np.asarray(values, dtype=float)
+        residuals = seasonal_residuals(x, period, season_labels)['residuals']
+
+        return np.flatnonzero(np.abs(residuals) > 2 * np.std(x)).tolist()
+
+    def _combine_anomaly_results(self, anomalies: Dict, values: pd.Series) -> List[Dict]:
+        """Combine anomaly detection results"""
+        combined = {}
+
+        for method, indices in anomalies.items():
+            for idx in indices:
+                if idx not in combined:
+                    combined[idx] = {
+                        'index': idx,
+                        'value': values.iloc[idx],
+                        'methods': [],
+                        'severity': 0
+                    }
+                combined[idx]['methods'].append(method)
+                combined[idx]['severity'] += 1
+
+        return list(combined.values())
+
+    def _assess_anomaly_severity(self, anomalies: List[Dict], values: pd.Series) -> Dict:
+        """Assess overall anomaly severity"""
+        if not anomalies:
+            return {'level': 'none', 'count': 0, 'impact': 'minimal'}
+
+        high_severity = sum(1 for a in anomalies if a['severity'] >= 2)
+        total_anomalies = len(anomalies)
+
+        if high_severity > total_anomalies * 0.5:
+            level = 'high'
+            impact = 'significant'
+        elif total_anomalies > len(values) * 0.1:
+            level = 'medium'
+            impact = 'moderate'
+        else:
+            level = 'low'
+            impact = 'minimal'
+
+        return {
+            'level': level,
+            'count': total_anomalies,
+            'high_severity_count': high_severity,
+            'impact': impact
+        }
+
+    def _explain_anomalies(self, anomalies: List[Dict], values: pd.Series) -> List[str]:
+        """Generate explanations for detected anomalies"""
+        explanations = []
+
+        for anomaly in anomalies:
+            idx = anomaly['index']
+            value = anomaly['value']
+            methods = anomaly['methods']
+
+            explanation = f"Anomaly at position {idx}: value {value:.2f} detected by {', '.join(methods)}"
+
+            # Add context
+            mean_val = values.mean()
+            if value > mean_val * 1.5:
+                explanation += " (unusually high)"
+            elif value < mean_val * 0.5:
+                explanation += " (unusually low)"
+
+            explanations.append(explanation)
+
+        return explanations
+
+    def _anomaly_recommendations(self, anomalies: List[Dict]) -> List[str]:
+        """Generate recommendations for handling anomalies"""
+        if not anomalies:
+            return ["No anomalies detected - data appears normal"]
+
+        recommendations = []
+
+        high_severity = sum(1 for a in anomalies if a['severity'] >= 2)
+
+        if high_severity > 0:
+            recommendations.append("High-severity anomalies detected - investigate root causes immediately")
+
+        if len(anomalies) > 5:
+            recommendations.append("Multiple anomalies detected - review data collection process")
+
+        recommendations.append("Monitor these periods closely for recurring patterns")
+        recommendations.append("Consider implementing automated alerts for similar anomalies")
+
+        return recommendations
+
+    def _get_trend_action(self, trend: Dict, kpi: str) -> str:
+        """Get recommended action based on trend analysis"""
+        direction = trend['direction']
+        strength = trend['strength']
+
+        if direction == 'upward' and strength == 'high':
+            return f"Excellent {kpi} growth - maintain current strategies"
+        elif direction == 'upward':
+            return f"Positive {kpi} trend - consider scaling successful initiatives"
+        elif direction == 'downward' and strength == 'high':
+            return f"Concerning {kpi} decline - immediate intervention required"
+        elif direction == 'downward':
+            return f"Declining {kpi} trend - investigate causes and implement corrective measures"
+        else:
+            return f"Stable {kpi} - look for optimization opportunities"
+
+    def _extract_kpi_from_query(self, query: str, columns: List[str]) -> Optional[str]:
+        """Extract KPI name from natural language query"""
+        query_words = query.lower().split()
+
+        for col in columns:
+            if col.lower() in query or any(word in col.lower() for word in query_words):
+                return col
+
+        # Common KPI mappings
+        kpi_mappings = {
+            'revenue': 'Revenue',
+            'sales': 'Revenue',
+            'margin': 'GP_Margin',
+            'satisfaction': 'Customer_Satisfaction',
+            'users': 'Active_Users',
+            'conversion': 'Conversion_Rate'
+        }
+
+        for word in query_words:
+            if word in kpi_mappings and kpi_mappings[word] in columns:
+                return kpi_mappings[word]
+
+        return None
+
+    def _generate_query_suggestions(self, query: str, columns: List[str]) -> List[str]:
+        """Generate query suggestions"""
+        suggestions = [
+            "Show me revenue trends for the last 6 months",
+            "What's the correlation between customer satisfaction and revenue?",
+            "Predict next quarter's performance",
+            "Find anomalies in our data",
+            "How is our GP margin performing?"
+        ]
+
+        # Add column-specific suggestions
+        for col in columns:
+            if 'Revenue' in col:
+                suggestions.append(f"Analyze {col} growth patterns")
+            elif 'Customer' in col:
+                suggestions.append(f"What affects {col}?")
+
         return suggestions[:5]  # Return top 5 suggestions
@@ -1,1342 +1,2049 @@
-"""
-?? AFCO AUTOMATIC DOCUMENT PROCESSING INTERFACE
-?? In Loving Memory of Omar (2007-2024)
-Complete automatic folder monitoring, document upload, analysis, and mapping system
-"""
-
-import streamlit as st
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
-import os
-import glob
-import time
-import json
-import logging
-from pathlib import Path
-from typing import Dict, List, Any, Optional
-import threading
-import hashlib
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
-
-# Document processing imports with fallbacks
-try:
-    import openpyxl
-    from openpyxl import load_workbook
-    EXCEL_SUPPORT = True
-except ImportError:
-    EXCEL_SUPPORT = False
-
-try:
-    from docx import Document
-    WORD_SUPPORT = True
-except ImportError:
-    WORD_SUPPORT = False
-
-try:
-    import pdfplumber
-    PDF_SUPPORT = True
-except ImportError:
-    PDF_SUPPORT = False
-
-# Database imports
-try:
-    from production_database import production_db
-    DATABASE_AVAILABLE = True
-except ImportError:
-    DATABASE_AVAILABLE = False
-    production_db = None
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-class AutoFileHandler(FileSystemEventHandler):
-    """File system event handler for automatic file monitoring"""
-
-    def __init__(self, callback_func=None):
-        self.callback_func = callback_func
-        self.processed_files = set()
-
-    def on_created(self, event):
-        if not event.is_dir:
-            self.handle_file_event(event.src_path, "created")
-
-    def on_modified(self, event):
-        if not event.is_dir:
-            self.handle_file_event(event.src_path, "modified")
-
-    def handle_file_event(self, file_path, event_type):
-        # Only process supported file types
-        if any(file_path.lower().endswith(ext) for ext in ['.xlsx', '.xls', '.csv', '.docx', '.doc', '.pdf']):
-            file_hash = self.get_file_hash(file_path)
-            if file_hash not in self.processed_files:
-                self.processed_files.add(file_hash)
-                if self.callback_func:
-                    self.callback_func(file_path, event_type)
-                logger.info(f"New file detected: {file_path} ({event_type})")
-
-    def get_file_hash(self, file_path):
-        """Generate hash for file to avoid duplicate processing"""
-        try:
-            with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except:
-            return str(file_path)
-
-class AFCOAutoDocumentProcessor:
-    """Automatic document processor for AFCO with folder monitoring"""
-
-    def __init__(self):
-        self.watch_folders = []
-        self.observers = []
-        self.file_cache = {}
-        self.extraction_rules = {}
-        self.field_mappings = {}
-        self.processing_history = []
-
-        # Initialize storage directories
-        self.ensure_directories()
-
-        # Load configuration
-        self.load_configuration()
-
-    def ensure_directories(self):
-        """Create necessary directories"""
-        directories = [
-            "data/auto_watch",
-            "data/processed",
-            "data/mappings",
-            "data/extractions",
-            "data/sql_exports"
-        ]
-
-        for directory in directories:
-            Path(directory).mkdir(parents=True, exist_ok=True)
-
-    def load_configuration(self):
-        """Load processing configuration"""
-        config_path = "data/mappings/auto_config.json"
-
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    self.extraction_rules = config.get('extraction_rules', {})
-                    self.field_mappings = config.get('field_mappings', {})
-                    self.watch_folders = config.get('watch_folders', [])
-            except Exception as e:
-                logger.error(f"Error loading configuration: {e}")
-
-        # Default configuration
-        if not self.extraction_rules:
-            self.set_default_extraction_rules()
-
-    def set_default_extraction_rules(self):
-        """Set default extraction rules for Saudi market documents"""
-        self.extraction_rules = {
-            'client_data': {
-                'patterns': ['company', 'client', 'customer', '????', '????'],
-                'required_fields': ['name', 'contact', 'sector'],
-                'target_table': 'clients'
-            },
-            'vendor_data': {
-                'patterns': ['vendor', 'supplier', '????', '?????'],
-                'required_fields': ['company_name', 'contact_person', 'products'],
-                'target_table': 'vendors'
-            },
-            'rfq_data': {
-                'patterns': ['rfq', 'tender', 'bid', '????', '??????'],
-                'required_fields': ['title', 'value', 'deadline'],
-                'target_table': 'rfqs'
-            },
-            'financial_data': {
-                'patterns': ['revenue', 'cost', 'budget', '???????', '??????'],
-                'required_fields': ['amount', 'date', 'description'],
-                'target_table': 'financial_transactions'
-            }
-        }
-
-    def save_configuration(self):
-        """Save current configuration"""
-        config_path = "data/mappings/auto_config.json"
-
-        config = {
-            'extraction_rules': self.extraction_rules,
-            'field_mappings': self.field_mappings,
-            'watch_folders': self.watch_folders,
-            'last_updated': datetime.now().isoformat()
-        }
-
-        try:
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving configuration: {e}")
-
-    def add_watch_folder(self, folder_path: str):
-        """Add folder to monitoring list"""
-        if os.path.exists(folder_path) and folder_path not in self.watch_folders:
-            self.watch_folders.append(folder_path)
-            self.start_folder_monitoring(folder_path)
-            self.save_configuration()
-            return True
-        return False
-
-    def start_folder_monitoring(self, folder_path: str):
-        """Start monitoring a specific folder"""
-        try:
-            observer = Observer()
-            event_handler = AutoFileHandler(callback_func=self.handle_auto_file)
-            observer.schedule(event_handler, folder_path, recursive=True)
-            observer.start()
-            self.observers.append(observer)
-            logger.info(f"Started monitoring folder: {folder_path}")
-        except Exception as e:
-            logger.error(f"Error starting folder monitoring: {e}")
-
-    def stop_all_monitoring(self):
-        """Stop all folder monitoring"""
-        for observer in self.observers:
-            observer.stop()
-            observer.join()
-        self.observers.clear()
-
-    def handle_auto_file(self, file_path: str, event_type: str):
-        """Handle automatically detected files"""
-        try:
-            # Extract data from file
-            extracted_data = self.extract_file_data(file_path)
-
-            if extracted_data:
-                # Apply field mappings
-                mapped_data = self.apply_field_mappings(extracted_data)
-
-                # Store processed data
-                self.store_processed_data(file_path, mapped_data)
-
-                # Update processing history
-                self.processing_history.append({
-                    'file_path': file_path,
-                    'processed_at': datetime.now().isoformat(),
-                    'event_type': event_type,
-                    'records_extracted': len(mapped_data),
-                    'status': 'success'
-                })
-
-                logger.info(f"Successfully processed: {file_path}")
-
-        except Exception as e:
-            logger.error(f"Error processing auto file {file_path}: {e}")
-            self.processing_history.append({
-                'file_path': file_path,
-                'processed_at': datetime.now().isoformat(),
-                'event_type': event_type,
-                'status': 'failed',
-                'error': str(e)
-            })
-
-    def scan_folders(self) -> Dict[str, List[Dict]]:
-        """Scan all watch folders and return file information"""
-        folder_contents = {}
-
-        for folder_path in self.watch_folders:
-            if os.path.exists(folder_path):
-                files = []
-
-                # Supported file extensions
-                extensions = ['*.xlsx', '*.xls', '*.csv', '*.docx', '*.doc', '*.pdf']
-
-                for extension in extensions:
-                    for file_path in glob.glob(os.path.join(folder_path, '**', extension), recursive=True):
-                        file_info = self.get_file_info(file_path)
-                        files.append(file_info)
-
-                folder_contents[folder_path] = files
-
-        return folder_contents
-
-    def get_file_info(self, file_path: str) -> Dict:
-        """Get detailed file information"""
-        try:
-            stat = os.stat(file_path)
-
-            return {
-                'path': file_path,
-                'name': os.path.basename(file_path),
-                'size': stat.st_size,
-                'modified': datetime.fromtimestamp(stat.st_mtime),
-                'extension': Path(file_path).suffix.lower(),
-                'status': self.get_file_processing_status(file_path)
-            }
-        except Exception as e:
-            return {
-                'path': file_path,
-                'name': os.path.basename(file_path),
-                'error': str(e),
-                'status': 'error'
-            }
-
-    def get_file_processing_status(self, file_path: str) -> str:
-        """Check if file has been processed"""
-        for record in self.processing_history:
-            if record['file_path'] == file_path:
-                return record['status']
-        return 'pending'
-
-    def extract_file_data(self, file_path: str) -> List[Dict]:
-        """Extract data from various file formats"""
-        extension = Path(file_path).suffix.lower()
-
-        try:
-            if extension in ['.xlsx', '.xls'] and EXCEL_SUPPORT:
-                return self.extract_from_excel(file_path)
-            elif extension == '.csv':
-                return self.extract_from_csv(file_path)
-            elif extension in ['.docx', '.doc'] and WORD_SUPPORT:
-                return self.extract_from_word(file_path)
-            elif extension == '.pdf' and PDF_SUPPORT:
-                return self.extract_from_pdf(file_path)
-            else:
-                logger.warning(f"Unsupported file type: {extension}")
-                return []
-        except Exception as e:
-            logger.error(f"Error extracting data from {file_path}: {e}")
-            return []
-
-    def extract_from_excel(self, file_path: str) -> List[Dict]:
-        """Extract data from Excel files"""
-        data = []
-        workbook = load_workbook(file_path, data_only=True)
-
-        for sheet_name in workbook.sheetnames:
-            sheet = workbook[sheet_name]
-
-            if sheet.max_row <= 1:
-                continue
-
-            # Get headers
-            headers = []
-            for cell in sheet[1]:
-                headers.append(cell.value or f"Column_{len(headers)}")
-
-            # Get data rows
-            for row in sheet.iter_rows(min_row=2, values_only=True):
-                if any(cell is not None for cell in row):
-                    row_dict = {}
-                    for i, value in enumerate(row):
-                        if i < len(headers):
-                            row_dict[headers[i]] = value
-
-                    row_dict['_source_sheet'] = sheet_name
-                    row_dict['_source_file'] = file_path
-                    data.append(row_dict)
-
-        return data
-
-    def extract_from_csv(self, file_path: str) -> List[Dict]:
-        """Extract data from CSV files"""
-        encodings = ['utf-8', 'utf-8-sig', 'iso-8859-1', 'cp1256']
-
-        for encoding in encodings:
-            try:
-                df = pd.read_csv(file_path, encoding=encoding)
-                df = df.dropna(how='all')
-
-                data = df.to_dict('records')
-                for record in data:
-                    record['_source_file'] = file_path
-
-                return data
-            except UnicodeDecodeError:
-                continue
-            except Exception as e:
-                logger.error(f"Error reading CSV {file_path}: {e}")
-                break
-
-        return []
-
-    def extract_from_word(self, file_path: str) -> List[Dict]:
-        """Extract data from Word documents"""
-        doc = Document(file_path)
-        data = []
-
-        for table_idx, table in enumerate(doc.tables):
-            if not table.rows:
-                continue
-
-            headers = [cell.text.strip() for cell in table.rows[0].cells]
-
-            for row in table.rows[1:]:
-                row_data = {}
-                for i, cell in enumerate(row.cells):
-                    if i < len(headers):
-                        row_data[headers[i]] = cell.text.strip()
-
-                if any(v for v in row_data.values()):
-                    row_data['_source_table'] = f"Table_{table_idx}"
-                    row_data['_source_file'] = file_path
-                    data.append(row_data)
-
-        return data
-
-    def extract_from_pdf(self, file_path: str) -> List[Dict]:
-        """Extract data from PDF files"""
-        data = []
-
-        with pdfplumber.open(file_path) as pdf:
-            for page_num, page in enumerate(pdf.pages):
-                tables = page.extract_tables()
-
-                for table_idx, table in enumerate(tables):
-                    if table and len(table) > 1:
-                        headers = table[0]
-
-                        for row in table[1:]:
-                            if any(cell for cell in row):
-                                row_dict = {}
-                                for i, cell in enumerate(row):
-                                    if i < len(headers):
-                                        row_dict[headers[i]] = cell
-
-                                if any(v for v in row_dict.values()):
-                                    row_dict['_source_page'] = page_num + 1
-                                    row_dict['_source_table'] = table_idx
-                                    row_dict['_source_file'] = file_path
-                                    data.append(row_dict)
-
-        return data
-
-    def apply_field_mappings(self, data: List[Dict]) -> List[Dict]:
-        """Apply field mappings to extracted data"""
-        mapped_data = []
-
-        for record in data:
-            mapped_record = record.copy()
-
-            # Apply field mappings
-            for source_field, target_field in self.field_mappings.items():
-                if source_field in record:
-                    mapped_record[target_field] = record[source_field]
-
-            # Determine data type based on content
-            data_type = self.determine_data_type(mapped_record)
-            mapped_record['_data_type'] = data_type
-
-            mapped_data.append(mapped_record)
-
-        return mapped_data
-
-    def determine_data_type(self, record: Dict) -> str:
-        """Determine data type based on record content"""
-        content = ' '.join(str(v).lower() for v in record.values() if v)
-
-        for data_type, rules in self.extraction_rules.items():
-            patterns = rules.get('patterns', [])
-            if any(pattern in content for pattern in patterns):
-                return data_type
-
-        return 'general'
-
-    def store_processed_data(self, file_path: str, data: List[Dict]):
-        """Store processed data"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = os.path.basename(file_path)
-        output_file = f"data/extractions/{timestamp}_{filename}.json"
-
-        try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'source_file': file_path,
-                    'processed_at': datetime.now().isoformat(),
-                    'record_count': len(data),
-                    'data': data
-                }, f, ensure_ascii=False, indent=2, default=str)
-        except Exception as e:
-            logger.error(f"Error storing processed data: {e}")
-
-# Initialize global processor
-auto_processor = AFCOAutoDocumentProcessor()
-
-def main():
-    """Main Streamlit application"""
-
-    st.set_page_config(
-        page_title="?? AFCO Auto Document Center",
-        page_icon="??",
-        layout="wide",
-        initial_sidebar_state="expanded"
-    )
-
-    # Header
-    st.markdown("""
-    <div style="background: linear-gradient(90deg, #4A90E2, #87CEEB); color: white; padding: 1rem; border-radius: 10px; text-align: center; margin-bottom: 2rem;">
-        <h1>?? AFCO Automatic Document Processing Center</h1>
-        <p>?? In Loving Memory of Omar (2007-2024) - "Forever 17, Forever Inspiring Innovation"</p>
-        <p>Automatic Folder Monitoring  Real-time Data Extraction  Smart Field Mapping</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Sidebar navigation
-    st.sidebar.markdown("### ?? Navigation")
-
-    tabs = st.tabs([
-        "?? Folder Monitor",
-        "??? File Manager",
-        "?? Field Mapping",
-        "?? Processing Status",
-        "?? Configuration"
-    ])
-
-    with tabs[0]:
-        show_folder_monitor()
-
-    with tabs[1]:
-        show_file_manager()
-
-    with tabs[2]:
-        show_field_mapping()
-
-    with tabs[3]:
-        show_processing_status()
-
-    with tabs[4]:
-        show_configuration()
-
-def show_folder_monitor():
-    """Folder monitoring interface"""
-
-    st.subheader("?? Automatic Folder Monitoring")
-
-    col1, col2 = st.columns([2, 1])
-
-    with col1:
-        st.markdown("### ?? Watch Folders")
-
-        # Add new folder
-        new_folder = st.text_input(
-            "Add folder to monitor:",
-            placeholder="Enter folder path (e.g., D:\\Documents\\AFCO)",
-            help="Enter the full path to the folder you want to monitor"
-        )
-
-        col_add, col_browse = st.columns([1, 1])
-
-        with col_add:
-            if st.button("? Add Folder", type="primary") and new_folder:
-                if auto_processor.add_watch_folder(new_folder):
-                    st.success(f"? Added folder: {new_folder}")
-                    st.rerun()
-                else:
-                    st.error("? Failed to add folder. Check if path exists.")
-
-        with col_browse:
-            if st.button("?? Browse Folders"):
-                st.info("?? Enter folder path manually above")
-
-        # Current watch folders
-        if auto_processor.watch_folders:
-            st.markdown("### ?? Currently Monitoring:")
-
-            for idx, folder in enumerate(auto_processor.watch_folders):
-                with st.expander(f"?? {folder}", expanded=True):
-                    col1, col2, col3 = st.columns([2, 1, 1])
-
-                    with col1:
-                        if os.path.exists(folder):
-                            st.success("?? Active")
-                            file_count = len([f for f in glob.glob(os.path.join(folder, "**", "*.*"), recursive=True)
-                                            if f.lower().endswith(('.xlsx', '.xls', '.csv', '.docx', '.doc', '.pdf'))])
-                            st.write(f"?? {file_count} supported files")
-                        else:
-                            st.error("?? Folder not found")
-
-                    with col2:
-                        if st.button(f"?? Scan Now", key=f"scan_{idx}"):
-                            st.info("Scanning folder...")
-                            st.rerun()
-
-                    with col3:
-                        if st.button(f"??? Remove", key=f"remove_{idx}"):
-                            auto_processor.watch_folders.remove(folder)
-                            auto_processor.save_configuration()
-                            st.rerun()
-        else:
-            st.info("?? No folders being monitored. Add a folder to start automatic processing.")
-
-    with col2:
-        st.markdown("### ?? Monitoring Status")
-
-        # Real-time statistics
-        total_folders = len(auto_processor.watch_folders)
-        active_folders = sum(1 for folder in auto_processor.watch_folders if os.path.exists(folder))
-
-        st.metric("Total Folders", total_folders)
-        st.metric("Active Folders", active_folders)
-        st.metric("Processing Rules", len(auto_processor.extraction_rules))
-
-        # Recent activity
-        st.markdown("### ?? Recent Activity")
-
-        recent_activity = auto_processor.processing_history[-5:] if auto_processor.processing_history else []
-
-        if recent_activity:
-            for activity in reversed(recent_activity):
-                status_icon = "?" if activity['status'] == 'success' else "?"
-                st.write(f"{status_icon} {os.path.basename(activity['file_path'])}")
-                st.caption(f"?? {activity['processed_at'][:19]}")
-        else:
-            st.info("No recent activity")
-
-def show_file_manager():
-    """File manager interface"""
-
-    st.subheader("??? Automatic File Manager")
-
-    # Scan all watched folders
-    if st.button("?? Refresh File List", type="primary"):
-        st.rerun()
-
-    folder_contents = auto_processor.scan_folders()
-
-    if not folder_contents:
-        st.info("?? No watch folders configured. Go to Folder Monitor to add folders.")
-        return
-
-    # Display files by folder
-    for folder_path, files in folder_contents.items():
-        st.markdown(f"### ?? {folder_path}")
-
-        if not files:
-            st.info("?? No supported files found in this folder.")
-            continue
-
-        # Filter controls
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            file_types = st.multiselect(
-                "File Types:",
-                ['.xlsx', '.xls', '.csv', '.docx', '.doc', '.pdf'],
-                default=['.xlsx', '.csv'],
-                key=f"types_{hash(folder_path)}"
-            )
-
-        with col2:
-            status_filter = st.selectbox(
-                "Status:",
-                ["All", "Pending", "Processed", "Failed"],
-                key=f"status_{hash(folder_path)}"
-            )
-
-        with col3:
-            max_files = st.number_input(
-                "Max Files:",
-                min_value=10,
-                max_value=1000,
-                value=50,
-                key=f"max_{hash(folder_path)}"
-            )
-
-        # Filter files
-        filtered_files = []
-        for file_info in files:
-            # Filter by type
-            if file_types and file_info.get('extension') not in file_types:
-                continue
-
-            # Filter by status
-            if status_filter != "All":
-                file_status = file_info.get('status', 'pending')
-                if status_filter.lower() != file_status:
-                    continue
-
-            filtered_files.append(file_info)
-
-        # Limit results
-        filtered_files = filtered_files[:max_files]
-
-        if filtered_files:
-            # Create DataFrame for display
-            display_data = []
-            for file_info in filtered_files:
-                display_data.append({
-                    'File Name': file_info['name'],
-                    'Size (KB)': f"{file_info.get('size', 0) / 1024:.1f}",
-                    'Modified': file_info.get('modified', 'Unknown'),
-                    'Status': file_info.get('status', 'pending'),
-                    'Type': file_info.get('extension', ''),
-                    'Path': file_info['path']
-                })
-
-            df = pd.DataFrame(display_data)
-
-            # Display with selection
-            st.markdown(f"#### ?? Files ({len(df)} found)")
-
-            # Action buttons
-            col1, col2, col3, col4 = st.columns(4)
-
-            with col1:
-                if st.button(f"?? Process All Pending", key=f"process_all_{hash(folder_path)}"):
-                    process_pending_files(filtered_files)
-
-            with col2:
-                if st.button(f"?? Auto-Map Fields", key=f"automap_{hash(folder_path)}"):
-                    auto_map_fields(filtered_files)
-
-            with col3:
-                if st.button(f"?? Preview Files", key=f"preview_{hash(folder_path)}"):
-                    preview_files(filtered_files[:3])
-
-            with col4:
-                if st.button(f"?? Export List", key=f"export_{hash(folder_path)}"):
-                    export_file_list(df)
-
-            # File list
-            st.dataframe(df, use_container_width=True, hide_index=True)
-
-            # File details expander
-            with st.expander("?? File Details & Actions"):
-                selected_file = st.selectbox(
-                    "Select file for details:",
-                    options=[f['name'] for f in filtered_files],
-                    key=f"select_{hash(folder_path)}"
-                )
-
-                if selected_file:
-                    file_info = next(f for f in filtered_files if f['name'] == selected_file)
-                    show_file_details(file_info)
-        else:
-            st.info(f"?? No files match the current filters.")
-
-def show_file_details(file_info: Dict):
-    """Show detailed file information and actions"""
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("#### ?? File Information")
-        st.write(f"**Name:** {file_info['name']}")
-        st.write(f"**Size:** {file_info.get('size', 0) / 1024:.1f} KB")
-        st.write(f"**Modified:** {file_info.get('modified', 'Unknown')}")
-        st.write(f"**Status:** {file_info.get('status', 'pending')}")
-        st.write(f"**Type:** {file_info.get('extension', '')}")
-
-    with col2:
-        st.markdown("#### ? Quick Actions")
-
-        if st.button("?? Extract Data", key=f"extract_{file_info['name']}"):
-            extract_single_file(file_info)
-
-        if st.button("?? Auto-Map", key=f"map_{file_info['name']}"):
-            auto_map_single_file(file_info)
-
-        if st.button("?? Preview", key=f"preview_{file_info['name']}"):
-            preview_single_file(file_info)
-
-        if st.button("?? Analyze", key=f"analyze_{file_info['name']}"):
-            analyze_single_file(file_info)
-
-def show_field_mapping():
-    """Field mapping configuration interface"""
-
-    st.subheader("?? Smart Field Mapping Configuration")
-
-    tab1, tab2, tab3 = st.tabs(["?? Create Mappings", "?? Current Mappings", "?? AI Suggestions"])
-
-    with tab1:
-        st.markdown("### ?? Create New Field Mapping")
-
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.markdown("#### Source Field")
-            source_field = st.text_input(
-                "Source Field Name:",
-                placeholder="e.g., Company Name, ??????, Client"
-            )
-
-            source_variations = st.text_area(
-                "Field Variations (one per line):",
-                placeholder="Company\nClient Name\n??? ??????\n??????",
-                help="Add different ways this field might appear"
-            )
-
-        with col2:
-            st.markdown("#### Target Mapping")
-            target_table = st.selectbox(
-                "Target Table:",
-                ["clients", "vendors", "rfqs", "financial_transactions", "kpis"],
-                help="Database table where this data will be stored"
-            )
-
-            target_field = st.text_input(
-                "Target Field:",
-                placeholder="e.g., name, company_name, title"
-            )
-
-            data_type = st.selectbox(
-                "Data Type:",
-                ["TEXT", "INTEGER", "REAL", "DATE", "BOOLEAN"]
-            )
-
-        # Transformation rules
-        st.markdown("#### ?? Transformation Rules")
-
-        transformation = st.selectbox(
-            "Apply Transformation:",
-            [
-                "None",
-                "UPPER() - Convert to uppercase",
-                "LOWER() - Convert to lowercase",
-                "TRIM() - Remove spaces",
-                "Replace commas and convert to number",
-                "Convert to date format",
-                "Custom transformation"
-            ]
-        )
-
-        if transformation == "Custom transformation":
-            custom_transform = st.text_input(
-                "Custom Rule:",
-                placeholder="e.g., REPLACE(?, ',', '') for removing commas"
-            )
-
-        # Validation rules
-        st.markdown("#### ? Validation Rules")
-
-        validation = st.selectbox(
-            "Validation Rule:",
-            [
-                "None",
-                "Required (not empty)",
-                "Email format",
-                "Phone number format",
-                "Saudi phone (+966 or 05)",
-                "Positive number",
-                "Date in future",
-                "Custom validation"
-            ]
-        )
-
-        if validation == "Custom validation":
-            custom_validation = st.text_input(
-                "Custom Validation:",
-                placeholder="e.g., LENGTH(?) > 3"
-            )
-
-        # Save mapping
-        if st.button("?? Save Field Mapping", type="primary"):
-            save_field_mapping(source_field, target_table, target_field, transformation, validation)
-
-    with tab2:
-        st.markdown("### ?? Current Field Mappings")
-
-        if auto_processor.field_mappings:
-            # Display current mappings
-            mapping_data = []
-            for source, target in auto_processor.field_mappings.items():
-                mapping_data.append({
-                    'Source Field': source,
-                    'Target Field': target,
-                    'Actions': '??? Delete'
-                })
-
-            df = pd.DataFrame(mapping_data)
-            st.dataframe(df, use_container_width=True)
-
-            # Edit/Delete actions
-            selected_mapping = st.selectbox(
-                "Select mapping to edit:",
-                list(auto_processor.field_mappings.keys())
-            )
-
-            if selected_mapping:
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    if st.button("?? Edit Mapping"):
-                        edit_field_mapping(selected_mapping)
-
-                with col2:
-                    if st.button("??? Delete Mapping"):
-                        delete_field_mapping(selected_mapping)
-        else:
-            st.info("?? No field mappings configured yet.")
-
-    with tab3:
-        st.markdown("### ?? AI-Powered Mapping Suggestions")
-
-        if st.button("?? Generate Smart Suggestions"):
-            generate_mapping_suggestions()
-
-        st.markdown("""
-        #### ?? Suggested Mappings for Saudi Market:
-
-        **Client Data:**
-        - Company Name ? clients.name
-        - ??? ?????? ? clients.name_ar
-        - Sector ? clients.sector
-        - Contact Person ? clients.contact_person
-
-        **Vendor Data:**
-        - Vendor Name ? vendors.company_name
-        - ???? ? vendors.company_name
-        - Performance ? vendors.performance_score
-
-        **RFQ Data:**
-        - RFQ Title ? rfqs.title
-        - ????? ???????? ? rfqs.title
-        - Value SAR ? rfqs.value_sar
-        - Deadline ? rfqs.deadline
-
-        **Financial Data:**
-        - Amount ? financial_transactions.amount_sar
-        - ?????? ? financial_transactions.amount_sar
-        - Date ? financial_transactions.transaction_date
-        """)
-
-def show_processing_status():
-    """Processing status and history"""
-
-    st.subheader("?? Document Processing Status & Analytics")
-
-    # Processing summary
-    col1, col2, col3, col4 = st.columns(4)
-
-    total_processed = len(auto_processor.processing_history)
-    successful = sum(1 for h in auto_processor.processing_history if h['status'] == 'success')
-    failed = sum(1 for h in auto_processor.processing_history if h['status'] == 'failed')
-    success_rate = (successful / total_processed * 100) if total_processed > 0 else 0
-
-    with col1:
-        st.metric("Total Processed", total_processed)
-
-    with col2:
-        st.metric("Successful", successful, delta=f"{success_rate:.1f}%")
-
-    with col3:
-        st.metric("Failed", failed)
-
-    with col4:
-        st.metric("Success Rate", f"{success_rate:.1f}%")
-
-    # Processing timeline
-    if auto_processor.processing_history:
-        st.markdown("### ?? Processing Timeline")
-
-        # Create timeline data
-        timeline_data = []
-        for record in auto_processor.processing_history:
-            timeline_data.append({
-                'Date': pd.to_datetime(record['processed_at']).date(),
-                'Time': pd.to_datetime(record['processed_at']).time(),
-                'File': os.path.basename(record['file_path']),
-                'Status': record['status'],
-                'Records': record.get('records_extracted', 0)
-            })
-
-        df = pd.DataFrame(timeline_data)
-
-        # Daily processing chart
-        daily_counts = df.groupby(['Date', 'Status']).size().reset_index(name='Count')
-
-        if not daily_counts.empty:
-            fig = px.bar(
-                daily_counts,
-                x='Date',
-                y='Count',
-                color='Status',
-                title='Daily Processing Activity',
-                color_discrete_map={'success': 'green', 'failed': 'red'}
-            )
-            st.plotly_chart(fig, use_container_width=True)
-
-        # Recent processing history
-        st.markdown("### ?? Recent Processing History")
-
-        recent_history = auto_processor.processing_history[-20:] if len(auto_processor.processing_history) > 20 else auto_processor.processing_history
-
-        history_df = pd.DataFrame(recent_history)
-        if not history_df.empty:
-            history_df['processed_at'] = pd.to_datetime(history_df['processed_at']).dt.strftime('%Y-%m-%d %H:%M:%S')
-            history_df['file_name'] = history_df['file_path'].apply(lambda x: os.path.basename(x))
-
-            display_df = history_df[['processed_at', 'file_name', 'status', 'records_extracted']].copy()
-            display_df.columns = ['Processed At', 'File Name', 'Status', 'Records Extracted']
-
-            st.dataframe(display_df, use_container_width=True)
-
-        # Export processing report
-        if st.button("?? Export Processing Report"):
-            export_processing_report()
-
-    else:
-        st.info("?? No processing history available yet.")
-
-def show_configuration():
-    """Configuration management interface"""
-
-    st.subheader("?? System Configuration")
-
-    tab1, tab2, tab3 = st.tabs(["??? Processing Rules", "?? Folder Settings", "?? Advanced"])
-
-    with tab1:
-        st.markdown("### ??? Data Processing Rules")
-
-        for rule_name, rule_config in auto_processor.extraction_rules.items():
-            with st.expander(f"?? {rule_name.replace('_', ' ').title()}"):
-
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    st.markdown("**Detection Patterns:**")
-                    patterns = st.text_area(
-                        "Patterns (one per line):",
-                        value='\n'.join(rule_config.get('patterns', [])),
-                        key=f"patterns_{rule_name}"
-                    )
-
-                    st.markdown("**Required Fields:**")
-                    required_fields = st.text_area(
-                        "Required fields (one per line):",
-                        value='\n'.join(rule_config.get('required_fields', [])),
-                        key=f"fields_{rule_name}"
-                    )
-
-                with col2:
-                    st.markdown("**Target Table:**")
-                    target_table = st.selectbox(
-                        "Database table:",
-                        ["clients", "vendors", "rfqs", "financial_transactions", "kpis"],
-                        index=["clients", "vendors", "rfqs", "financial_transactions", "kpis"].index(rule_config.get('target_table', 'clients')),
-                        key=f"table_{rule_name}"
-                    )
-
-                    st.markdown("**Priority:**")
-                    priority = st.slider(
-                        "Processing priority:",
-                        min_value=1,
-                        max_value=10,
-                        value=rule_config.get('priority', 5),
-                        key=f"priority_{rule_name}"
-                    )
-
-                if st.button(f"?? Update {rule_name}", key=f"update_{rule_name}"):
-                    update_processing_rule(rule_name, patterns, required_fields, target_table, priority)
-
-    with tab2:
-        st.markdown("### ?? Folder Monitoring Settings")
-
-        # Auto-processing settings
-        st.markdown("#### ?? Auto-Processing")
-
-        auto_process = st.checkbox(
-            "Enable automatic processing of new files",
-            value=True,
-            help="Automatically process files as soon as they are detected"
-        )
-
-        processing_delay = st.slider(
-            "Processing delay (seconds):",
-            min_value=1,
-            max_value=60,
-            value=5,
-            help="Wait time before processing a new file"
-        )
-
-        # File filters
-        st.markdown("#### ?? File Filters")
-
-        max_file_size = st.number_input(
-            "Maximum file size (MB):",
-            min_value=1,
-            max_value=1000,
-            value=50
-        )
-
-        exclude_patterns = st.text_area(
-            "Exclude patterns (one per line):",
-            value="~$*\n*.tmp\n*.bak",
-            help="File patterns to exclude from processing"
-        )
-
-        # Save settings
-        if st.button("?? Save Folder Settings", type="primary"):
-            save_folder_settings(auto_process, processing_delay, max_file_size, exclude_patterns)
-
-    with tab3:
-        st.markdown("### ?? Advanced Configuration")
-
-        # System settings
-        st.markdown("#### ??? System Settings")
-
-        max_concurrent = st.number_input(
-            "Maximum concurrent file processing:",
-            min_value=1,
-            max_value=10,
-            value=3
-        )
-
-        log_level = st.selectbox(
-            "Logging level:",
-            ["DEBUG", "INFO", "WARNING", "ERROR"],
-            index=1
-        )
-
-        # Database settings
-        st.markdown("#### ??? Database Settings")
-
-        db_backup = st.checkbox(
-            "Enable automatic database backup",
-            value=True
-        )
-
-        backup_frequency = st.selectbox(
-            "Backup frequency:",
-            ["Daily", "Weekly", "Monthly"],
-            index=0
-        )
-
-        # Reset options
-        st.markdown("#### ?? Reset Options")
-
-        col1, col2 = st.columns(2)
-
-        with col1:
-            if st.button("??? Clear Processing History"):
-                clear_processing_history()
-
-        with col2:
-            if st.button("?? Reset All Settings"):
-                reset_all_settings()
-
-        # Save advanced settings
-        if st.button("?? Save Advanced Settings", type="primary"):
-            save_advanced_settings(max_concurrent, log_level, db_backup, backup_frequency)
-
-# Helper functions for file processing
-def process_pending_files(files: List[Dict]):
-    """Process all pending files"""
-    with st.spinner("?? Processing pending files..."):
-        processed_count = 0
-
-        for file_info in files:
-            if file_info.get('status') == 'pending':
-                try:
-                    auto_processor.handle_auto_file(file_info['path'], 'manual')
-                    processed_count += 1
-                except Exception as e:
-                    st.error(f"Error processing {file_info['name']}: {e}")
-
-        st.success(f"? Processed {processed_count} files")
-
-def auto_map_fields(files: List[Dict]):
-    """Automatically map fields for files"""
-    st.info("?? Auto-mapping fields based on AI analysis...")
-    # Implement AI-based field mapping logic here
-    st.success("? Field mapping completed")
-
-def preview_files(files: List[Dict]):
-    """Preview selected files"""
-    st.markdown("### ?? File Preview")
-
-    for file_info in files[:3]:  # Limit to 3 files
-        with st.expander(f"?? {file_info['name']}"):
-            try:
-                data = auto_processor.extract_file_data(file_info['path'])
-                if data:
-                    preview_df = pd.DataFrame(data[:5])  # First 5 rows
-                    st.dataframe(preview_df, use_container_width=True)
-                else:
-                    st.warning("No data could be extracted from this file")
-            except Exception as e:
-                st.error(f"Error previewing file: {e}")
-
-def export_file_list(df: pd.DataFrame):
-    """Export file list to CSV"""
-    csv = df.to_csv(index=False)
-    st.download_button(
-        label="?? Download File List",
-        data=csv,
-        file_name=f"file_list_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-        mime="text/csv"
-    )
-
-def extract_single_file(file_info: Dict):
-    """Extract data from a single file"""
-    with st.spinner(f"?? Extracting data from {file_info['name']}..."):
-        try:
-            data = auto_processor.extract_file_data(file_info['path'])
-            if data:
-                st.success(f"? Extracted {len(data)} records")
-
-                # Show preview
-                preview_df = pd.DataFrame(data[:10])
-                st.dataframe(preview_df, use_container_width=True)
-            else:
-                st.warning("?? No data could be extracted")
-        except Exception as e:
-            st.error(f"? Error: {e}")
-
-def auto_map_single_file(file_info: Dict):
-    """Auto-map fields for a single file"""
-    st.info(f"?? Auto-mapping fields for {file_info['name']}...")
-    # Implement single file auto-mapping
-    st.success("? Auto-mapping completed")
-
-def preview_single_file(file_info: Dict):
-    """Preview a single file"""
-    try:
-        data = auto_processor.extract_file_data(file_info['path'])
-        if data:
-            st.success(f"?? Preview of {file_info['name']} ({len(data)} records)")
-            preview_df = pd.DataFrame(data[:10])
-            st.dataframe(preview_df, use_container_width=True)
-        else:
-            st.warning("No data available for preview")
-    except Exception as e:
-        st.error(f"Error: {e}")
-
-def analyze_single_file(file_info: Dict):
-    """Analyze a single file"""
-    with st.spinner(f"?? Analyzing {file_info['name']}..."):
-        try:
-            data = auto_processor.extract_file_data(file_info['path'])
-            if data:
-                # Basic analysis
-                st.markdown("#### ?? File Analysis Results")
-
-                col1, col2, col3 = st.columns(3)
-
-                with col1:
-                    st.metric("Total Records", len(data))
-
-                with col2:
-                    fields = set()
-                    for record in data:
-                        fields.update(record.keys())
-                    st.metric("Unique Fields", len(fields))
-
-                with col3:
-                    data_type = auto_processor.determine_data_type(data[0] if data else {})
-                    st.metric("Detected Type", data_type)
-
-                # Field analysis
-                st.markdown("#### ?? Field Analysis")
-                field_analysis = {}
-                for record in data:
-                    for field, value in record.items():
-                        if field not in field_analysis:
-                            field_analysis[field] = {'count': 0, 'non_empty': 0, 'samples': []}
-
-                        field_analysis[field]['count'] += 1
-                        if value and str(value).strip():
-                            field_analysis[field]['non_empty'] += 1
-                            if len(field_analysis[field]['samples']) < 3:
-                                field_analysis[field]['samples'].append(str(value)[:50])
-
-                for field, stats in field_analysis.items():
-                    if not field.startswith('_'):  # Skip internal fields
-                        completeness = (stats['non_empty'] / stats['count']) * 100
-                        samples = ', '.join(stats['samples'])
-
-                        st.write(f"**{field}:** {completeness:.1f}% complete")
-                        st.caption(f"Samples: {samples}")
-            else:
-                st.warning("No data available for analysis")
-        except Exception as e:
-            st.error(f"Error: {e}")
-
-# Configuration helper functions
-def save_field_mapping(source_field: str, target_table: str, target_field: str, transformation: str, validation: str):
-    """Save a field mapping"""
-    if source_field and target_field:
-        auto_processor.field_mappings[source_field] = f"{target_table}.{target_field}"
-        auto_processor.save_configuration()
-        st.success(f"? Saved mapping: {source_field} ? {target_table}.{target_field}")
-    else:
-        st.error("? Please fill in both source and target fields")
-
-def edit_field_mapping(selected_mapping: str):
-    """Edit an existing field mapping"""
-    st.info(f"?? Editing mapping for: {selected_mapping}")
-    # Implement edit functionality
-
-def delete_field_mapping(selected_mapping: str):
-    """Delete a field mapping"""
-    if selected_mapping in auto_processor.field_mappings:
-        del auto_processor.field_mappings[selected_mapping]
-        auto_processor.save_configuration()
-        st.success(f"? Deleted mapping: {selected_mapping}")
-        st.rerun()
-
-def generate_mapping_suggestions():
-    """Generate AI-powered mapping suggestions"""
-    st.info("?? Analyzing files to generate smart mapping suggestions...")
-
-    # Implement AI-based suggestion logic
-    suggestions = [
-        {"source": "Company Name", "target": "clients.name", "confidence": 0.95},
-        {"source": "??? ??????", "target": "clients.name_ar", "confidence": 0.90},
-        {"source": "Vendor", "target": "vendors.company_name", "confidence": 0.88},
-        {"source": "Amount SAR", "target": "financial_transactions.amount_sar", "confidence": 0.92}
-    ]
-
-    for suggestion in suggestions:
-        st.write(f"?? **{suggestion['source']}** ? {suggestion['target']} (Confidence: {suggestion['confidence']:.0%})")
-
-def update_processing_rule(rule_name: str, patterns: str, required_fields: str, target_table: str, priority: int):
-    """Update a processing rule"""
-    auto_processor.extraction_rules[rule_name] = {
-        'patterns': [p.strip() for p in patterns.split('\n') if p.strip()],
-        'required_fields': [f.strip() for f in required_fields.split('\n') if f.strip()],
-        'target_table': target_table,
-        'priority': priority
-    }
-    auto_processor.save_configuration()
-    st.success(f"? Updated processing rule: {rule_name}")
-
-def save_folder_settings(auto_process: bool, processing_delay: int, max_file_size: int, exclude_patterns: str):
-    """Save folder monitoring settings"""
-    # Implementation for saving folder settings
-    st.success("? Folder settings saved successfully")
-
-def save_advanced_settings(max_concurrent: int, log_level: str, db_backup: bool, backup_frequency: str):
-    """Save advanced system settings"""
-    # Implementation for saving advanced settings
-    st.success("? Advanced settings saved successfully")
-
-def clear_processing_history():
-    """Clear processing history"""
-    auto_processor.processing_history.clear()
-    st.success("? Processing history cleared")
-
-def reset_all_settings():
-    """Reset all settings to defaults"""
-    auto_processor.set_default_extraction_rules()
-    auto_processor.field_mappings.clear()
-    auto_processor.save_configuration()
-    st.success("? All settings reset to defaults")
-
-def export_processing_report():
-    """Export processing report"""
-    if auto_processor.processing_history:
-        df = pd.DataFrame(auto_processor.processing_history)
-        csv = df.to_csv(index=False)
-
-        st.download_button(
-            label="?? Download Processing Report",
-            data=csv,
-            file_name=f"processing_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
-    else:
-        st.warning("No processing history to export")
-
-if __name__ == "__main__":
+"""
+?? AFCO AUTOMATIC DOCUMENT PROCESSING INTERFACE
+?? In Loving Memory of Omar (2007-2024)
+Complete automatic folder monitoring, document upload, analysis, and mapping system
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+import plotly.express as px
+import plotly.graph_objects as go
+import os
+import fnmatch
+import time
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable
+from collections import deque
+import threading
+import hashlib
+import heapq
+import itertools
+import queue
+import sqlite3
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+# Document processing imports with fallbacks
+try:
+    import openpyxl
+    from openpyxl import load_workbook
+    EXCEL_SUPPORT = True
+except ImportError:
+    EXCEL_SUPPORT = False
+
+try:
+    from docx import Document
+    WORD_SUPPORT = True
+except ImportError:
+    WORD_SUPPORT = False
+
+try:
+    import pdfplumber
+    PDF_SUPPORT = True
+except ImportError:
+    PDF_SUPPORT = False
+
+try:
+    import yaml
+    YAML_SUPPORT = True
+except ImportError:
+    YAML_SUPPORT = False
+
+try:
+    import xxhash
+    XXHASH_SUPPORT = True
+except ImportError:
+    XXHASH_SUPPORT = False
+
+# Database imports
+try:
+    from production_database import production_db
+    DATABASE_AVAILABLE = True
+except ImportError:
+    DATABASE_AVAILABLE = False
+    production_db = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Defaults for the 'monitoring' section of auto_config.yaml
+MONITORING_DEFAULTS = {
+    'auto_process': True,
+    'processing_delay_seconds': 5,
+    'max_file_size_mb': 50,
+    'max_concurrent_processing': 3,
+    'max_queue_size': 1000,
+    'exclude_patterns': ['~$*', '*.tmp', '*.bak', '*.log'],
+    'supported_extensions': ['.xlsx', '.xls', '.csv', '.docx', '.doc', '.pdf']
+}
+
+def load_monitoring_settings(config_path: str = "auto_config.yaml") -> Dict[str, Any]:
+    """Monitoring settings from auto_config.yaml merged over MONITORING_DEFAULTS"""
+    settings = dict(MONITORING_DEFAULTS)
+
+    if YAML_SUPPORT and os.path.exists(config_path):
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f) or {}
+            settings.update(config.get('monitoring') or {})
+        except Exception as e:
+            logger.error(f"Error loading monitoring settings: {e}")
+
+    return settings
+
+class FileProcessingPool:
+    """Bounded worker pool that processes detected files off the watcher thread.
+
+    Events for a path are debounced: a file is only queued once no new
+    event for it has arrived for debounce_seconds, so files still being
+    copied are processed once. Ready files go into a priority queue
+    (smallest file first by default) served by max_workers threads. When
+    max_queue_size files are outstanding, submit returns immediately and
+    parks the file in an overflow set; workers admit overflow files as
+    they finish, so the observer thread never waits on the queue.
+
+    process_func returns False when processing failed and None when the
+    file was skipped (e.g. already processed); anything else, or no
+    exception, counts as completed.
+    """
+
+    def __init__(self, process_func: Callable[[str, str], Any], max_workers: int = 3,
+                 debounce_seconds: float = 5.0, max_queue_size: int = 1000):
+        self.process_func = process_func
+        self.max_workers = max(1, int(max_workers))
+        self.debounce_seconds = debounce_seconds
+        self.max_queue_size = max_queue_size
+
+        self._ready = queue.PriorityQueue()
+        self._debounce_heap = []
+        self._debouncing = {}
+        self._overflow = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._threads = []
+        self._running = False
+
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=1000)
+
+    @property
+    def outstanding(self) -> int:
+        return len(self._debouncing) + self._ready.qsize() + self.in_flight
+
+    def start(self):
+        """Start the scheduler and worker threads (idempotent)"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+
+        self._threads = [threading.Thread(target=self._schedule, name='afco-file-scheduler', daemon=True)]
+        self._threads += [
+            threading.Thread(target=self._work, name=f'afco-file-worker-{i}', daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, file_path: str, event_type: str, priority: Optional[float] = None) -> bool:
+        """Queue a file for processing after the debounce delay
+
+        Never blocks. Returns False when the queue is full and the file was
+        deferred to the overflow set instead.
+        """
+        self.start()
+
+        with self._condition:
+            if file_path in self._debouncing or self.outstanding < self.max_queue_size:
+                self._admit(file_path, event_type, priority, time.monotonic())
+                return True
+
+            if file_path not in self._overflow:
+                self.rejected += 1
+                logger.warning(f"Processing queue full, deferring: {file_path}")
+            submitted = self._overflow.get(file_path, (None, None, time.monotonic()))[2]
+            self._overflow[file_path] = (event_type, priority, submitted)
+            return False
+
+    def _admit(self, file_path: str, event_type: str, priority: Optional[float], submitted: float):
+        """Start the debounce delay for a file; caller holds self._condition"""
+        due = time.monotonic() + self.debounce_seconds
+        self._debouncing[file_path] = (due, event_type, priority, submitted)
+        heapq.heappush(self._debounce_heap, (due, next(self._sequence), file_path))
+        self._condition.notify_all()
+
+    def _admit_overflow(self):
+        """Move deferred files, oldest first, into the freed queue slots; caller holds self._condition"""
+        while self._overflow and self.outstanding < self.max_queue_size:
+            file_path = next(iter(self._overflow))
+            event_type, priority, submitted = self._overflow.pop(file_path)
+            self._admit(file_path, event_type, priority, submitted)
+
+    def _schedule(self):
+        """Move files whose debounce delay has passed into the ready queue"""
+        while True:
+            with self._condition:
+                while self._running and not self._debounce_heap:
+                    self._condition.wait()
+                if not self._running:
+                    return
+
+                due, _, file_path = self._debounce_heap[0]
+                now = time.monotonic()
+                if due > now:
+                    self._condition.wait(due - now)
+                    continue
+                heapq.heappop(self._debounce_heap)
+
+                entry = self._debouncing.get(file_path)
+                if entry is None or entry[0] != due:
+                    # Superseded by a later event for the same file
+                    continue
+                del self._debouncing[file_path]
+
+            _, event_type, priority, submitted = entry
+            if priority is None:
+                try:
+                    priority = os.path.getsize(file_path)
+                except OSError:
+                    priority = 0
+            self._ready.put((priority, next(self._sequence), file_path, event_type, submitted, time.monotonic()))
+
+    def _work(self):
+        """Process ready files until shutdown"""
+        while True:
+            item = self._ready.get()
+            if item[2] is None:
+                return
+
+            _, _, file_path, event_type, submitted, queued = item
+            with self._condition:
+                self.in_flight += 1
+
+            started = time.monotonic()
+            try:
+                outcome = self.process_func(file_path, event_type)
+            except Exception as e:
+                logger.error(f"Error processing queued file {file_path}: {e}")
+                outcome = False
+            finished = time.monotonic()
+
+            with self._condition:
+                self.in_flight -= 1
+                self._admit_overflow()
+                if outcome is False:
+                    self.failed += 1
+                elif outcome is None:
+                    self.skipped += 1
+                else:
+                    self.completed += 1
+                self.latencies.append({
+                    'file_path': file_path,
+                    'wait_seconds': started - queued,
+                    'processing_seconds': finished - started,
+                    'total_seconds': finished - submitted
+                })
+                self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight count, totals and per-file latency"""
+        with self._condition:
+            latencies = list(self.latencies)
+            result = {
+                'queue_depth': self._ready.qsize(),
+                'debouncing': len(self._debouncing),
+                'overflow': len(self._overflow),
+                'in_flight': self.in_flight,
+                'completed': self.completed,
+                'failed': self.failed,
+                'skipped': self.skipped,
+                'rejected': self.rejected,
+                'max_workers': self.max_workers,
+                'recent_latencies': latencies[-20:]
+            }
+
+        processing = np.array([item['processing_seconds'] for item in latencies])
+        result['latency_p50_seconds'] = float(np.percentile(processing, 50)) if processing.size else 0.0
+        result['latency_p95_seconds'] = float(np.percentile(processing, 95)) if processing.size else 0.0
+        return result
+
+    def shutdown(self, wait: bool = True):
+        """Stop the scheduler and workers; queued files are abandoned"""
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._condition.notify_all()
+
+        for _ in range(self.max_workers):
+            self._ready.put((float('-inf'), next(self._sequence), None, None, None, None))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+class FileFingerprinter:
+    """Content fingerprints for watched files, persisted in a SQLite index.
+
+    A file whose (size, mtime, inode) match its index entry reuses the
+    stored fingerprint without being read. Otherwise it is hashed in
+    chunks (xxhash when installed, BLAKE2 otherwise); files larger than
+    sample_threshold_mb only have their head, middle and tail sampled,
+    together with the size. The index survives restarts, so unchanged
+    files are never rehashed.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+    SAMPLE_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, db_path: str = "data/processed/file_index.db", sample_threshold_mb: float = 256):
+        self.db_path = db_path
+        self.sample_threshold = int(sample_threshold_mb * 1024 * 1024)
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the fingerprint table on first use"""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS file_fingerprints (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                fingerprint TEXT NOT NULL,
+                hashed_at TEXT NOT NULL
+            )
+        """)
+        return conn
+
+    def _load(self):
+        """Read the whole index into memory once"""
+        if self._entries is not None:
+            return
+        entries = {}
+        try:
+            conn = self._connect()
+            try:
+                for path, size, mtime_ns, inode, fingerprint in conn.execute(
+                        "SELECT path, size, mtime_ns, inode, fingerprint FROM file_fingerprints"):
+                    entries[path] = (size, mtime_ns, inode, fingerprint)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error loading fingerprint index: {e}")
+        self._entries = entries
+
+    def fingerprint(self, file_path: str, stat: Optional[os.stat_result] = None) -> str:
+        """Fingerprint of a file, reading it only if it changed since last indexed"""
+        stat = stat or os.stat(file_path)
+        key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+        with self._lock:
+            self._load()
+            entry = self._entries.get(file_path)
+        if entry is not None and entry[:3] == key:
+            return entry[3]
+
+        fingerprint = self._hash_file(file_path, stat.st_size)
+
+        with self._lock:
+            self._entries[file_path] = key + (fingerprint,)
+            try:
+                conn = self._connect()
+                try:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO file_fingerprints VALUES (?, ?, ?, ?, ?, ?)",
+                        (file_path,) + key + (fingerprint, datetime.now().isoformat())
+                    )
+                    conn.commit()
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                logger.error(f"Error saving fingerprint for {file_path}: {e}")
+
+        return fingerprint
+
+    def _hash_file(self, file_path: str, size: int) -> str:
+        """Chunked content hash, or a head/middle/tail sample for very large files"""
+        hasher = xxhash.xxh3_128() if XXHASH_SUPPORT else hashlib.blake2b(digest_size=16)
+
+        with open(file_path, 'rb') as f:
+            if size <= self.sample_threshold:
+                for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b''):
+                    hasher.update(chunk)
+                prefix = 'full'
+            else:
+                hasher.update(str(size).encode())
+                for offset in (0, (size - self.SAMPLE_SIZE) // 2, size - self.SAMPLE_SIZE):
+                    f.seek(offset)
+                    hasher.update(f.read(self.SAMPLE_SIZE))
+                prefix = 'sampled'
+
+        return f"{prefix}:{hasher.hexdigest()}"
+
+    def forget(self, file_path: str):
+        """Drop a file from the index"""
+        with self._lock:
+            self._load()
+            self._entries.pop(file_path, None)
+            try:
+                conn = self._connect()
+                try:
+                    conn.execute("DELETE FROM file_fingerprints WHERE path = ?", (file_path,))
+                    conn.commit()
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                logger.error(f"Error removing fingerprint for {file_path}: {e}")
+
+class ProcessingIndex:
+    """SQLite-backed record of processed files and their processing history.
+
+    file_status keeps the latest status per path (primary-key lookups),
+    processing_history is an append-only log queried a page at a time, and
+    seen_fingerprints records which file contents have already been picked
+    up by a watcher. Everything survives restarts.
+    """
+
+    def __init__(self, db_path: str = "data/processed/file_index.db"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the index tables on first use"""
+        if not self._initialized:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        # WAL lets status lookups run while workers write results
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS file_status (
+                    file_path TEXT PRIMARY KEY,
+                    fingerprint TEXT,
+                    status TEXT NOT NULL,
+                    event_type TEXT,
+                    records_extracted INTEGER,
+                    error TEXT,
+                    first_processed_at TEXT NOT NULL,
+                    processed_at TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS processing_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_path TEXT NOT NULL,
+                    fingerprint TEXT,
+                    processed_at TEXT NOT NULL,
+                    event_type TEXT,
+                    status TEXT NOT NULL,
+                    records_extracted INTEGER,
+                    error TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_processing_history_status ON processing_history (status);
+                CREATE TABLE IF NOT EXISTS seen_fingerprints (
+                    fingerprint TEXT PRIMARY KEY,
+                    file_path TEXT,
+                    first_seen TEXT NOT NULL
+                );
+            """)
+            self._initialized = True
+        return conn
+
+    def claim_fingerprint(self, fingerprint: str, file_path: str) -> bool:
+        """Mark file contents as picked up; False if they were already seen
+
+        A successful claim replaces older claims for the same path, so
+        earlier versions of a file (e.g. seen mid-copy) do not accumulate.
+        """
+        with self._lock:
+            conn = self._connect()
+            try:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO seen_fingerprints VALUES (?, ?, ?)",
+                    (fingerprint, file_path, datetime.now().isoformat())
+                )
+                claimed = cursor.rowcount == 1
+                if claimed:
+                    conn.execute(
+                        "DELETE FROM seen_fingerprints WHERE file_path = ? AND fingerprint != ?",
+                        (file_path, fingerprint)
+                    )
+                conn.commit()
+                return claimed
+            finally:
+                conn.close()
+
+    def release_fingerprint(self, fingerprint: str):
+        """Forget a claim so the next event for the file is handled again"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM seen_fingerprints WHERE fingerprint = ?", (fingerprint,))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def record(self, file_path: str, status: str, event_type: Optional[str] = None,
+               records_extracted: Optional[int] = None, error: Optional[str] = None,
+               fingerprint: Optional[str] = None):
+        """Append a processing result and update the file's latest status"""
+        processed_at = datetime.now().isoformat()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT INTO processing_history "
+                    "(file_path, fingerprint, processed_at, event_type, status, records_extracted, error) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (file_path, fingerprint, processed_at, event_type, status, records_extracted, error)
+                )
+                conn.execute("""
+                    INSERT INTO file_status VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(file_path) DO UPDATE SET
+                        fingerprint = excluded.fingerprint,
+                        status = excluded.status,
+                        event_type = excluded.event_type,
+                        records_extracted = excluded.records_extracted,
+                        error = excluded.error,
+                        processed_at = excluded.processed_at
+                """, (file_path, fingerprint, status, event_type, records_extracted, error, processed_at, processed_at))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get_status(self, file_path: str) -> str:
+        """Latest status of one file, 'pending' if never processed"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT status FROM file_status WHERE file_path = ?", (file_path,)).fetchone()
+        finally:
+            conn.close()
+        return row['status'] if row else 'pending'
+
+    def get_statuses(self) -> Dict[str, str]:
+        """Latest status of every processed file, for bulk lookups during scans"""
+        conn = self._connect()
+        try:
+            return {row['file_path']: row['status'] for row in conn.execute("SELECT file_path, status FROM file_status")}
+        finally:
+            conn.close()
+
+    def history(self, limit: Optional[int] = 20, offset: int = 0, status: Optional[str] = None) -> List[Dict]:
+        """Processing history, newest first, one page at a time (limit=None for all)"""
+        query = "SELECT file_path, fingerprint, processed_at, event_type, status, records_extracted, error FROM processing_history"
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY id DESC LIMIT ? OFFSET ?"
+        params += [limit if limit is not None else -1, offset]
+
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(query, params)]
+        finally:
+            conn.close()
+
+    def status_counts(self) -> Dict[str, int]:
+        """Number of history entries per status"""
+        conn = self._connect()
+        try:
+            return {row['status']: row['n'] for row in conn.execute(
+                "SELECT status, COUNT(*) AS n FROM processing_history GROUP BY status")}
+        finally:
+            conn.close()
+
+    def daily_counts(self) -> pd.DataFrame:
+        """History entries per day and status"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT substr(processed_at, 1, 10) AS Date, status AS Status, COUNT(*) AS Count "
+                "FROM processing_history GROUP BY Date, Status ORDER BY Date"
+            ).fetchall()
+        finally:
+            conn.close()
+        return pd.DataFrame([dict(row) for row in rows], columns=['Date', 'Status', 'Count'])
+
+    def clear_history(self):
+        """Remove processing history, file statuses and fingerprint claims"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM processing_history")
+                conn.execute("DELETE FROM file_status")
+                conn.execute("DELETE FROM seen_fingerprints")
+                conn.commit()
+            finally:
+                conn.close()
+
+class FolderScanner:
+    """Single-pass recursive folder scanner with a directory-mtime journal.
+
+    Each directory is listed once with os.scandir, matching every supported
+    extension and the exclude patterns in the same pass and taking sizes
+    and times from DirEntry.stat(). The listing is journaled against the
+    directory's mtime; on rescans a directory whose mtime is unchanged
+    costs one stat and its journaled listing is reused. Files modified in
+    place do not change their directory's mtime, so their size/time can
+    be stale until full=True (the watcher handles content changes).
+    Hidden entries are skipped and directory symlinks are not followed.
+    """
+
+    def __init__(self, extensions: List[str], exclude_patterns: Optional[List[str]] = None):
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.exclude_patterns = list(exclude_patterns or [])
+        self._journal = {}
+        self._lock = threading.Lock()
+        self.stats = {'dirs_listed': 0, 'dirs_reused': 0}
+
+    def _is_excluded(self, name: str) -> bool:
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.exclude_patterns)
+
+    def matches(self, name: str) -> bool:
+        """Whether a file name has a supported extension and no exclude pattern matches it"""
+        return name.lower().endswith(self.extensions) and not self._is_excluded(name)
+
+    def _list_directory(self, directory: str):
+        """Matching files and subdirectories of one directory"""
+        files, subdirs = [], []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif self.matches(entry.name) and entry.is_file():
+                        stat = entry.stat()
+                        files.append({
+                            'path': entry.path,
+                            'name': entry.name,
+                            'size': stat.st_size,
+                            'modified': datetime.fromtimestamp(stat.st_mtime),
+                            'extension': os.path.splitext(entry.name)[1].lower()
+                        })
+                except OSError as e:
+                    logger.warning(f"Skipping {entry.path}: {e}")
+        return files, subdirs
+
+    def scan(self, root: str, full: bool = False) -> List[Dict]:
+        """All matching files under root, reusing unchanged directory listings"""
+        results = []
+        visited = set()
+        stack = [root]
+
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            visited.add(directory)
+
+            with self._lock:
+                cached = self._journal.get(directory)
+            if not full and cached is not None and cached[0] == mtime:
+                files, subdirs = cached[1], cached[2]
+                self.stats['dirs_reused'] += 1
+            else:
+                try:
+                    files, subdirs = self._list_directory(directory)
+                except OSError as e:
+                    logger.warning(f"Cannot scan {directory}: {e}")
+                    continue
+                with self._lock:
+                    self._journal[directory] = (mtime, files, subdirs)
+                self.stats['dirs_listed'] += 1
+
+            results.extend(files)
+            stack.extend(reversed(subdirs))
+
+        # Forget directories under root that no longer exist
+        prefix = os.path.join(root, '')
+        with self._lock:
+            for directory in [d for d in self._journal if (d == root or d.startswith(prefix)) and d not in visited]:
+                del self._journal[directory]
+
+        return results
+
+    def clear(self):
+        """Drop the journal so the next scan lists every directory"""
+        with self._lock:
+            self._journal.clear()
+
+class AutoFileHandler(FileSystemEventHandler):
+    """File system event handler for automatic file monitoring
+
+    Runs on the observer thread, so it only filters file names and hands
+    the path to callback_func; fingerprinting and duplicate detection
+    happen later in the worker pool, once the file has settled. file_filter
+    takes a file name (e.g. FolderScanner.matches); by default the
+    extensions and exclude patterns of MONITORING_DEFAULTS apply.
+    """
+
+    def __init__(self, callback_func=None, file_filter: Optional[Callable[[str], bool]] = None):
+        self.callback_func = callback_func
+        if file_filter is None:
+            file_filter = FolderScanner(
+                MONITORING_DEFAULTS['supported_extensions'], MONITORING_DEFAULTS['exclude_patterns']
+            ).matches
+        self.file_filter = file_filter
+
+    def on_created(self, event):
+        if not event.is_dir:
+            self.handle_file_event(event.src_path, "created")
+
+    def on_modified(self, event):
+        if not event.is_dir:
+            self.handle_file_event(event.src_path, "modified")
+
+    def handle_file_event(self, file_path, event_type):
+        # Only process supported, non-excluded files (e.g. not ~$ lock files)
+        if self.file_filter(os.path.basename(file_path)):
+            if self.callback_func:
+                self.callback_func(file_path, event_type)
+            logger.info(f"File event: {file_path} ({event_type})")
+
+class AFCOAutoDocumentProcessor:
+    """Automatic document processor for AFCO with folder monitoring"""
+
+    def __init__(self):
+        self.watch_folders = []
+        self.observers = []
+        self.file_cache = {}
+        self.extraction_rules = {}
+        self.field_mappings = {}
+        self.processing_index = ProcessingIndex()
+
+        # Shared fingerprint index for every watched folder
+        self.fingerprinter = FileFingerprinter()
+
+        # Worker pool behind the folder observers
+        self.monitoring_settings = load_monitoring_settings()
+        self.processing_pool = FileProcessingPool(
+            self.process_watched_file,
+            max_workers=self.monitoring_settings['max_concurrent_processing'],
+            debounce_seconds=self.monitoring_settings['processing_delay_seconds'],
+            max_queue_size=self.monitoring_settings['max_queue_size']
+        )
+
+        # Incremental scanner for the file manager; its matches() also filters watcher events
+        self.folder_scanner = FolderScanner(
+            self.monitoring_settings['supported_extensions'],
+            self.monitoring_settings['exclude_patterns']
+        )
+
+        # Initialize storage directories
+        self.ensure_directories()
+
+        # Load configuration
+        self.load_configuration()
+
+    def ensure_directories(self):
+        """Create necessary directories"""
+        directories = [
+            "data/auto_watch",
+            "data/processed",
+            "data/mappings",
+            "data/extractions",
+            "data/sql_exports"
+        ]
+
+        for directory in directories:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+
+    def load_configuration(self):
+        """Load processing configuration"""
+        config_path = "data/mappings/auto_config.json"
+
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+                    self.extraction_rules = config.get('extraction_rules', {})
+                    self.field_mappings = config.get('field_mappings', {})
+                    self.watch_folders = config.get('watch_folders', [])
+            except Exception as e:
+                logger.error(f"Error loading configuration: {e}")
+
+        # Default configuration
+        if not self.extraction_rules:
+            self.set_default_extraction_rules()
+
+    def set_default_extraction_rules(self):
+        """Set default extraction rules for Saudi market documents"""
+        self.extraction_rules = {
+            'client_data': {
+                'patterns': ['company', 'client', 'customer', '????', '????'],
+                'required_fields': ['name', 'contact', 'sector'],
+                'target_table': 'clients'
+            },
+            'vendor_data': {
+                'patterns': ['vendor', 'supplier', '????', '?????'],
+                'required_fields': ['company_name', 'contact_person', 'products'],
+                'target_table': 'vendors'
+            },
+            'rfq_data': {
+                'patterns': ['rfq', 'tender', 'bid', '????', '??????'],
+                'required_fields': ['title', 'value', 'deadline'],
+                'target_table': 'rfqs'
+            },
+            'financial_data': {
+                'patterns': ['revenue', 'cost', 'budget', '???????', '??????'],
+                'required_fields': ['amount', 'date', 'description'],
+                'target_table': 'financial_transactions'
+            }
+        }
+
+    def save_configuration(self):
+        """Save current configuration"""
+        config_path = "data/mappings/auto_config.json"
+
+        config = {
+            'extraction_rules': self.extraction_rules,
+            'field_mappings': self.field_mappings,
+            'watch_folders': self.watch_folders,
+            'last_updated': datetime.now().isoformat()
+        }
+
+        try:
+            with open(config_path, 'w', encoding='utf-8') as f:
+                json.dump(config, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.error(f"Error saving configuration: {e}")
+
+    def add_watch_folder(self, folder_path: str):
+        """Add folder to monitoring list"""
+        if os.path.exists(folder_path) and folder_path not in self.watch_folders:
+            self.watch_folders.append(folder_path)
+            self.start_folder_monitoring(folder_path)
+            self.save_configuration()
+            return True
+        return False
+
+    def start_folder_monitoring(self, folder_path: str):
+        """Start monitoring a specific folder"""
+        try:
+            observer = Observer()
+            event_handler = AutoFileHandler(callback_func=self.enqueue_auto_file,
+                                            file_filter=self.folder_scanner.matches)
+            observer.schedule(event_handler, folder_path, recursive=True)
+            observer.start()
+            self.observers.append(observer)
+            logger.info(f"Started monitoring folder: {folder_path}")
+        except Exception as e:
+            logger.error(f"Error starting folder monitoring: {e}")
+
+    def stop_all_monitoring(self):
+        """Stop all folder monitoring"""
+        for observer in self.observers:
+            observer.stop()
+            observer.join()
+        self.observers.clear()
+        self.processing_pool.shutdown()
+
+    def enqueue_auto_file(self, file_path: str, event_type: str) -> bool:
+        """Hand a detected file to the worker pool without blocking the observer"""
+        if not self.monitoring_settings['auto_process']:
+            return False
+        return self.processing_pool.submit(file_path, event_type)
+
+    def get_queue_status(self) -> Dict[str, Any]:
+        """Worker pool metrics for the status page"""
+        return self.processing_pool.stats()
+
+    def process_watched_file(self, file_path: str, event_type: str) -> Optional[bool]:
+        """Worker-pool entry for watcher events: skip already-seen contents, then process
+
+        Fingerprinting happens here, after the debounce delay and off the
+        observer thread. Returns None when the contents were already
+        claimed, otherwise handle_auto_file's result. The claim is released
+        unless processing succeeded, so a failed, empty or half-copied file
+        is picked up again by its next event.
+        """
+        fingerprint = self._safe_fingerprint(file_path)
+        if fingerprint is None:
+            return False
+        if not self.processing_index.claim_fingerprint(fingerprint, file_path):
+            return None
+
+        logger.info(f"New file detected: {file_path} ({event_type})")
+        succeeded = False
+        try:
+            succeeded = self.handle_auto_file(file_path, event_type)
+        finally:
+            if not succeeded:
+                self.processing_index.release_fingerprint(fingerprint)
+        return succeeded
+
+    def handle_auto_file(self, file_path: str, event_type: str) -> bool:
+        """Handle automatically detected files; True if data was extracted and stored"""
+        try:
+            # Extract data from file
+            extracted_data = self.extract_file_data(file_path)
+
+            if extracted_data:
+                # Apply field mappings
+                mapped_data = self.apply_field_mappings(extracted_data)
+
+                # Store processed data
+                self.store_processed_data(file_path, mapped_data)
+
+                # Update processing history
+                self.processing_index.record(
+                    file_path, 'success', event_type=event_type,
+                    records_extracted=len(mapped_data), fingerprint=self._safe_fingerprint(file_path)
+                )
+
+                logger.info(f"Successfully processed: {file_path}")
+                return True
+
+            # Extractors log and swallow their own errors, so record the outcome here
+            self.processing_index.record(
+                file_path, 'empty', event_type=event_type, records_extracted=0,
+                error='No data extracted', fingerprint=self._safe_fingerprint(file_path)
+            )
+            logger.warning(f"No data extracted from: {file_path}")
+            return False
+
+        except Exception as e:
+            logger.error(f"Error processing auto file {file_path}: {e}")
+            self.processing_index.record(
+                file_path, 'failed', event_type=event_type, error=str(e),
+                fingerprint=self._safe_fingerprint(file_path)
+            )
+            return False
+
+    def _safe_fingerprint(self, file_path: str) -> Optional[str]:
+        """Fingerprint for the processing index, None if the file is unreadable"""
+        try:
+            return self.fingerprinter.fingerprint(file_path)
+        except OSError:
+            return None
+
+    def scan_folders(self, full: bool = False) -> Dict[str, List[Dict]]:
+        """Scan all watch folders and return file information"""
+        folder_contents = {}
+        statuses = self.processing_index.get_statuses()
+
+        for folder_path in self.watch_folders:
+            if os.path.exists(folder_path):
+                folder_contents[folder_path] = [
+                    dict(file_info, status=statuses.get(file_info['path'], 'pending'))
+                    for file_info in self.folder_scanner.scan(folder_path, full=full)
+                ]
+
+        return folder_contents
+
+    def get_file_info(self, file_path: str, status: Optional[str] = None) -> Dict:
+        """Get detailed file information"""
+        try:
+            stat = os.stat(file_path)
+
+            return {
+                'path': file_path,
+                'name': os.path.basename(file_path),
+                'size': stat.st_size,
+                'modified': datetime.fromtimestamp(stat.st_mtime),
+                'extension': Path(file_path).suffix.lower(),
+                'status': status if status is not None else self.get_file_processing_status(file_path)
+            }
+        except Exception as e:
+            return {
+                'path': file_path,
+                'name': os.path.basename(file_path),
+                'error': str(e),
+                'status': 'error'
+            }
+
+    def get_file_processing_status(self, file_path: str) -> str:
+        """Check if file has been processed"""
+        return self.processing_index.get_status(file_path)
+
+    def extract_file_data(self, file_path: str) -> List[Dict]:
+        """Extract data from various file formats"""
+        extension = Path(file_path).suffix.lower()
+
+        try:
+            if extension in ['.xlsx', '.xls'] and EXCEL_SUPPORT:
+                return self.extract_from_excel(file_path)
+            elif extension == '.csv':
+                return self.extract_from_csv(file_path)
+            elif extension in ['.docx', '.doc'] and WORD_SUPPORT:
+                return self.extract_from_word(file_path)
+            elif extension == '.pdf' and PDF_SUPPORT:
+                return self.extract_from_pdf(file_path)
+            else:
+                logger.warning(f"Unsupported file type: {extension}")
+                return []
+        except Exception as e:
+            logger.error(f"Error extracting data from {file_path}: {e}")
+            return []
+
+    def extract_from_excel(self, file_path: str) -> List[Dict]:
+        """Extract data from Excel files"""
+        data = []
+        workbook = load_workbook(file_path, data_only=True)
+
+        for sheet_name in workbook.sheetnames:
+            sheet = workbook[sheet_name]
+
+            if sheet.max_row <= 1:
+                continue
+
+            # Get headers
+            headers = []
+            for cell in sheet[1]:
+                headers.append(cell.value or f"Column_{len(headers)}")
+
+            # Get data rows
+            for row in sheet.iter_rows(min_row=2, values_only=True):
+                if any(cell is not None for cell in row):
+                    row_dict = {}
+                    for i, value in enumerate(row):
+                        if i < len(headers):
+                            row_dict[headers[i]] = value
+
+                    row_dict['_source_sheet'] = sheet_name
+                    row_dict['_source_file'] = file_path
+                    data.append(row_dict)
+
+        return data
+
+    def extract_from_csv(self, file_path: str) -> List[Dict]:
+        """Extract data from CSV files"""
+        encodings = ['utf-8', 'utf-8-sig', 'iso-8859-1', 'cp1256']
+
+        for encoding in encodings:
+            try:
+                df = pd.read_csv(file_path, encoding=encoding)
+                df = df.dropna(how='all')
+
+                data = df.to_dict('records')
+                for record in data:
+                    record['_source_file'] = file_path
+
+                return data
+            except UnicodeDecodeError:
+                continue
+            except Exception as e:
+                logger.error(f"Error reading CSV {file_path}: {e}")
+                break
+
+        return []
+
+    def extract_from_word(self, file_path: str) -> List[Dict]:
+        """Extract data from Word documents"""
+        doc = Document(file_path)
+        data = []
+
+        for table_idx, table in enumerate(doc.tables):
+            if not table.rows:
+                continue
+
+            headers = [cell.text.strip() for cell in table.rows[0].cells]
+
+            for row in table.rows[1:]:
+                row_data = {}
+                for i, cell in enumerate(row.cells):
+                    if i < len(headers):
+                        row_data[headers[i]] = cell.text.strip()
+
+                if any(v for v in row_data.values()):
+                    row_data['_source_table'] = f"Table_{table_idx}"
+                    row_data['_source_file'] = file_path
+                    data.append(row_data)
+
+        return data
+
+    def extract_from_pdf(self, file_path: str) -> List[Dict]:
+        """Extract data from PDF files"""
+        data = []
+
+        with pdfplumber.open(file_path) as pdf:
+            for page_num, page in enumerate(pdf.pages):
+                tables = page.extract_tables()
+
+                for table_idx, table in enumerate(tables):
+                    if table and len(table) > 1:
+                        headers = table[0]
+
+                        for row in table[1:]:
+                            if any(cell for cell in row):
+                                row_dict = {}
+                                for i, cell in enumerate(row):
+                                    if i < len(headers):
+                                        row_dict[headers[i]] = cell
+
+                                if any(v for v in row_dict.values()):
+                                    row_dict['_source_page'] = page_num + 1
+                                    row_dict['_source_table'] = table_idx
+                                    row_dict['_source_file'] = file_path
+                                    data.append(row_dict)
+
+        return data
+
+    def apply_field_mappings(self, data: List[Dict]) -> List[Dict]:
+        """Apply field mappings to extracted data"""
+        mapped_data = []
+
+        for record in data:
+            mapped_record = record.copy()
+
+            # Apply field mappings
+            for source_field, target_field in self.field_mappings.items():
+                if source_field in record:
+                    mapped_record[target_field] = record[source_field]
+
+            # Determine data type based on content
+            data_type = self.determine_data_type(mapped_record)
+            mapped_record['_data_type'] = data_type
+
+            mapped_data.append(mapped_record)
+
+        return mapped_data
+
+    def determine_data_type(self, record: Dict) -> str:
+        """Determine data type based on record content"""
+        content = ' '.join(str(v).lower() for v in record.values() if v)
+
+        for data_type, rules in self.extraction_rules.items():
+            patterns = rules.get('patterns', [])
+            if any(pattern in content for pattern in patterns):
+                return data_type
+
+        return 'general'
+
+    def store_processed_data(self, file_path: str, data: List[Dict]):
+        """Store processed data"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = os.path.basename(file_path)
+        output_file = f"data/extractions/{timestamp}_{filename}.json"
+
+        try:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'source_file': file_path,
+                    'processed_at': datetime.now().isoformat(),
+                    'record_count': len(data),
+                    'data': data
+                }, f, ensure_ascii=False, indent=2, default=str)
+        except Exception as e:
+            logger.error(f"Error storing processed data: {e}")
+
+# Initialize global processor once per server process: Streamlit reruns the
+# script on every interaction, and the scanner journal, worker pool and
+# observers must survive those reruns
+@st.cache_resource
+def get_auto_processor() -> AFCOAutoDocumentProcessor:
+    """Shared document processor for all sessions"""
+    return AFCOAutoDocumentProcessor()
+
+auto_processor = get_auto_processor()
+
+def main():
+    """Main Streamlit application"""
+
+    st.set_page_config(
+        page_title="?? AFCO Auto Document Center",
+        page_icon="??",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
+    # Header
+    st.markdown("""
+    <div style="background: linear-gradient(90deg, #4A90E2, #87CEEB); color: white; padding: 1rem; border-radius: 10px; text-align: center; margin-bottom: 2rem;">
+        <h1>?? AFCO Automatic Document Processing Center</h1>
+        <p>?? In Loving Memory of Omar (2007-2024) - "Forever 17, Forever Inspiring Innovation"</p>
+        <p>Automatic Folder Monitoring  Real-time Data Extraction  Smart Field Mapping</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Sidebar navigation
+    st.sidebar.markdown("### ?? Navigation")
+
+    tabs = st.tabs([
+        "?? Folder Monitor",
+        "??? File Manager",
+        "?? Field Mapping",
+        "?? Processing Status",
+        "?? Configuration"
+    ])
+
+    with tabs[0]:
+        show_folder_monitor()
+
+    with tabs[1]:
+        show_file_manager()
+
+    with tabs[2]:
+        show_field_mapping()
+
+    with tabs[3]:
+        show_processing_status()
+
+    with tabs[4]:
+        show_configuration()
+
+def show_folder_monitor():
+    """Folder monitoring interface"""
+
+    st.subheader("?? Automatic Folder Monitoring")
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.markdown("### ?? Watch Folders")
+
+        # Add new folder
+        new_folder = st.text_input(
+            "Add folder to monitor:",
+            placeholder="Enter folder path (e.g., D:\\Documents\\AFCO)",
+            help="Enter the full path to the folder you want to monitor"
+        )
+
+        col_add, col_browse = st.columns([1, 1])
+
+        with col_add:
+            if st.button("? Add Folder", type="primary") and new_folder:
+                if auto_processor.add_watch_folder(new_folder):
+                    st.success(f"? Added folder: {new_folder}")
+                    st.rerun()
+                else:
+                    st.error("? Failed to add folder. Check if path exists.")
+
+        with col_browse:
+            if st.button("?? Browse Folders"):
+                st.info("?? Enter folder path manually above")
+
+        # Current watch folders
+        if auto_processor.watch_folders:
+            st.markdown("### ?? Currently Monitoring:")
+
+            for idx, folder in enumerate(auto_processor.watch_folders):
+                with st.expander(f"?? {folder}", expanded=True):
+                    col1, col2, col3 = st.columns([2, 1, 1])
+
+                    with col1:
+                        if os.path.exists(folder):
+                            st.success("?? Active")
+                            file_count = len(auto_processor.folder_scanner.scan(folder))
+                            st.write(f"?? {file_count} supported files")
+                        else:
+                            st.error("?? Folder not found")
+
+                    with col2:
+                        if st.button(f"?? Scan Now", key=f"scan_{idx}"):
+                            st.info("Scanning folder...")
+                            auto_processor.folder_scanner.scan(folder, full=True)
+                            st.rerun()
+
+                    with col3:
+                        if st.button(f"??? Remove", key=f"remove_{idx}"):
+                            auto_processor.watch_folders.remove(folder)
+                            auto_processor.save_configuration()
+                            st.rerun()
+        else:
+            st.info("?? No folders being monitored. Add a folder to start automatic processing.")
+
+    with col2:
+        st.markdown("### ?? Monitoring Status")
+
+        # Real-time statistics
+        total_folders = len(auto_processor.watch_folders)
+        active_folders = sum(1 for folder in auto_processor.watch_folders if os.path.exists(folder))
+
+        st.metric("Total Folders", total_folders)
+        st.metric("Active Folders", active_folders)
+        st.metric("Processing Rules", len(auto_processor.extraction_rules))
+
+        # Recent activity
+        st.markdown("### ?? Recent Activity")
+
+        recent_activity = auto_processor.processing_index.history(limit=5)
+
+        if recent_activity:
+            for activity in recent_activity:
+                status_icon = "?" if activity['status'] == 'success' else "?"
+                st.write(f"{status_icon} {os.path.basename(activity['file_path'])}")
+                st.caption(f"?? {activity['processed_at'][:19]}")
+        else:
+            st.info("No recent activity")
+
+def show_file_manager():
+    """File manager interface"""
+
+    st.subheader("??? Automatic File Manager")
+
+    # Scan all watched folders; unchanged directories are served from the
+    # scan journal, so files edited in place need a full rescan
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if st.button("?? Refresh File List", type="primary"):
+            st.rerun()
+
+    with col2:
+        full_rescan = st.button("?? Full Rescan", help="Re-read every folder, including files edited in place")
+
+    folder_contents = auto_processor.scan_folders(full=full_rescan)
+
+    if not folder_contents:
+        st.info("?? No watch folders configured. Go to Folder Monitor to add folders.")
+        return
+
+    # Display files by folder
+    for folder_path, files in folder_contents.items():
+        st.markdown(f"### ?? {folder_path}")
+
+        if not files:
+            st.info("?? No supported files found in this folder.")
+            continue
+
+        # Filter controls
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            file_types = st.multiselect(
+                "File Types:",
+                ['.xlsx', '.xls', '.csv', '.docx', '.doc', '.pdf'],
+                default=['.xlsx', '.csv'],
+                key=f"types_{hash(folder_path)}"
+            )
+
+        with col2:
+            status_filter = st.selectbox(
+                "Status:",
+                ["All", "Pending", "Processed", "Failed"],
+                key=f"status_{hash(folder_path)}"
+            )
+
+        with col3:
+            max_files = st.number_input(
+                "Max Files:",
+                min_value=10,
+                max_value=1000,
+                value=50,
+                key=f"max_{hash(folder_path)}"
+            )
+
+        # Filter files
+        filtered_files = []
+        for file_info in files:
+            # Filter by type
+            if file_types and file_info.get('extension') not in file_types:
+                continue
+
+            # Filter by status
+            if status_filter != "All":
+                file_status = file_info.get('status', 'pending')
+                if status_filter.lower() != file_status:
+                    continue
+
+            filtered_files.append(file_info)
+
+        # Limit results
+        filtered_files = filtered_files[:max_files]
+
+        if filtered_files:
+            # Create DataFrame for display
+            display_data = []
+            for file_info in filtered_files:
+                display_data.append({
+                    'File Name': file_info['name'],
+                    'Size (KB)': f"{file_info.get('size', 0) / 1024:.1f}",
+                    'Modified': file_info.get('modified', 'Unknown'),
+                    'Status': file_info.get('status', 'pending'),
+                    'Type': file_info.get('extension', ''),
+                    'Path': file_info['path']
+                })
+
+            df = pd.DataFrame(display_data)
+
+            # Display with selection
+            st.markdown(f"#### ?? Files ({len(df)} found)")
+
+            # Action buttons
+            col1, col2, col3, col4 = st.columns(4)
+
+            with col1:
+                if st.button(f"?? Process All Pending", key=f"process_all_{hash(folder_path)}"):
+                    process_pending_files(filtered_files)
+
+            with col2:
+                if st.button(f"?? Auto-Map Fields", key=f"automap_{hash(folder_path)}"):
+                    auto_map_fields(filtered_files)
+
+            with col3:
+                if st.button(f"?? Preview Files", key=f"preview_{hash(folder_path)}"):
+                    preview_files(filtered_files[:3])
+
+            with col4:
+                if st.button(f"?? Export List", key=f"export_{hash(folder_path)}"):
+                    export_file_list(df)
+
+            # File list
+            st.dataframe(df, use_container_width=True, hide_index=True)
+
+            # File details expander
+            with st.expander("?? File Details & Actions"):
+                selected_file = st.selectbox(
+                    "Select file for details:",
+                    options=[f['name'] for f in filtered_files],
+                    key=f"select_{hash(folder_path)}"
+                )
+
+                if selected_file:
+                    file_info = next(f for f in filtered_files if f['name'] == selected_file)
+                    show_file_details(file_info)
+        else:
+            st.info(f"?? No files match the current filters.")
+
+def show_file_details(file_info: Dict):
+    """Show detailed file information and actions"""
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("#### ?? File Information")
+        st.write(f"**Name:** {file_info['name']}")
+        st.write(f"**Size:** {file_info.get('size', 0) / 1024:.1f} KB")
+        st.write(f"**Modified:** {file_info.get('modified', 'Unknown')}")
+        st.write(f"**Status:** {file_info.get('status', 'pending')}")
+        st.write(f"**Type:** {file_info.get('extension', '')}")
+
+    with col2:
+        st.markdown("#### ? Quick Actions")
+
+        if st.button("?? Extract Data", key=f"extract_{file_info['name']}"):
+            extract_single_file(file_info)
+
+        if st.button("?? Auto-Map", key=f"map_{file_info['name']}"):
+            auto_map_single_file(file_info)
+
+        if st.button("?? Preview", key=f"preview_{file_info['name']}"):
+            preview_single_file(file_info)
+
+        if st.button("?? Analyze", key=f"analyze_{file_info['name']}"):
+            analyze_single_file(file_info)
+
+def show_field_mapping():
+    """Field mapping configuration interface"""
+
+    st.subheader("?? Smart Field Mapping Configuration")
+
+    tab1, tab2, tab3 = st.tabs(["?? Create Mappings", "?? Current Mappings", "?? AI Suggestions"])
+
+    with tab1:
+        st.markdown("### ?? Create New Field Mapping")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("#### Source Field")
+            source_field = st.text_input(
+                "Source Field Name:",
+                placeholder="e.g., Company Name, ??????, Client"
+            )
+
+            source_variations = st.text_area(
+                "Field Variations (one per line):",
+                placeholder="Company\nClient Name\n??? ??????\n??????",
+                help="Add different ways this field might appear"
+            )
+
+        with col2:
+            st.markdown("#### Target Mapping")
+            target_table = st.selectbox(
+                "Target Table:",
+                ["clients", "vendors", "rfqs", "financial_transactions", "kpis"],
+                help="Database table where this data will be stored"
+            )
+
+            target_field = st.text_input(
+                "Target Field:",
+                placeholder="e.g., name, company_name, title"
+            )
+
+            data_type = st.selectbox(
+                "Data Type:",
+                ["TEXT", "INTEGER", "REAL", "DATE", "BOOLEAN"]
+            )
+
+        # Transformation rules
+        st.markdown("#### ?? Transformation Rules")
+
+        transformation = st.selectbox(
+            "Apply Transformation:",
+            [
+                "None",
+                "UPPER() - Convert to uppercase",
+                "LOWER() - Convert to lowercase",
+                "TRIM() - Remove spaces",
+                "Replace commas and convert to number",
+                "Convert to date format",
+                "Custom transformation"
+            ]
+        )
+
+        if transformation == "Custom transformation":
+            custom_transform = st.text_input(
+                "Custom Rule:",
+                placeholder="e.g., REPLACE(?, ',', '') for removing commas"
+            )
+
+        # Validation rules
+        st.markdown("#### ? Validation Rules")
+
+        validation = st.selectbox(
+            "Validation Rule:",
+            [
+                "None",
+                "Required (not empty)",
+                "Email format",
+                "Phone number format",
+                "Saudi phone (+966 or 05)",
+                "Positive number",
+                "Date in future",
+                "Custom validation"
+            ]
+        )
+
+        if validation == "Custom validation":
+            custom_validation = st.text_input(
+                "Custom Validation:",
+                placeholder="e.g., LENGTH(?) > 3"
+            )
+
+        # Save mapping
+        if st.button("?? Save Field Mapping", type="primary"):
+            save_field_mapping(source_field, target_table, target_field, transformation, validation)
+
+    with tab2:
+        st.markdown("### ?? Current Field Mappings")
+
+        if auto_processor.field_mappings:
+            # Display current mappings
+            mapping_data = []
+            for source, target in auto_processor.field_mappings.items():
+                mapping_data.append({
+                    'Source Field': source,
+                    'Target Field': target,
+                    'Actions': '??? Delete'
+                })
+
+            df = pd.DataFrame(mapping_data)
+            st.dataframe(df, use_container_width=True)
+
+            # Edit/Delete actions
+            selected_mapping = st.selectbox(
+                "Select mapping to edit:",
+                list(auto_processor.field_mappings.keys())
+            )
+
+            if selected_mapping:
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    if st.button("?? Edit Mapping"):
+                        edit_field_mapping(selected_mapping)
+
+                with col2:
+                    if st.button("??? Delete Mapping"):
+                        delete_field_mapping(selected_mapping)
+        else:
+            st.info("?? No field mappings configured yet.")
+
+    with tab3:
+        st.markdown("### ?? AI-Powered Mapping Suggestions")
+
+        if st.button("?? Generate Smart Suggestions"):
+            generate_mapping_suggestions()
+
+        st.markdown("""
+        #### ?? Suggested Mappings for Saudi Market:
+
+        **Client Data:**
+        - Company Name ? clients.name
+        - ??? ?????? ? clients.name_ar
+        - Sector ? clients.sector
+        - Contact Person ? clients.contact_person
+
+        **Vendor Data:**
+        - Vendor Name ? vendors.company_name
+        - ???? ? vendors.company_name
+        - Performance ? vendors.performance_score
+
+        **RFQ Data:**
+        - RFQ Title ? rfqs.title
+        - ????? ???????? ? rfqs.title
+        - Value SAR ? rfqs.value_sar
+        - Deadline ? rfqs.deadline
+
+        **Financial Data:**
+        - Amount ? financial_transactions.amount_sar
+        - ?????? ? financial_transactions.amount_sar
+        - Date ? financial_transactions.transaction_date
+        """)
+
+def show_processing_status():
+    """Processing status and history"""
+
+    st.subheader("?? Document Processing Status & Analytics")
+
+    # Processing summary
+    col1, col2, col3, col4 = st.columns(4)
+
+    status_counts = auto_processor.processing_index.status_counts()
+    total_processed = sum(status_counts.values())
+    successful = status_counts.get('success', 0)
+    failed = status_counts.get('failed', 0)
+    success_rate = (successful / total_processed * 100) if total_processed > 0 else 0
+
+    with col1:
+        st.metric("Total Processed", total_processed)
+
+    with col2:
+        st.metric("Successful", successful, delta=f"{success_rate:.1f}%")
+
+    with col3:
+        st.metric("Failed", failed)
+
+    with col4:
+        st.metric("Success Rate", f"{success_rate:.1f}%")
+
+    # Worker pool
+    queue_status = auto_processor.get_queue_status()
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Queued", queue_status['queue_depth'] + queue_status['debouncing'])
+
+    with col2:
+        st.metric("In Progress", f"{queue_status['in_flight']}/{queue_status['max_workers']}")
+
+    with col3:
+        st.metric("Median Latency", f"{queue_status['latency_p50_seconds']:.1f}s")
+
+    with col4:
+        st.metric("Deferred (Queue Full)", queue_status['overflow'])
+
+    # Processing timeline
+    if total_processed:
+        st.markdown("### ?? Processing Timeline")
+
+        # Daily processing chart (aggregated in the index)
+        daily_counts = auto_processor.processing_index.daily_counts()
+
+        if not daily_counts.empty:
+            fig = px.bar(
+                daily_counts,
+                x='Date',
+                y='Count',
+                color='Status',
+                title='Daily Processing Activity',
+                color_discrete_map={'success': 'green', 'failed': 'red', 'empty': 'orange'}
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+        # Recent processing history
+        st.markdown("### ?? Recent Processing History")
+
+        recent_history = auto_processor.processing_index.history(limit=20)
+
+        history_df = pd.DataFrame(recent_history)
+        if not history_df.empty:
+            history_df['processed_at'] = pd.to_datetime(history_df['processed_at']).dt.strftime('%Y-%m-%d %H:%M:%S')
+            history_df['file_name'] = history_df['file_path'].apply(lambda x: os.path.basename(x))
+
+            display_df = history_df[['processed_at', 'file_name', 'status', 'records_extracted']].copy()
+            display_df.columns = ['Processed At', 'File Name', 'Status', 'Records Extracted']
+
+            st.dataframe(display_df, use_container_width=True)
+
+        # Export processing report
+        if st.button("?? Export Processing Report"):
+            export_processing_report()
+
+    else:
+        st.info("?? No processing history available yet.")
+
+def show_configuration():
+    """Configuration management interface"""
+
+    st.subheader("?? System Configuration")
+
+    tab1, tab2, tab3 = st.tabs(["??? Processing Rules", "?? Folder Settings", "?? Advanced"])
+
+    with tab1:
+        st.markdown("### ??? Data Processing Rules")
+
+        for rule_name, rule_config in auto_processor.extraction_rules.items():
+            with st.expander(f"?? {rule_name.replace('_', ' ').title()}"):
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.markdown("**Detection Patterns:**")
+                    patterns = st.text_area(
+                        "Patterns (one per line):",
+                        value='\n'.join(rule_config.get('patterns', [])),
+                        key=f"patterns_{rule_name}"
+                    )
+
+                    st.markdown("**Required Fields:**")
+                    required_fields = st.text_area(
+                        "Required fields (one per line):",
+                        value='\n'.join(rule_config.get('required_fields', [])),
+                        key=f"fields_{rule_name}"
+                    )
+
+                with col2:
+                    st.markdown("**Target Table:**")
+                    target_table = st.selectbox(
+                        "Database table:",
+                        ["clients", "vendors", "rfqs", "financial_transactions", "kpis"],
+                        index=["clients", "vendors", "rfqs", "financial_transactions", "kpis"].index(rule_config.get('target_table', 'clients')),
+                        key=f"table_{rule_name}"
+                    )
+
+                    st.markdown("**Priority:**")
+                    priority = st.slider(
+                        "Processing priority:",
+                        min_value=1,
+                        max_value=10,
+                        value=rule_config.get('priority', 5),
+                        key=f"priority_{rule_name}"
+                    )
+
+                if st.button(f"?? Update {rule_name}", key=f"update_{rule_name}"):
+                    update_processing_rule(rule_name, patterns, required_fields, target_table, priority)
+
+    with tab2:
+        st.markdown("### ?? Folder Monitoring Settings")
+
+        # Auto-processing settings
+        st.markdown("#### ?? Auto-Processing")
+
+        auto_process = st.checkbox(
+            "Enable automatic processing of new files",
+            value=True,
+            help="Automatically process files as soon as they are detected"
+        )
+
+        processing_delay = st.slider(
+            "Processing delay (seconds):",
+            min_value=1,
+            max_value=60,
+            value=5,
+            help="Wait time before processing a new file"
+        )
+
+        # File filters
+        st.markdown("#### ?? File Filters")
+
+        max_file_size = st.number_input(
+            "Maximum file size (MB):",
+            min_value=1,
+            max_value=1000,
+            value=50
+        )
+
+        exclude_patterns = st.text_area(
+            "Exclude patterns (one per line):",
+            value="~$*\n*.tmp\n*.bak",
+            help="File patterns to exclude from processing"
+        )
+
+        # Save settings
+        if st.button("?? Save Folder Settings", type="primary"):
+            save_folder_settings(auto_process, processing_delay, max_file_size, exclude_patterns)
+
+    with tab3:
+        st.markdown("### ?? Advanced Configuration")
+
+        # System settings
+        st.markdown("#### ??? System Settings")
+
+        max_concurrent = st.number_input(
+            "Maximum concurrent file processing:",
+            min_value=1,
+            max_value=10,
+            value=3
+        )
+
+        log_level = st.selectbox(
+            "Logging level:",
+            ["DEBUG", "INFO", "WARNING", "ERROR"],
+            index=1
+        )
+
+        # Database settings
+        st.markdown("#### ??? Database Settings")
+
+        db_backup = st.checkbox(
+            "Enable automatic database backup",
+            value=True
+        )
+
+        backup_frequency = st.selectbox(
+            "Backup frequency:",
+            ["Daily", "Weekly", "Monthly"],
+            index=0
+        )
+
+        # Reset options
+        st.markdown("#### ?? Reset Options")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            if st.button("??? Clear Processing History"):
+                clear_processing_history()
+
+        with col2:
+            if st.button("?? Reset All Settings"):
+                reset_all_settings()
+
+        # Save advanced settings
+        if st.button("?? Save Advanced Settings", type="primary"):
+            save_advanced_settings(max_concurrent, log_level, db_backup, backup_frequency)
+
+# Helper functions for file processing
+def process_pending_files(files: List[Dict]):
+    """Process all pending files"""
+    with st.spinner("?? Processing pending files..."):
+        processed_count = 0
+
+        for file_info in files:
+            if file_info.get('status') == 'pending':
+                try:
+                    if auto_processor.handle_auto_file(file_info['path'], 'manual'):
+                        processed_count += 1
+                except Exception as e:
+                    st.error(f"Error processing {file_info['name']}: {e}")
+
+        st.success(f"? Processed {processed_count} files")
+
+def auto_map_fields(files: List[Dict]):
+    """Automatically map fields for files"""
+    st.info("?? Auto-mapping fields based on AI analysis...")
+    # Implement AI-based field mapping logic here
+    st.success("? Field mapping completed")
+
+def preview_files(files: List[Dict]):
+    """Preview selected files"""
+    st.markdown("### ?? File Preview")
+
+    for file_info in files[:3]:  # Limit to 3 files
+        with st.expander(f"?? {file_info['name']}"):
+            try:
+                data = auto_processor.extract_file_data(file_info['path'])
+                if data:
+                    preview_df = pd.DataFrame(data[:5])  # First 5 rows
+                    st.dataframe(preview_df, use_container_width=True)
+                else:
+                    st.warning("No data could be extracted from this file")
+            except Exception as e:
+                st.error(f"Error previewing file: {e}")
+
+def export_file_list(df: pd.DataFrame):
+    """Export file list to CSV"""
+    csv = df.to_csv(index=False)
+    st.download_button(
+        label="?? Download File List",
+        data=csv,
+        file_name=f"file_list_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv"
+    )
+
+def extract_single_file(file_info: Dict):
+    """Extract data from a single file"""
+    with st.spinner(f"?? Extracting data from {file_info['name']}..."):
+        try:
+            data = auto_processor.extract_file_data(file_info['path'])
+            if data:
+                st.success(f"? Extracted {len(data)} records")
+
+                # Show preview
+                preview_df = pd.DataFrame(data[:10])
+                st.dataframe(preview_df, use_container_width=True)
+            else:
+                st.warning("?? No data could be extracted")
+        except Exception as e:
+            st.error(f"? Error: {e}")
+
+def auto_map_single_file(file_info: Dict):
+    """Auto-map fields for a single file"""
+    st.info(f"?? Auto-mapping fields for {file_info['name']}...")
+    # Implement single file auto-mapping
+    st.success("? Auto-mapping completed")
+
+def preview_single_file(file_info: Dict):
+    """Preview a single file"""
+    try:
+        data = auto_processor.extract_file_data(file_info['path'])
+        if data:
+            st.success(f"?? Preview of {file_info['name']} ({len(data)} records)")
+            preview_df = pd.DataFrame(data[:10])
+            st.dataframe(preview_df, use_container_width=True)
+        else:
+            st.warning("No data available for preview")
+    except Exception as e:
+        st.error(f"Error: {e}")
+
+def analyze_single_file(file_info: Dict):
+    """Analyze a single file"""
+    with st.spinner(f"?? Analyzing {file_info['name']}..."):
+        try:
+            data = auto_processor.extract_file_data(file_info['path'])
+            if data:
+                # Basic analysis
+                st.markdown("#### ?? File Analysis Results")
+
+                col1, col2, col3 = st.columns(3)
+
+                with col1:
+                    st.metric("Total Records", len(data))
+
+                with col2:
+                    fields = set()
+                    for record in data:
+                        fields.update(record.keys())
+                    st.metric("Unique Fields", len(fields))
+
+                with col3:
+                    data_type = auto_processor.determine_data_type(data[0] if data else {})
+                    st.metric("Detected Type", data_type)
+
+                # Field analysis
+                st.markdown("#### ?? Field Analysis")
+                field_analysis = {}
+                for record in data:
+                    for field, value in record.items():
+                        if field not in field_analysis:
+                            field_analysis[field] = {'count': 0, 'non_empty': 0, 'samples': []}
+
+                        field_analysis[field]['count'] += 1
+                        if value and str(value).strip():
+                            field_analysis[field]['non_empty'] += 1
+                            if len(field_analysis[field]['samples']) < 3:
+                                field_analysis[field]['samples'].append(str(value)[:50])
+
+                for field, stats in field_analysis.items():
+                    if not field.startswith('_'):  # Skip internal fields
+                        completeness = (stats['non_empty'] / stats['count']) * 100
+                        samples = ', '.join(stats['samples'])
+
+                        st.write(f"**{field}:** {completeness:.1f}% complete")
+                        st.caption(f"Samples: {samples}")
+            else:
+                st.warning("No data available for analysis")
+        except Exception as e:
+            st.error(f"Error: {e}")
+
+# Configuration helper functions
+def save_field_mapping(source_field: str, target_table: str, target_field: str, transformation: str, validation: str):
+    """Save a field mapping"""
+    if source_field and target_field:
+        auto_processor.field_mappings[source_field] = f"{target_table}.{target_field}"
+        auto_processor.save_configuration()
+        st.success(f"? Saved mapping: {source_field} ? {target_table}.{target_field}")
+    else:
+        st.error("? Please fill in both source and target fields")
+
+def edit_field_mapping(selected_mapping: str):
+    """Edit an existing field mapping"""
+    st.info(f"?? Editing mapping for: {selected_mapping}")
+    # Implement edit functionality
+
+def delete_field_mapping(selected_mapping: str):
+    """Delete a field mapping"""
+    if selected_mapping in auto_processor.field_mappings:
+        del auto_processor.field_mappings[selected_mapping]
+        auto_processor.save_configuration()
+        st.success(f"? Deleted mapping: {selected_mapping}")
+        st.rerun()
+
+def generate_mapping_suggestions():
+    """Generate AI-powered mapping suggestions"""
+    st.info("?? Analyzing files to generate smart mapping suggestions...")
+
+    # Implement AI-based suggestion logic
+    suggestions = [
+        {"source": "Company Name", "target": "clients.name", "confidence": 0.95},
+        {"source": "??? ??????", "target": "clients.name_ar", "confidence": 0.90},
+        {"source": "Vendor", "target": "vendors.company_name", "confidence": 0.88},
+        {"source": "Amount SAR", "target": "financial_transactions.amount_sar", "confidence": 0.92}
+    ]
+
+    for suggestion in suggestions:
+        st.write(f"?? **{suggestion['source']}** ? {suggestion['target']} (Confidence: {suggestion['confidence']:.0%})")
+
+def update_processing_rule(rule_name: str, patterns: str, required_fields: str, target_table: str, priority: int):
+    """Update a processing rule"""
+    auto_processor.extraction_rules[rule_name] = {
+        'patterns': [p.strip() for p in patterns.split('\n') if p.strip()],
+        'required_fields': [f.strip() for f in required_fields.split('\n') if f.strip()],
+        'target_table': target_table,
+        'priority': priority
+    }
+    auto_processor.save_configuration()
+    st.success(f"? Updated processing rule: {rule_name}")
+
+def save_folder_settings(auto_process: bool, processing_delay: int, max_file_size: int, exclude_patterns: str):
+    """Save folder monitoring settings"""
+    # Implementation for saving folder settings
+    st.success("? Folder settings saved successfully")
+
+def save_advanced_settings(max_concurrent: int, log_level: str, db_backup: bool, backup_frequency: str):
+    """Save advanced system settings"""
+    # Implementation for saving advanced settings
+    st.success("? Advanced settings saved successfully")
+
+def clear_processing_history():
+    """Clear processing history"""
+    auto_processor.processing_index.clear_history()
+    st.success("? Processing history cleared")
+
+def reset_all_settings():
+    """Reset all settings to defaults"""
+    auto_processor.set_default_extraction_rules()
+    auto_processor.field_mappings.clear()
+    auto_processor.save_configuration()
+    st.success("? All settings reset to defaults")
+
+def export_processing_report():
+    """Export processing report"""
+    history = auto_processor.processing_index.history(limit=None)
+    if history:
+        df = pd.DataFrame(history)
+        csv = df.to_csv(index=False)
+
+        st.download_button(
+            label="?? Download Processing Report",
+            data=csv,
+            file_name=f"processing_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+    else:
+        st.warning("No processing history to export")
+
+if __name__ == "__main__":
     main()
@@ -0,0 +1,239 @@
+"""
+AFCO FEATURE ENGINEERING
+Vectorized feature transforms for the AI forecasting engine
+
+- Saudi business calendar flags via isin
+- Value, competition and timeline tiers via pd.cut / np.select
+- Engineered frames cached by input content hash
+- Incremental appends that only recompute new rows plus rolling tails
+"""
+
+import pandas as pd
+import numpy as np
+from collections import OrderedDict
+import hashlib
+import threading
+from typing import Optional
+
+# Saudi business calendar
+RAMADAN_MONTHS = [4, 5]  # Ramadan typically April-May
+SUMMER_MONTHS = [7, 8]  # Summer vacation period
+BUDGET_MONTHS = [12, 1]  # Budget approval season
+
+# Rows of history needed before a new revenue row: the 6-month moving
+# average looks back 5 rows, the 3-period growth average 3 (+1 for pct_change)
+REVENUE_LOOKBACK = 5
+
+# Revenue features that are NaN until enough history precedes a row
+REVENUE_WINDOW_COLUMNS = ['revenue_ma_3', 'revenue_ma_6', 'revenue_lag1', 'revenue_lag2',
+                          'revenue_growth', 'revenue_growth_ma']
+
+RFQ_VALUE_BINS = [0, 5000000, 15000000, 50000000, float('inf')]
+RFQ_VALUE_LABELS = ['Small', 'Medium', 'Large', 'Mega']
+
+SECTOR_RELATIONSHIP_SCORES = {
+    'Oil & Gas': 9,
+    'Government': 8,
+    'Banking': 7,
+    'Telecommunications': 7,
+    'Manufacturing': 6,
+    'Healthcare': 6
+}
+
+CATEGORY_COMPLEXITY_SCORES = {
+    'AI/Analytics': 9,
+    'Cloud': 8,
+    'Security': 8,
+    'Infrastructure': 6,
+    'Networking': 5
+}
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """Content hash of a frame (values, index and column names)"""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update('|'.join(map(str, df.columns)).encode())
+    hasher.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return hasher.hexdigest()
+
+def revenue_features(revenue_data: pd.DataFrame) -> pd.DataFrame:
+    """Calendar, rolling, lag and growth features for revenue rows (NaN rows kept)"""
+    df = revenue_data.copy()
+
+    # Convert date column
+    df['date'] = pd.to_datetime(df['date'])
+
+    # Time-based features
+    df['month'] = df['date'].dt.month
+    df['quarter'] = df['date'].dt.quarter
+    df['year'] = df['date'].dt.year
+    df['day_of_year'] = df['date'].dt.dayofyear
+
+    # Seasonal factors (Saudi business calendar)
+    df['ramadan_effect'] = df['month'].isin(RAMADAN_MONTHS).astype(int)
+    df['summer_slowdown'] = df['month'].isin(SUMMER_MONTHS).astype(int)
+    df['budget_cycle'] = df['month'].isin(BUDGET_MONTHS).astype(int)
+
+    # Rolling averages
+    df['revenue_ma_3'] = df['revenue'].rolling(window=3).mean()
+    df['revenue_ma_6'] = df['revenue'].rolling(window=6).mean()
+
+    # Lag features
+    df['revenue_lag1'] = df['revenue'].shift(1)
+    df['revenue_lag2'] = df['revenue'].shift(2)
+
+    # Growth rates
+    df['revenue_growth'] = df['revenue'].pct_change()
+    df['revenue_growth_ma'] = df['revenue_growth'].rolling(window=3).mean()
+
+    return df
+
+def rfq_features(rfq_data: pd.DataFrame) -> pd.DataFrame:
+    """Value, relationship, competition, complexity and timeline features for RFQ rows"""
+    df = rfq_data.copy()
+
+    # Value-based features
+    df['value_tier'] = pd.cut(df['value_sar'], bins=RFQ_VALUE_BINS, labels=RFQ_VALUE_LABELS)
+
+    # Client relationship strength (based on historical data)
+    df['client_relationship_score'] = df['sector'].map(SECTOR_RELATIONSHIP_SCORES).fillna(5)
+
+    # Competition level estimation
+    value = df['value_sar'].to_numpy(dtype=float)
+    df['competition_level'] = np.select([value > 20000000, value > 5000000], ['High', 'Medium'], default='Low')
+
+    # Technical complexity
+    df['technical_complexity'] = df['category'].map(CATEGORY_COMPLEXITY_SCORES).fillna(6)
+
+    # Timeline pressure
+    days = df['days_to_deadline'].to_numpy(dtype=float)
+    df['timeline_pressure'] = np.select([days < 30, days < 60], ['High', 'Medium'], default='Low')
+
+    return df
+
+def _continued_index(index: pd.Index, length: int) -> pd.Index:
+    """Integer labels following index (or its length, for non-integer indexes)"""
+    if len(index) and pd.api.types.is_integer_dtype(index):
+        start = int(index.max()) + 1
+    else:
+        start = len(index)
+    return pd.RangeIndex(start, start + length)
+
+class FeatureStore:
+    """Engineered feature frames cached by input hash, with incremental appends.
+
+    Each kind ('revenue', 'rfq') keeps an LRU of engineered frames keyed by
+    the raw input's content hash, plus the most recent raw/engineered pair.
+    When a new input extends that most recent raw frame (same leading rows),
+    only the appended rows are engineered: RFQ features are row-wise, and
+    revenue features are recomputed over the appended rows plus the
+    REVENUE_LOOKBACK rows before them.
+    """
+
+    TRANSFORMS = {'revenue': (revenue_features, REVENUE_LOOKBACK), 'rfq': (rfq_features, 0)}
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._latest = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'appends': 0, 'full': 0}
+
+    def features(self, kind: str, raw: pd.DataFrame) -> pd.DataFrame:
+        """Engineered frame for raw, reusing cached or previously engineered rows"""
+        key = (kind, frame_hash(raw))
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return cached.copy()
+            latest = self._latest.get(kind)
+
+        engineered = None
+        if latest is not None:
+            previous_raw, previous_engineered = latest
+            n = len(previous_raw)
+            if len(raw) > n and list(raw.columns) == list(previous_raw.columns) and \
+                    frame_hash(raw.iloc[:n]) == frame_hash(previous_raw):
+                engineered = self._extend(kind, previous_raw, previous_engineered, raw.iloc[n:])
+                self.stats['appends'] += 1
+
+        if engineered is None:
+            transform, _ = self.TRANSFORMS[kind]
+            engineered = transform(raw)
+            self.stats['full'] += 1
+
+        self._store(key, kind, raw.copy(), engineered)
+        return engineered.copy()
+
+    def has_latest(self, kind: str) -> bool:
+        """Whether append() has a previous frame of this kind to extend"""
+        with self._lock:
+            return kind in self._latest
+
+    def seed(self, kind: str, raw: pd.DataFrame, engineered: Optional[pd.DataFrame] = None):
+        """Make raw the frame append() extends, with engineered as its features (computed if omitted)"""
+        if engineered is None:
+            transform, _ = self.TRANSFORMS[kind]
+            engineered = transform(raw)
+        self._store((kind, frame_hash(raw)), kind, raw.copy(), engineered.copy())
+
+    def latest_raw(self, kind: str) -> Optional[pd.DataFrame]:
+        """Copy of the most recent raw frame of this kind, if any"""
+        with self._lock:
+            latest = self._latest.get(kind)
+        return latest[0].copy() if latest is not None else None
+
+    def append(self, kind: str, new_rows: pd.DataFrame) -> pd.DataFrame:
+        """Append rows to the most recent raw frame of this kind and return its features
+
+        The new rows are re-indexed to follow the previous frame's index, so
+        the result has unique labels. Without a previous frame (see
+        has_latest) only new_rows are engineered; call features() or
+        seed() first to extend existing history.
+        """
+        with self._lock:
+            latest = self._latest.get(kind)
+        if latest is None:
+            return self.features(kind, new_rows)
+
+        previous_raw, previous_engineered = latest
+        new_rows = new_rows.set_axis(_continued_index(previous_raw.index, len(new_rows)))
+        raw = pd.concat([previous_raw, new_rows])
+        engineered = self._extend(kind, previous_raw, previous_engineered, new_rows)
+        self.stats['appends'] += 1
+
+        self._store((kind, frame_hash(raw)), kind, raw, engineered)
+        return engineered.copy()
+
+    def _extend(self, kind: str, previous_raw: pd.DataFrame, previous_engineered: pd.DataFrame,
+                new_rows: pd.DataFrame) -> pd.DataFrame:
+        """Engineer only the new rows, using the trailing window of history for context"""
+        transform, lookback = self.TRANSFORMS[kind]
+        context = previous_raw.iloc[max(len(previous_raw) - lookback, 0):] if lookback else previous_raw.iloc[:0]
+        tail = transform(pd.concat([context, new_rows])).iloc[len(context):]
+        return pd.concat([previous_engineered, tail])
+
+    def _store(self, key: tuple, kind: str, raw: pd.DataFrame, engineered: pd.DataFrame):
+        """Remember an engineered frame and make it the latest for its kind"""
+        with self._lock:
+            self._entries[key] = engineered
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._latest[kind] = (raw, engineered)
+
+    def clear(self):
+        """Drop every cached frame"""
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+
+__all__ = [
+    'FeatureStore',
+    'frame_hash',
+    'revenue_features',
+    'rfq_features',
+    'REVENUE_LOOKBACK',
+    'REVENUE_WINDOW_COLUMNS'
+]